@@ -0,0 +1,242 @@
+from collections import OrderedDict
+from src.config.logging import logger
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+from typing import List
+from typing import Any
+import numpy as np
+import threading
+import time
+import zlib
+import re
+
+N_FEATURES = 2 ** 12
+MAX_ENTRIES = 1000
+SIMILARITY_THRESHOLD = 0.9
+FRESHNESS_SECONDS = 3600
+
+STOPWORDS = {
+    "a", "an", "the", "of", "for", "to", "in", "on", "at", "by", "with", "about", "and", "or",
+    "is", "are", "was", "were", "be", "me", "my", "i", "you", "please", "tell", "show", "give",
+    "what", "whats", "can", "could", "would", "do", "does", "some",
+}
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_query(query: str) -> List[str]:
+    """
+    Lowercase a query and split it into content tokens, dropping stopwords.
+
+    Args:
+        query (str): The user query.
+
+    Returns:
+        List[str]: The normalized tokens.
+    """
+    tokens = TOKEN_PATTERN.findall(query.lower().replace("'", ""))
+    content = [token for token in tokens if token not in STOPWORDS]
+    return content or tokens
+
+
+def _bucket(feature: str) -> int:
+    """
+    Hash a feature into one of `N_FEATURES` buckets, stably across processes."""
+    return zlib.crc32(feature.encode("utf-8")) % N_FEATURES
+
+
+def vectorize(tokens: List[str]) -> np.ndarray:
+    """
+    Build the hashed term-frequency vector of a token list.
+
+    Features are whole tokens, pairs of adjacent tokens and character trigrams of each
+    token: small spelling differences still overlap, while reordered queries such as
+    "eur to usd" and "usd to eur" share fewer features.
+
+    Args:
+        tokens (List[str]): The normalized tokens.
+
+    Returns:
+        np.ndarray: A float32 vector of length `N_FEATURES`.
+    """
+    vector = np.zeros(N_FEATURES, dtype=np.float32)
+    for token in tokens:
+        vector[_bucket("w:" + token)] += 1.0
+        padded = f"#{token}#"
+        for i in range(len(padded) - 2):
+            vector[_bucket("c:" + padded[i:i + 3])] += 1.0
+    for first, second in zip(tokens, tokens[1:]):
+        vector[_bucket(f"b:{first} {second}")] += 1.0
+    return vector
+
+
+def same_order(tokens: List[str], other: List[str]) -> bool:
+    """
+    Check that the tokens two queries share appear in the same order in both, so
+    "flights from london to paris" never matches "flights from paris to london".
+
+    Args:
+        tokens (List[str]): The normalized tokens of one query.
+        other (List[str]): The normalized tokens of the other.
+
+    Returns:
+        bool: True if the shared tokens are in the same order.
+    """
+    shared = set(tokens) & set(other)
+    return [token for token in tokens if token in shared] == [token for token in other if token in shared]
+
+
+class CachedAnswer:
+    """
+    A final answer kept for reuse, with the trace that produced it.
+
+    Attributes:
+        query (str): The original query.
+        tokens (List[str]): The normalized tokens of the query, whose shared tokens must keep their order on reuse.
+        numbers (Tuple[str, ...]): The numeric tokens of the query, which must match exactly on reuse.
+        answer (Any): The final answer.
+        iterations (List[Dict[str, Any]]): The iteration dicts yielded by the original run.
+        created_at (float): Epoch time at which the answer was produced.
+        expires_at (float): Epoch time after which the answer is no longer reused.
+    """
+    __slots__ = ("query", "tokens", "numbers", "answer", "iterations", "created_at", "expires_at")
+
+    def __init__(self, query: str, tokens: List[str], numbers: Tuple[str, ...], answer: Any,
+                 iterations: List[Dict[str, Any]], created_at: float, expires_at: float) -> None:
+        self.query = query
+        self.tokens = tokens
+        self.numbers = numbers
+        self.answer = answer
+        self.iterations = iterations
+        self.created_at = created_at
+        self.expires_at = expires_at
+
+
+class AnswerCache:
+    """
+    An in-memory nearest-neighbour cache of recent final answers.
+
+    Queries are embedded as hashed n-gram TF-IDF vectors; the IDF is computed over the
+    queries currently held, and a lookup returns the most cosine-similar entry if it
+    reaches `threshold`, has not expired (see `store`), mentions the same
+    numbers (so "ZIP 94043" never matches "ZIP 94044") and has the words both queries
+    share in the same order (so "eur to usd" never matches "usd to eur"). At most
+    `max_entries` answers are kept, evicting the least recently used.
+
+    Attributes:
+        threshold (float): The minimum cosine similarity for a hit.
+        freshness (float): The maximum age in seconds of a reusable answer; entries may
+            expire sooner.
+        max_entries (int): The maximum number of answers kept.
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD,
+                 freshness: float = FRESHNESS_SECONDS,
+                 max_entries: int = MAX_ENTRIES) -> None:
+        self.threshold = threshold
+        self.freshness = freshness
+        self.max_entries = max_entries
+        self._matrix = np.zeros((max_entries, N_FEATURES), dtype=np.float32)
+        self._document_frequency = np.zeros(N_FEATURES, dtype=np.float32)
+        self._entries: "OrderedDict[int, CachedAnswer]" = OrderedDict()
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+        self._lock = threading.Lock()
+
+    def _remove(self, slot: int) -> None:
+        """
+        Drop the entry in `slot` and release the slot."""
+        self._document_frequency -= self._matrix[slot] > 0
+        self._matrix[slot] = 0.0
+        del self._entries[slot]
+        self._free_slots.append(slot)
+
+    def lookup(self, query: str) -> Optional[Tuple[CachedAnswer, float]]:
+        """
+        Find a fresh cached answer for a query similar enough to this one.
+
+        Args:
+            query (str): The user query.
+
+        Returns:
+            Optional[Tuple[CachedAnswer, float]]: The cached answer and its similarity, or None.
+        """
+        tokens = normalize_query(query)
+        if not tokens:
+            return None
+        numbers = tuple(sorted(token for token in tokens if token.isdigit()))
+        vector = vectorize(tokens)
+
+        with self._lock:
+            now = time.time()
+            for slot in [slot for slot, entry in self._entries.items() if now >= entry.expires_at]:
+                self._remove(slot)
+            if not self._entries:
+                return None
+
+            slots = np.fromiter(self._entries.keys(), dtype=np.int64)
+            idf = np.log((1.0 + len(slots)) / (1.0 + self._document_frequency)) + 1.0
+            candidates = self._matrix[slots] * idf
+            candidates /= np.linalg.norm(candidates, axis=1, keepdims=True) + 1e-12
+            weighted = vector * idf
+            weighted /= np.linalg.norm(weighted) + 1e-12
+            similarities = candidates @ weighted
+
+            for index in np.argsort(-similarities):
+                similarity = float(similarities[index])
+                if similarity < self.threshold:
+                    break
+                slot = int(slots[index])
+                entry = self._entries[slot]
+                if entry.numbers != numbers or not same_order(entry.tokens, tokens):
+                    continue
+                self._entries.move_to_end(slot)
+                logger.info(f"Answer cache hit for '{query}': '{entry.query}' (similarity {similarity:.3f})")
+                return entry, similarity
+        return None
+
+    def store(self, query: str, answer: Any, iterations: List[Dict[str, Any]],
+              ttl: Optional[float] = None) -> None:
+        """
+        Remember the final answer to a query.
+
+        Args:
+            query (str): The user query.
+            answer (Any): The final answer.
+            iterations (List[Dict[str, Any]]): The iteration dicts yielded by the run.
+            ttl (Optional[float]): How long the answer stays valid, e.g. the shortest TTL of the
+                tools it is based on; capped at `freshness`. Nothing is stored if it is 0.
+        """
+        ttl = self.freshness if ttl is None else min(ttl, self.freshness)
+        tokens = normalize_query(query)
+        if not tokens or ttl <= 0:
+            return
+        numbers = tuple(sorted(token for token in tokens if token.isdigit()))
+        vector = vectorize(tokens)
+
+        with self._lock:
+            if not self._free_slots:
+                self._remove(next(iter(self._entries)))
+            slot = self._free_slots.pop()
+            self._matrix[slot] = vector
+            self._document_frequency += vector > 0
+            now = time.time()
+            self._entries[slot] = CachedAnswer(query, tokens, numbers, answer, iterations, now, now + ttl)
+
+
+_answer_cache: Optional[AnswerCache] = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache:
+    """
+    Return the process-wide answer cache, creating it on first use.
+
+    Returns:
+        AnswerCache: The shared cache.
+    """
+    global _answer_cache
+    if _answer_cache is None:
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                _answer_cache = AnswerCache()
+    return _answer_cache
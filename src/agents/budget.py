@@ -0,0 +1,65 @@
+from typing import Tuple
+from typing import List
+
+CHARS_PER_TOKEN = 4
+KEEP_RECENT_ENTRIES = 4
+PREVIEW_CHARS = 200
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text locally, at about four characters per token.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: The estimated token count.
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _shorten(line: str) -> str:
+    """
+    Reduce a history entry to a short preview."""
+    if len(line) <= PREVIEW_CHARS:
+        return line
+    return f"{line[:PREVIEW_CHARS]}... [shortened]"
+
+
+def fit_history(lines: List[str], max_tokens: int) -> Tuple[str, int, int]:
+    """
+    Render history entries within a token budget.
+
+    The most recent `KEEP_RECENT_ENTRIES` entries are kept whole for as long as possible.
+    Older entries are first shortened to a preview, then dropped oldest first and replaced
+    by a marker saying how many were omitted. If the recent entries alone still do not fit,
+    they are dropped oldest first too.
+
+    Args:
+        lines (List[str]): The rendered history entries, oldest first.
+        max_tokens (int): The token budget for the history.
+
+    Returns:
+        Tuple[str, int, int]: The rendered history, the number of kept entries that were
+            shortened and the number of entries dropped.
+    """
+    max_chars = max(max_tokens, 0) * CHARS_PER_TOKEN
+    split = max(len(lines) - KEEP_RECENT_ENTRIES, 0)
+    older = [_shorten(line) for line in lines[:split]]
+    recent = list(lines[split:])
+    changed = [before is not after for before, after in zip(lines, older)]
+
+    sizes = [len(line) + 1 for line in older + recent]
+    total = sum(sizes)
+    dropped = 0
+    marker_chars = 64
+    while dropped < len(sizes) and total + (marker_chars if dropped else 0) > max_chars:
+        total -= sizes[dropped]
+        dropped += 1
+
+    kept = (older + recent)[dropped:]
+    shortened = sum(changed[dropped:])
+    if dropped:
+        kept.insert(0, f"[{dropped} earlier entries omitted to fit the prompt budget]")
+    return "\n".join(kept), shortened, dropped
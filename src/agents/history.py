@@ -0,0 +1,79 @@
+from typing import Iterable
+from typing import List
+from typing import Any
+import json
+
+
+class MessageRecord:
+    """
+    A lightweight message in the agent's history.
+
+    Has the same `role` and `content` attributes as the pydantic `Message`, and serializes
+    content the same way (dicts as JSON, anything else with `str`), without running
+    validation for every trace entry.
+
+    Attributes:
+        role (str): The role of the sender (e.g., "user", "assistant").
+        content (str): The content of the message as a string.
+    """
+    __slots__ = ("role", "content")
+
+    def __init__(self, role: str, content: Any) -> None:
+        self.role = role
+        self.content = json.dumps(content) if isinstance(content, dict) else str(content)
+
+    def __repr__(self) -> str:
+        return f"MessageRecord(role={self.role!r}, content={self.content!r})"
+
+
+class HistoryBuffer:
+    """
+    An append-only rendering of the conversation history.
+
+    Each message is formatted once when it is appended, and the joined history string is
+    extended with only the entries added since the previous render, instead of being
+    rebuilt from every message for every prompt.
+
+    Attributes:
+        lines (List[str]): The rendered entries, one per message, in order.
+    """
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self._rendered = ""
+        self._rendered_count = 0
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def append(self, message: MessageRecord) -> None:
+        """
+        Add a message to the history.
+
+        Args:
+            message (MessageRecord): The message to add.
+        """
+        self.lines.append(f"{message.role}: {message.content}")
+
+    def extend(self, messages: Iterable[MessageRecord]) -> None:
+        """
+        Add several messages to the history, in order.
+
+        Args:
+            messages (Iterable[MessageRecord]): The messages to add.
+        """
+        for message in messages:
+            self.append(message)
+
+    def render(self) -> str:
+        """
+        Return the whole history, one entry per line.
+
+        Returns:
+            str: The rendered history.
+        """
+        if self._rendered_count < len(self.lines):
+            new = "\n".join(self.lines[self._rendered_count:])
+            self._rendered = f"{self._rendered}\n{new}" if self._rendered else new
+            self._rendered_count = len(self.lines)
+        return self._rendered
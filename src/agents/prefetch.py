@@ -0,0 +1,143 @@
+from src.config.logging import logger
+from typing import Awaitable
+from typing import Optional
+from typing import Callable
+from typing import Union
+from typing import Tuple
+from typing import Dict
+from typing import List
+from typing import Any
+import threading
+import asyncio
+import re
+
+Prediction = Tuple[str, Union[str, Dict[str, Any], None]]
+
+NEARBY_PATTERN = re.compile(r"\b(near me|nearby|around me|close to me|near here)\b", re.IGNORECASE)
+ISS_PATTERN = re.compile(r"\b(iss|international space station|space station)\b", re.IGNORECASE)
+FACTUAL_PATTERN = re.compile(
+    r"^\s*(who|what|when|where|why|how|which|tell me about|history of|explain|define)\b",
+    re.IGNORECASE
+)
+
+
+def predict_actions(query: str) -> List[Prediction]:
+    """
+    Guess the tool calls the model is most likely to request first for a query.
+
+    A handful of cheap regular expressions, tuned for the cases the model is most
+    predictable on: "near me" queries start with the current location, ISS questions
+    with its position, and other factual questions with a web search of the query.
+
+    Args:
+        query (str): The user query.
+
+    Returns:
+        List[Prediction]: (tool name, tool input) pairs, possibly empty.
+    """
+    if NEARBY_PATTERN.search(query):
+        return [("CURRENT_LOCATION", None)]
+    if ISS_PATTERN.search(query):
+        return [("ISS_LOCATION", None)]
+    if FACTUAL_PATTERN.search(query):
+        return [("GOOGLE_SEARCH", query.strip())]
+    return []
+
+
+class PrefetchStats:
+    """
+    Process-wide counters for speculative prefetching.
+
+    Attributes:
+        hits (int): Tool calls served from the prefetch buffer.
+        misses (int): First-step tool calls that had no matching prefetch.
+        unused (int): Prefetches cancelled because the model never asked for them.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.unused = 0
+        self._lock = threading.Lock()
+
+    def record(self, hits: int = 0, misses: int = 0, unused: int = 0) -> None:
+        """
+        Add to the counters."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.unused += unused
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Return the counters and the hit rate over all prefetch-eligible calls."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "unused": self.unused,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+PREFETCH_STATS = PrefetchStats()
+
+
+class Prefetcher:
+    """
+    Per-run buffer of tool calls started speculatively before the model asks for them.
+
+    Attributes:
+        pending (Dict[str, asyncio.Future]): In-flight or finished prefetches by call key.
+        active (bool): Whether lookups still count towards hit/miss statistics.
+    """
+
+    def __init__(self) -> None:
+        self.pending: Dict[str, asyncio.Future] = {}
+        self.active = False
+
+    def start(self, key: str, call: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Start a speculative call in the background.
+
+        Args:
+            key (str): The canonical call key the model's request will be matched against.
+            call (Callable[[], Awaitable[Any]]): Produces the awaitable performing the call.
+        """
+        if key in self.pending:
+            return
+        logger.info(f"Prefetching {key}")
+        self.pending[key] = asyncio.ensure_future(call())
+        self.active = True
+
+    def take(self, key: str) -> Optional[asyncio.Future]:
+        """
+        Claim a prefetched call matching `key`, recording a hit or a miss.
+
+        Args:
+            key (str): The canonical call key requested by the model.
+
+        Returns:
+            Optional[asyncio.Future]: The prefetch future on a hit, otherwise None.
+        """
+        if not self.active:
+            return None
+        future = self.pending.pop(key, None)
+        if future is None:
+            PREFETCH_STATS.record(misses=1)
+            return None
+        logger.info(f"Prefetch hit for {key}")
+        PREFETCH_STATS.record(hits=1)
+        return future
+
+    def cancel(self) -> None:
+        """
+        Cancel every prefetch that was not claimed and stop counting lookups."""
+        if self.pending:
+            logger.info(f"Cancelling {len(self.pending)} unused prefetch(es)")
+            PREFETCH_STATS.record(unused=len(self.pending))
+        for future in self.pending.values():
+            future.cancel()
+        self.pending = {}
+        self.active = False
@@ -27,7 +27,13 @@ from src.tools.registry import get_ten_random_jokes
 from src.tools.registry import get_random_fox_image
 from src.tools.registry import get_trivia_questions
 from src.tools.registry import get_exchange_rates
-from src.llm.gemini_text import generate_content
+from src.llm.gemini_text import agenerate_content_stream
+from src.llm.gemini_text import agenerate_content
+from src.tools.projection import render_observation
+from src.tools.cache import get_tool_cache
+from src.tools.cache import get_tool_ttl
+from src.tools.http import tool_scope
+from src.llm.context_cache import get_context_cache
 from src.tools.registry import get_iss_location
 from src.tools.registry import get_random_joke
 from src.tools.registry import get_cat_breeds
@@ -35,24 +41,67 @@ from src.tools.registry import get_public_ip
 from src.tools.registry import get_cat_fact
 from src.tools.registry import get_zip_info
 from src.tools.registry import get_lyrics
+from src.config.tracing import current_span
+from src.config.tracing import start_span
 from src.config.logging import logger
+from src.config.tracing import Span
+from src.config.tracing import span
+from src.config.deadline import DeadlineExceeded
+from src.config.deadline import deadline_scope
+from src.config.deadline import Deadline
 from pydantic import ValidationError
 from pydantic import field_validator
+from src.utils.json_stream import StreamingJSONParser
+from src.agents.prefetch import predict_actions
+from src.agents.prefetch import Prefetcher
+from src.agents.answer_cache import get_answer_cache
+from src.agents.answer_cache import CachedAnswer
+from src.agents.router import render_answer
+from src.agents.history import MessageRecord
+from src.agents.history import HistoryBuffer
+from src.agents.budget import estimate_tokens
+from src.agents.budget import fit_history
+from src.agents.router import match_route
+from src.agents.router import Route
+from src.agents.schema import build_response_schema
 from src.utils.io import read_file
 from src.config.setup import MODEL
+from google.genai import types
+from typing import AsyncIterator
 from pydantic import BaseModel
+from typing import Awaitable
+from typing import Iterator
 from typing import Callable
 from typing import Optional
+from typing import Tuple
 from typing import Union
 from typing import List 
 from typing import Dict 
 from typing import Any 
 from enum import Enum
 from enum import auto 
+import threading
+import inspect
+import asyncio
 import json
 
 Observation = Union[str, Exception]
 PROMPT_TEMPLATE_PATH = "./templates/react.txt"
+STEP_TEMPLATE_PATH = "./templates/react_step.txt"
+CONTEXT_CACHING_ENABLED = True
+PREFETCH_ENABLED = True
+ROUTING_ENABLED = True
+STRUCTURED_OUTPUT_ENABLED = True
+ANSWER_CACHE_ENABLED = True
+PROMPT_TOKEN_BUDGET = 32000
+MAX_PARALLEL_ACTIONS = 4
+# The most tool calls the model may request in one step, in the prompt and the response schema
+MAX_ACTIONS_PER_STEP = 4
+QUERY_DEADLINE_SECONDS: Optional[float] = 120.0
+ANSWER_RESERVE_SECONDS = 15.0
+FORCE_ANSWER_NOTE = ("Time is almost up: do not request any more actions. Respond now with a final answer "
+                     "based on the observations above, and say what you could not verify.")
+DEADLINE_PREVIEW_CHARS = 500
 
 class Name(Enum):
     WIKI_SEARCH = auto()
@@ -105,10 +154,17 @@ class Tool:
     Attributes:
         name (Name): The name of the tool, represented as an enum member.
         func (Callable): The function to execute the tool's operation.
+        params (List[str]): The function's parameters; a string input is passed as the first.
+        required_params (List[str]): The parameters without a default.
     """
     def __init__(self, name: Name, func: Callable):
         self.name = name
         self.func = func
+        # Read from the signature, so generated tools such as the SerpApi ones are described too
+        parameters = inspect.signature(func).parameters.values()
+        self.params = [param.name for param in parameters if param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD)]
+        self.required_params = [param.name for param in parameters
+                                if param.name in self.params and param.default is param.empty]
 
     def use(self, query: Union[str, Dict[str, str], None] = None) -> Observation:
         """
@@ -122,36 +178,93 @@ class Tool:
                 - None (if the tool does not require an input)
 
         Returns:
-            Observation: The result of the tool execution or an error message.
+            Observation: The result of the tool execution, or the exception it failed with.
         """
         try:
             logger.info(f"Using tool: {self.name} with query: {query}")
 
-            # Check for valid input types
-            if query is None or query == "" or (isinstance(query, dict) and not query):
-                # Handle cases where query is None, an empty string, or an empty dictionary
-                result = self.func()
-            elif isinstance(query, dict):
-                # Ensure the required arguments are present in the dictionary
-                required_args = self.func.__code__.co_varnames[:self.func.__code__.co_argcount]
-                missing_args = [arg for arg in required_args if arg not in query]
-                if missing_args:
-                    raise ValueError(f"Missing required arguments for tool {self.name}: {missing_args}")
-
-                # Call the function with unpacked arguments
-                result = self.func(**query)
-            elif isinstance(query, str):
-                # Pass string input directly
-                result = self.func(query)
-            else:
-                raise ValueError(f"Invalid input type for tool {self.name}: {type(query)}")
+            # Serve repeated calls from the shared result cache while they are fresh
+            cache = get_tool_cache()
+            ttl = get_tool_ttl(self.name.name)
+            key = self.call_key(query) if cache and ttl else None
+            if key:
+                cached = cache.get(key)
+                if cached is not None:
+                    logger.info(f"Tool {self.name} served from cache")
+                    active = current_span()
+                    if active is not None:
+                        active.set_attribute("tool.cache_hit", True)
+                    return cached
+
+            # Requests made by the tool use its timeouts and hedging policy
+            with tool_scope(self.name.name):
+                # Check for valid input types
+                if query is None or query == "" or (isinstance(query, dict) and not query):
+                    # Handle cases where query is None, an empty string, or an empty dictionary
+                    result = self.func()
+                elif isinstance(query, dict):
+                    # Ensure the required arguments are present in the dictionary
+                    missing_args = [arg for arg in self.required_params if arg not in query]
+                    if missing_args:
+                        raise ValueError(f"Missing required arguments for tool {self.name}: {missing_args}")
+
+                    # Call the function with unpacked arguments
+                    result = self.func(**query)
+                elif isinstance(query, str):
+                    # Pass string input directly
+                    result = self.func(query)
+                else:
+                    raise ValueError(f"Invalid input type for tool {self.name}: {type(query)}")
 
             logger.info(f"Tool {self.name} executed successfully with result: {result}")
+            if key and result is not None:
+                cache.set(key, self.name.name, result, ttl)
             return result
         except Exception as e:
             error_msg = f"Error executing tool {self.name}: {e}"
             logger.error(error_msg)
-            return str(e)
+            # Returned rather than raised, so parallel calls still finish; callers tell failures by type
+            return e
+
+    def call_key(self, query: Union[str, Dict[str, Any], None] = None) -> str:
+        """
+        Build a canonical key identifying a call of this tool with the given input.
+
+        String inputs are mapped to the function's first parameter, empty inputs and
+        inputs to parameterless tools collapse to no arguments, and string values are
+        whitespace-normalized, so equivalent requests share a key.
+
+        Args:
+            query (Union[str, Dict[str, Any], None]): The input query for the tool.
+
+        Returns:
+            str: The canonical call key.
+        """
+        params = self.params
+        if not params or query is None or query == "" or (isinstance(query, dict) and not query):
+            args = {}
+        elif isinstance(query, dict):
+            args = query
+        else:
+            args = {params[0]: query}
+        args = {key: " ".join(value.split()) if isinstance(value, str) else value
+                for key, value in args.items() if value is not None}
+        return json.dumps({"tool": self.name.name, "args": args}, sort_keys=True, default=str)
+
+    async def ause(self, query: Union[str, Dict[str, str], None] = None) -> Observation:
+        """
+        Asynchronously executes the tool's function with the provided query.
+
+        Registry functions are blocking, so the call is offloaded to a worker thread
+        and awaited, leaving the event loop free to serve other queries.
+
+        Args:
+            query (Union[str, Dict[str, str], None]): The input query for the tool.
+
+        Returns:
+            Observation: The result of the tool execution, or the exception it failed with.
+        """
+        return await asyncio.to_thread(self.use, query)
 
 
 class Message(BaseModel):
@@ -210,11 +323,13 @@ class ActionState(BaseModel):
         input (str): The input provided to the tool.
         result (Optional[Any]): The result of the action, if available.
         status (str): The current status of the action (e.g., "pending", "completed", "failed").
+        cache_hit (bool): Whether the result was reused from an identical earlier call in the run.
     """
     tool_name: str
     input: str
     result: Optional[Any] = None
     status: str = "pending"
+    cache_hit: bool = False
 
 
 def create_message(role: str, content: Union[str, Dict, Any]) -> Message:
@@ -247,38 +362,111 @@ class Agent:
         model (str): The name of the language model used by the agent.
         max_iterations (int): The maximum number of iterations allowed for processing a query.
         tools (Dict[Name, Tool]): A registry of tools available to the agent.
-        messages (List[Message]): A log of messages exchanged between the user, system, and agent.
+        messages (List[MessageRecord]): A log of messages exchanged between the user, system, and agent.
+        history (HistoryBuffer): The incrementally rendered form of `messages` used in prompts.
         query (str): The current query being processed.
         image_path (Optional[str]): Path to an image for multimodal queries.
         current_iteration (int): The current iteration count of the agent.
-        template (str): The prompt template loaded for generating responses.
+        template (str): The static prompt template (instructions and tool definitions).
+        step_template (str): The per-iteration prompt template (query, image context and history).
+        context_caching (bool): Whether the static prompt prefix is served from the Gemini context cache.
         client: The initialized client for interacting with the language model.
         action_history (List[ActionState]): A history of actions executed by the agent.
         last_action_result (Optional[Any]): The result of the last action executed by the agent.
+        final_answer (Optional[Any]): The final answer of the current run, once given.
+        last_observation (Optional[str]): The projected, size-capped rendering of the last step's
+            results, as it appears in the prompt.
+        max_parallel_actions (int): The maximum number of tools executed concurrently in one step.
+        dispatched (Optional[Tuple]): Tool calls started early while a response was streaming,
+            with the future resolving to their results.
+        prefetch_enabled (bool): Whether likely first tool calls are started speculatively.
+        prefetcher (Prefetcher): The buffer of speculative tool calls for the current run.
+        tool_memo (Dict[str, Any]): Results of the tool calls made in the current run, by call key.
+        tool_calls (Dict[str, asyncio.Future]): The tool calls in flight, by call key.
+        bypass_llm_cache (bool): Whether model calls skip the LLM response cache.
+        answer_cache_enabled (bool): Whether answers to near-duplicate recent queries are reused
+            (see `src.agents.answer_cache`).
+        answer_cache_hit (bool): Whether the current run was answered from the answer cache.
+        prompt_token_budget (Optional[int]): The maximum estimated size of a prompt in tokens;
+            older history is shortened or dropped to fit. None disables the limit.
+        token_usage (List[Dict[str, int]]): Per-iteration prompt size accounting.
+        root_span (Optional[Span]): The tracing span covering the current run.
+        trace_id (Optional[str]): The correlation ID of the current run, shared by all its spans.
+        routing_enabled (bool): Whether obvious single-tool queries skip planning and call the
+            tool directly (see `src.agents.router`).
+        structured_output (bool): Whether the model is asked for JSON constrained by a response schema.
+        response_schema (Optional[types.Schema]): The memoized response schema for the current tools.
+        deadline_seconds (Optional[float]): The default time budget of a run in seconds; None for no limit.
+        deadline (Optional[Deadline]): The deadline of the current run, which bounds every model
+            and tool call made for it.
+        force_answer (bool): Whether the deadline is close enough that the model is told to answer
+            with what it has instead of requesting more actions.
+        deadline_exceeded (bool): Whether the final answer was assembled from the observations
+            so far because the deadline left no time for the model.
     """
 
-    def __init__(self, model: str, max_iterations: int) -> None:
+    def __init__(self, model: str, max_iterations: int,
+                 template: Optional[str] = None,
+                 step_template: Optional[str] = None,
+                 static_prompt: Optional[str] = None,
+                 client: Optional[Any] = None,
+                 tools: Optional[Dict[Name, "Tool"]] = None) -> None:
         """
         Initialize the agent with a specified model and maximum iterations.
 
+        The optional arguments let an `AgentFactory` hand over pieces it has already
+        built; anything not provided is loaded or created here.
+
         Args:
             model (str): The model name to use for generating responses.
             max_iterations (int): Maximum iterations allowed for query processing.
+            template (Optional[str]): A preloaded static prompt template.
+            step_template (Optional[str]): A preloaded per-iteration prompt template.
+            static_prompt (Optional[str]): A pre-rendered static prompt for `tools`.
+            client (Optional[Any]): A shared GenAI client.
+            tools (Optional[Dict[Name, Tool]]): Pre-built tools to register.
 
         Raises:
             ValueError: If `model` is not a string or `max_iterations` is not a positive integer.
         """
         self.model = model
-        self.tools: Dict[Name, Tool] = {}
-        self.messages: List[Message] = []
+        self.tools: Dict[Name, Tool] = dict(tools) if tools else {}
+        self.messages: List[MessageRecord] = []
+        self.history = HistoryBuffer()
         self.query = ""
         self.image_path = None
         self.max_iterations = max_iterations
         self.current_iteration = 0
-        self.template = self.load_template()
-        self.client = initialize_genai_client()
+        self.template = template if template is not None else self.load_template()
+        self.step_template = step_template if step_template is not None else read_file(STEP_TEMPLATE_PATH)
+        self.static_prompt: Optional[str] = static_prompt
+        self.context_caching = CONTEXT_CACHING_ENABLED
+        self.client = client if client is not None else initialize_genai_client()
         self.action_history: List[ActionState] = []
         self.last_action_result: Optional[Any] = None
+        self.last_observation: Optional[str] = None
+        self.final_answer: Optional[Any] = None
+        self.max_parallel_actions = MAX_PARALLEL_ACTIONS
+        self.dispatched: Optional[Tuple[List[Tuple[Name, Any]], asyncio.Future]] = None
+        self.prefetch_enabled = PREFETCH_ENABLED
+        self.prefetcher = Prefetcher()
+        self.tool_memo: Dict[str, Any] = {}
+        self.tool_calls: Dict[str, asyncio.Future] = {}
+        self.bypass_llm_cache = False
+        self.answer_cache_enabled = ANSWER_CACHE_ENABLED
+        self.answer_cache_hit = False
+        self.prompt_token_budget: Optional[int] = PROMPT_TOKEN_BUDGET
+        self.token_usage: List[Dict[str, int]] = []
+        self._history_trim = (0, 0)
+        self.root_span: Optional[Span] = None
+        self.trace_id: Optional[str] = None
+        self.routing_enabled = ROUTING_ENABLED
+        self.structured_output = STRUCTURED_OUTPUT_ENABLED
+        self.response_schema: Optional[types.Schema] = None
+        self.deadline_seconds = QUERY_DEADLINE_SECONDS
+        self.deadline: Optional[Deadline] = None
+        self.force_answer = False
+        self.deadline_exceeded = False
 
         if not isinstance(model, str):
             raise ValueError("Model must be a string")
@@ -293,15 +481,20 @@ class Agent:
             return self.action_history[-1].result
         return None
 
-    def add_action_state(self, tool_name: str, input_query: str) -> None:
+    def add_action_state(self, tool_name: str, input_query: str) -> ActionState:
         """
         Add a new action state to history.
 
         Args:
             tool_name (str): The name of the tool used.
             input_query (str): The input query for the action.
+
+        Returns:
+            ActionState: The newly recorded (pending) action state.
         """
-        self.action_history.append(ActionState(tool_name=tool_name, input=input_query))
+        action_state = ActionState(tool_name=tool_name, input=input_query)
+        self.action_history.append(action_state)
+        return action_state
 
     def update_last_action_state(self, result: Any, status: str) -> None:
         """
@@ -317,6 +510,204 @@ class Agent:
             last_action.status = status
             self.last_action_result = result
 
+    def decode_action_input(self, action: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Decode an action input that carries a JSON object encoded as a string, as the
+        response schema requires for multi-argument tools.
+
+        Args:
+            action (Dict[str, Any]): The action object from the model response.
+
+        Returns:
+            Dict[str, Any]: The action, with a decoded `input` where applicable.
+        """
+        action_input = action.get("input")
+        if not isinstance(action_input, str) or not action_input.strip().startswith("{"):
+            return action
+        try:
+            decoded = json.loads(action_input)
+        except json.JSONDecodeError:
+            return action
+        if not isinstance(decoded, dict):
+            return action
+        return {**action, "input": decoded}
+
+    def resolve_action_input(self, tool_name: Name, action: Dict[str, Any]) -> Union[str, Dict[str, Any]]:
+        """
+        Build the tool input for an action requested by the model.
+
+        Args:
+            tool_name (Name): The tool selected by the model.
+            action (Dict[str, Any]): The action object from the model response.
+
+        Returns:
+            Union[str, Dict[str, Any]]: The input to pass to `Tool.use`.
+        """
+        action = self.decode_action_input(action)
+        if tool_name == Name.GEMINI_MULTIMODAL:
+            action_input = action.get("input", {})
+            if isinstance(action_input, str):
+                action_input = {"text": action_input}
+
+            return {
+                "text": action_input.get("text", self.query),
+                "image_path": action_input.get("image_path", self.image_path)
+            }
+        if self.image_path:
+            return {
+                "text": action.get("input", self.query),
+                "image_path": self.image_path
+            }
+        return action.get("input", self.query)
+
+    def plan_actions(self, response: dict) -> List[Tuple[Name, Any]]:
+        """
+        Resolve the tool calls requested by a model response without executing them.
+
+        Args:
+            response (dict): A (possibly partial) model response holding `action` or `actions`.
+
+        Returns:
+            List[Tuple[Name, Any]]: Pairs of (tool name, tool input) in request order.
+
+        Raises:
+            KeyError: If the response names an unknown tool.
+        """
+        actions = response.get("actions") or response.get("action")
+        if isinstance(actions, dict):
+            actions = [actions]
+
+        planned = []
+        for action in actions:
+            name_str = action["name"].upper()
+            if name_str == "NONE":
+                continue
+            tool_name = Name[name_str]
+            planned.append((tool_name, self.resolve_action_input(tool_name, action)))
+        return planned
+
+    async def arun_tool(self, tool_name: Name, query_input: Any) -> Tuple[Observation, bool]:
+        """
+        Run a single tool call, serving it from the run's memo of earlier identical calls
+        or from the prefetch buffer when possible.
+
+        Identical calls share one request: a call made while an identical one is still in
+        flight, e.g. within the same `actions` step, waits for its result instead.
+
+        Args:
+            tool_name (Name): The tool to run.
+            query_input (Any): The input for the tool.
+
+        Returns:
+            Tuple[Observation, bool]: The tool result, or the exception it failed with, and
+                whether it was reused from an identical call rather than fetched for this one.
+                Only successful results are memoized, so a failed call is retried when
+                requested again.
+        """
+        tool = self.tools[tool_name]
+        key = tool.call_key(query_input)
+        # Early-dispatched calls run in their own task, outside any step span
+        with span("agent.tool", parent=current_span() or self.root_span, **{"tool.name": tool_name.name}) as active, \
+                deadline_scope(self.deadline):
+            if key in self.tool_memo:
+                logger.info(f"Reusing the result of an identical earlier call: {key}")
+                active.set_attribute("tool.memo_hit", True)
+                return self.tool_memo[key], True
+
+            call = self.tool_calls.get(key)
+            if call is not None:
+                logger.info(f"Waiting for an identical call in flight: {key}")
+                active.set_attribute("tool.memo_hit", True)
+                return await asyncio.shield(call), True
+
+            call = self.tool_calls[key] = asyncio.ensure_future(self._acall_tool(tool, key, query_input, active))
+            # Shielded, so a caller giving up (e.g. a discarded dispatch) leaves the call to the others
+            return await asyncio.shield(call), False
+
+    async def _acall_tool(self, tool: Tool, key: str, query_input: Any, active: Span) -> Observation:
+        """
+        Make the call behind `arun_tool` and memoize its result if it succeeded."""
+        try:
+            prefetched = self.prefetcher.take(key)
+            if prefetched is not None:
+                active.set_attribute("tool.prefetch_hit", True)
+                result = await self.await_within_deadline(prefetched, tool.name)
+            else:
+                result = await self.await_within_deadline(tool.ause(query_input), tool.name)
+            if not isinstance(result, Exception):
+                self.tool_memo[key] = result
+            return result
+        finally:
+            self.tool_calls.pop(key, None)
+
+    async def await_within_deadline(self, call: Awaitable[Observation], tool_name: Name) -> Observation:
+        """
+        Await a tool call, giving up once the run's deadline passes.
+
+        Args:
+            call (Awaitable[Observation]): The pending tool call.
+            tool_name (Name): The tool, for the error message.
+
+        Returns:
+            Observation: The tool result, or a DeadlineExceeded error if it did not finish in time.
+        """
+        if self.deadline is None:
+            return await call
+        try:
+            return await asyncio.wait_for(call, max(self.deadline.remaining(), 0.0))
+        except asyncio.TimeoutError:
+            logger.error(f"{tool_name} did not finish before the query deadline")
+            return DeadlineExceeded(f"{tool_name} did not finish before the query deadline")
+
+    def start_prefetch(self) -> None:
+        """
+        Speculatively start the tool calls the model is likely to request first."""
+        if not self.prefetch_enabled or self.image_path:
+            return
+        for name_str, query_input in predict_actions(self.query):
+            tool = self.tools.get(Name[name_str])
+            if tool is not None:
+                self.prefetcher.start(tool.call_key(query_input),
+                                      lambda tool=tool, query_input=query_input: tool.ause(query_input))
+
+    async def aexecute_actions(self, planned: List[Tuple[Name, Any]]) -> List[Tuple[Observation, bool]]:
+        """
+        Execute one or more tool calls concurrently, bounded by `max_parallel_actions`.
+
+        Args:
+            planned (List[Tuple[Name, Any]]): Pairs of (tool name, tool input) in request order.
+
+        Returns:
+            List[Tuple[Observation, bool]]: The tool results and whether each was reused from an
+                identical call (see `arun_tool`), in the same order as `planned`.
+        """
+        if len(planned) == 1:
+            tool_name, query_input = planned[0]
+            return [await self.arun_tool(tool_name, query_input)]
+
+        logger.info(f"Executing {len(planned)} actions concurrently (limit {self.max_parallel_actions})")
+        semaphore = asyncio.Semaphore(self.max_parallel_actions)
+
+        async def _bounded(tool_name: Name, query_input: Any) -> Tuple[Observation, bool]:
+            async with semaphore:
+                return await self.arun_tool(tool_name, query_input)
+
+        return list(await asyncio.gather(*(_bounded(tool_name, query_input)
+                                           for tool_name, query_input in planned)))
+
+    def execute_actions(self, planned: List[Tuple[Name, Any]]) -> List[Tuple[Observation, bool]]:
+        """
+        Synchronous wrapper around `aexecute_actions`.
+
+        Args:
+            planned (List[Tuple[Name, Any]]): Pairs of (tool name, tool input) in request order.
+
+        Returns:
+            List[Tuple[Observation, bool]]: The tool results and whether each was reused, in
+                the same order as `planned`.
+        """
+        return asyncio.run(self.aexecute_actions(planned))
+
     def load_template(self) -> str:
         """
         Load the prompt template for generating responses."""
@@ -331,6 +722,8 @@ class Agent:
             func (Callable[[str], str]): The function to execute for the tool.
         """
         self.tools[name] = Tool(name, func)
+        self.static_prompt = None
+        self.response_schema = None
 
     def trace(self, role: str, content: str) -> None:
         """
@@ -341,24 +734,63 @@ class Agent:
             content (str): The content of the message.
         """
         if role != "system":
-            self.messages.append(Message(role=role, content=content))
+            message = MessageRecord(role, content)
+            self.messages.append(message)
+            self.history.append(message)
 
-    def get_history(self) -> str:
+    def get_history(self, max_tokens: Optional[int] = None) -> str:
         """
-        Retrieve the conversation history including action results."""
-        history = []
-        for msg in self.messages:
-            history.append(f"{msg.role}: {msg.content}")
-        if self.last_action_result:
-            history.append(f"Last action result: {json.dumps(self.last_action_result, indent=2)}")
-        return "\n".join(history)
+        Retrieve the conversation history including action results.
+
+        Args:
+            max_tokens (Optional[int]): A token budget for the history. The latest action
+                result is always kept; older entries are shortened or dropped to fit.
 
-    def ask_gemini(self, prompt: str) -> dict:
+        Returns:
+            str: The rendered history.
         """
-        Generate a response using the language model.
+        history = self.history.render()
+        observation = f"Last action result: {self.last_observation}" if self.last_observation else ""
+        self._history_trim = (0, 0)
+        if max_tokens is not None and estimate_tokens(history) + estimate_tokens(observation) > max_tokens:
+            history, shortened, dropped = fit_history(self.history.lines, max_tokens - estimate_tokens(observation))
+            self._history_trim = (shortened, dropped)
+        if not observation:
+            return history
+        return f"{history}\n{observation}" if history else observation
+
+    def parse_response(self, response: str) -> dict:
+        """
+        Parse the raw model output into a JSON object.
+
+        Args:
+            response (str): The raw text returned by the model.
+
+        Returns:
+            dict: The parsed response, or a dict with an `error` key if parsing fails.
+        """
+        # Log raw response for debugging
+        cleaned_response = response.strip().strip('`').strip()
+        logger.info(f"Raw response before JSON parsing: {cleaned_response}")
+
+        # Handle potential prefixes
+        if cleaned_response.startswith('json'):
+            cleaned_response = cleaned_response[4:].strip()
+
+        # Validate and parse JSON
+        try:
+            return json.loads(cleaned_response)
+        except json.JSONDecodeError as jde:
+            logger.error(f"JSON decode error: {jde} | Response: {cleaned_response}")
+            return {"error": f"Invalid JSON response: {str(jde)}"}
+
+    async def aask_gemini(self, prompt: str, cached_content: Optional[str] = None) -> dict:
+        """
+        Generate a response using the language model without blocking the event loop.
 
         Args:
             prompt (str): The input prompt for the model.
+            cached_content (Optional[str]): Name of a cached prompt prefix to prepend server-side.
 
         Returns:
             dict: The response from the model, parsed as JSON.
@@ -369,31 +801,161 @@ class Agent:
                     "text": prompt,
                     "image_path": self.image_path
                 }
-                response = self.tools[Name.GEMINI_MULTIMODAL].use(multimodal_input)
+                response = await self.await_within_deadline(self.tools[Name.GEMINI_MULTIMODAL].ause(multimodal_input),
+                                                            Name.GEMINI_MULTIMODAL)
+                if isinstance(response, Exception):
+                    raise response
             else:
-                response = generate_content(self.client, self.model, prompt)
+                config = self.build_generation_config(cached_content)
+                with span("llm.generate", kind="CLIENT", **{"gen_ai.request.model": self.model}) as active:
+                    response = await agenerate_content(self.client, self.model, prompt, config,
+                                                       bypass_cache=self.bypass_llm_cache, deadline=self.deadline)
+                    usage_metadata = getattr(response, "usage_metadata", None)
+                    if usage_metadata:
+                        active.set_attribute("gen_ai.usage.input_tokens", usage_metadata.prompt_token_count or 0)
+                        active.set_attribute("gen_ai.usage.output_tokens", usage_metadata.candidates_token_count or 0)
+                        if self.token_usage and self.token_usage[-1]["iteration"] == self.current_iteration:
+                            self.token_usage[-1]["reported_prompt_tokens"] = usage_metadata.prompt_token_count
                 response = str(response.text) if response else {"error": "No response from Gemini"}
-            
-            # Log raw response for debugging
-            cleaned_response = response.strip().strip('`').strip()
-            logger.info(f"Raw response before JSON parsing: {cleaned_response}")
-            
-            # Handle potential prefixes
-            if cleaned_response.startswith('json'):
-                cleaned_response = cleaned_response[4:].strip()
-            
-            # Validate and parse JSON
-            try:
-                return json.loads(cleaned_response)
-            except json.JSONDecodeError as jde:
-                logger.error(f"JSON decode error: {jde} | Response: {cleaned_response}")
-                return {"error": f"Invalid JSON response: {str(jde)}"}
+
+            return self.parse_response(response)
         except Exception as e:
             logger.error(f"Error in ask_gemini: {e}")
             return {"error": str(e)}
 
+    def ask_gemini(self, prompt: str, cached_content: Optional[str] = None) -> dict:
+        """
+        Generate a response using the language model.
+
+        Args:
+            prompt (str): The input prompt for the model.
+            cached_content (Optional[str]): Name of a cached prompt prefix to prepend server-side.
+
+        Returns:
+            dict: The response from the model, parsed as JSON.
+        """
+        return asyncio.run(self.aask_gemini(prompt, cached_content))
+
+    def build_generation_config(self, cached_content: Optional[str] = None) -> Optional[types.GenerateContentConfig]:
+        """
+        Build the generation config for a text-only step.
+
+        Args:
+            cached_content (Optional[str]): Name of a cached prompt prefix to prepend server-side.
+
+        Returns:
+            Optional[types.GenerateContentConfig]: The config, or None if no option applies.
+        """
+        options: Dict[str, Any] = {}
+        if cached_content:
+            options["cached_content"] = cached_content
+        if self.structured_output:
+            if self.response_schema is None:
+                self.response_schema = build_response_schema(
+                    [name.name for name in self.tools if name != Name.NONE],
+                    MAX_ACTIONS_PER_STEP
+                )
+            options["response_mime_type"] = "application/json"
+            options["response_schema"] = self.response_schema
+        return types.GenerateContentConfig(**options) if options else None
+
+    def build_static_prompt(self) -> str:
+        """
+        Render the static prompt prefix: instructions, output format and tool definitions.
+        The result is byte-identical across iterations and queries for the same tool set.
+
+        Returns:
+            str: The static prompt prefix.
+        """
+        if self.static_prompt is None:
+            self.static_prompt = self.template.format(
+                tools=', '.join([str(t.name) for t in self.tools.values()]),
+                max_actions=MAX_ACTIONS_PER_STEP
+            )
+        return self.static_prompt
+
+    def build_step_prompt(self, history_tokens: Optional[int] = None) -> str:
+        """
+        Render the per-iteration prompt suffix: query, image context and history.
+
+        Args:
+            history_tokens (Optional[int]): A token budget for the history, see `get_history`.
 
-    def think(self):
+        Returns:
+            str: The step prompt.
+        """
+        step_prompt = self.step_template.format(
+            query=self.query,
+            image_context=self.image_path,
+            history=self.get_history(history_tokens)
+        )
+        if self.force_answer:
+            step_prompt = f"{step_prompt}\n\n{FORCE_ANSWER_NOTE}"
+        return step_prompt
+
+    def build_prompt(self) -> str:
+        """
+        Render the full prompt for the current iteration (static prefix followed by the step).
+
+        Returns:
+            str: The fully formatted prompt.
+        """
+        return f"{self.build_static_prompt()}\n\n{self.build_step_prompt()}"
+
+    def assemble_prompt(self, cached: bool) -> str:
+        """
+        Render the prompt for the current iteration within `prompt_token_budget` and record
+        its size in `token_usage`.
+
+        The static instructions, the query and the latest action result are always kept;
+        the history gets whatever budget remains.
+
+        Args:
+            cached (bool): Whether the static prefix is served from the context cache, in which
+                case only the step prompt is returned.
+
+        Returns:
+            str: The prompt to send.
+        """
+        static_prompt = self.build_static_prompt()
+        static_tokens = estimate_tokens(static_prompt)
+        history_tokens = None
+        if self.prompt_token_budget is not None:
+            fixed_tokens = (static_tokens + estimate_tokens(self.step_template)
+                            + estimate_tokens(self.query) + estimate_tokens(str(self.image_path)))
+            history_tokens = self.prompt_token_budget - fixed_tokens
+        step_prompt = self.build_step_prompt(history_tokens)
+
+        shortened, dropped = self._history_trim
+        usage = {
+            "iteration": self.current_iteration,
+            "prompt_tokens": static_tokens + estimate_tokens(step_prompt),
+            "cached_tokens": static_tokens if cached else 0,
+            "history_shortened": shortened,
+            "history_dropped": dropped,
+        }
+        self.token_usage.append(usage)
+        logger.info(f"Prompt for iteration {self.current_iteration}: ~{usage['prompt_tokens']} tokens "
+                    f"({usage['cached_tokens']} cached, {shortened} history entries shortened, {dropped} dropped)")
+
+        if cached:
+            return step_prompt
+        return f"{static_prompt}\n\n{step_prompt}"
+
+    async def aget_cached_prefix(self) -> Optional[str]:
+        """
+        Look up the context cache holding the static prompt prefix.
+
+        Returns:
+            Optional[str]: The cached-content name, or None when caching is disabled,
+                unavailable, or the query is multimodal.
+        """
+        if not self.context_caching or self.image_path:
+            return None
+        context_cache = get_context_cache(self.client, self.model, self.build_static_prompt())
+        return await asyncio.to_thread(context_cache.get)
+
+    async def athink(self) -> Optional[dict]:
         """
         Generate the agent's next step based on the current query and context."""
         self.current_iteration += 1
@@ -402,16 +964,9 @@ class Agent:
                        "I couldn't find a satisfactory answer within the allowed iterations.")
             return None
 
-        last_result = self.get_last_action_result()
-        prompt = self.template.format(
-            query=self.query,
-            image_context=self.image_path,
-            history=self.get_history(),
-            tools=', '.join([str(t.name) for t in self.tools.values()]),
-            last_result=json.dumps(last_result) if last_result else "None"
-        )
-
-        response = self.ask_gemini(prompt)
+        cached_content = await self.aget_cached_prefix()
+        prompt = self.assemble_prompt(cached=cached_content is not None)
+        response = await self.aask_gemini(prompt, cached_content)
         if "error" in response:
             self.trace("assistant", f"Error in thinking: {response['error']}")
             return None
@@ -419,56 +974,179 @@ class Agent:
         self.trace("assistant", f"Thought: {response}")
         return response
 
-    def decide_and_act(self, response: dict):
+    def think(self) -> Optional[dict]:
         """
-        Interpret the model's response and execute the appropriate action.
+        Synchronous wrapper around `athink`."""
+        return asyncio.run(self.athink())
 
-        Args:
-            response (dict): The response from the model, parsed as JSON.
+    async def athink_stream(self) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of `athink`.
 
-        Returns:
-            Optional[Any]: The final answer, if available.
+        The response is parsed incrementally while the model is still generating. As soon
+        as the `action`/`actions` field is complete the tool calls are dispatched in the
+        background, and the text of an `answer` field is surfaced as it arrives.
+
+        Yields:
+            Tuple[str, Any]: ("delta", text) for each piece of the answer, then exactly one
+                ("response", Optional[dict]) with the fully parsed response (None on error).
         """
+        self.current_iteration += 1
+        if self.current_iteration > self.max_iterations:
+            self.trace("assistant",
+                       "I couldn't find a satisfactory answer within the allowed iterations.")
+            yield ("response", None)
+            return
+
+        cached_content = await self.aget_cached_prefix()
+        prompt = self.assemble_prompt(cached=cached_content is not None)
+        config = self.build_generation_config(cached_content)
+
+        parser = StreamingJSONParser(stream_keys=["answer"])
+        chunks = []
+        # Spans are started explicitly: the context cannot be held across the yields below
+        llm_span = start_span("llm.generate_stream", parent=self.root_span, kind="CLIENT",
+                              **{"gen_ai.request.model": self.model, "agent.iteration": self.current_iteration})
+        error: Optional[Exception] = None
         try:
-            if "action" in response:
-                action = response["action"]
-                name_str = action["name"].upper()
+            async for chunk in agenerate_content_stream(self.client, self.model, prompt, config,
+                                                        bypass_cache=self.bypass_llm_cache, deadline=self.deadline):
+                chunks.append(chunk)
+                for kind, key, value in parser.feed(chunk):
+                    if kind == "delta":
+                        yield ("delta", value)
+                    elif key in ("action", "actions") and self.dispatched is None:
+                        self.dispatch_actions({key: value})
+            response = self.parse_response(''.join(chunks))
+        except Exception as e:
+            logger.error(f"Error in ask_gemini: {e}")
+            response = {"error": str(e)}
+            error = e
+        finally:
+            # Also reached when the consumer stops iterating early
+            llm_span.end(error)
 
-                if name_str == "NONE":
-                    return None
+        if "error" in response:
+            self.discard_dispatched()
+            self.trace("assistant", f"Error in thinking: {response['error']}")
+            yield ("response", None)
+            return
 
-                tool_name = Name[name_str]
-                self.trace("assistant", f"Action: Using {tool_name} tool")
+        self.trace("assistant", f"Thought: {response}")
+        yield ("response", response)
 
-                if tool_name == Name.GEMINI_MULTIMODAL:
-                    action_input = action.get("input", {})
-                    if isinstance(action_input, str):
-                        action_input = {"text": action_input}
+    def dispatch_actions(self, partial_response: dict) -> None:
+        """
+        Start executing the tool calls of a partially received response in the background.
 
-                    query_input = {
-                        "text": action_input.get("text", self.query),
-                        "image_path": action_input.get("image_path", self.image_path)
-                    }
-                else:
-                    query_input = action.get("input", self.query)
+        Args:
+            partial_response (dict): A dict holding the completed `action` or `actions` field.
+        """
+        try:
+            planned = self.plan_actions(partial_response)
+        except Exception as e:
+            logger.info(f"Not dispatching early, action could not be planned: {e}")
+            return
+        if planned:
+            logger.info(f"Dispatching {len(planned)} action(s) before the response is complete")
+            self.dispatched = (planned, asyncio.ensure_future(self.aexecute_actions(planned)))
 
-                self.add_action_state(name_str, str(query_input))
+    async def acollect_dispatched(self, planned: List[Tuple[Name, Any]]) -> Optional[List[Tuple[Observation, bool]]]:
+        """
+        Return the results of an early dispatch if it matches the final plan.
 
-                result = self.tools[tool_name].use(query_input)
+        Args:
+            planned (List[Tuple[Name, Any]]): The tool calls resolved from the complete response.
 
-                if isinstance(result, Exception):
-                    self.update_last_action_state(str(result), "failed")
-                    observation = f"Error using {tool_name}: {result}"
-                else:
-                    self.update_last_action_state(result, "completed")
-                    observation = f"Observation from {tool_name}: {result}"
+        Returns:
+            Optional[List[Tuple[Observation, bool]]]: The dispatched results (see `aexecute_actions`),
+                or None if nothing matching was dispatched.
+        """
+        if self.dispatched is None:
+            return None
+        dispatched_plan, task = self.dispatched
+        self.dispatched = None
+        if dispatched_plan != planned:
+            task.cancel()
+            return None
+        return await task
+
+    def discard_dispatched(self) -> None:
+        """
+        Cancel an early dispatch whose results will not be used."""
+        if self.dispatched is not None:
+            self.dispatched[1].cancel()
+            self.dispatched = None
+
+    async def adecide_and_act(self, response: dict):
+        """
+        Interpret the model's response and execute the appropriate action.
+
+        Args:
+            response (dict): The response from the model, parsed as JSON.
+
+        Returns:
+            Optional[Any]: The final answer, if available.
+        """
+        try:
+            if self.force_answer and "answer" not in response:
+                # No time is left to act on the request and think again
+                self.discard_dispatched()
+                return self.answer_on_deadline()
+
+            if "actions" in response or "action" in response:
+                planned = self.plan_actions(response)
+                action_states = []
+                for tool_name, query_input in planned:
+                    self.trace("assistant", f"Action: Using {tool_name} tool")
+                    action_state = self.add_action_state(tool_name.name, str(query_input))
+                    action_states.append(action_state)
+
+                if not planned:
+                    self.discard_dispatched()
+                    return None
 
-                self.trace("system", observation)
+                results = await self.acollect_dispatched(planned)
+                if results is None:
+                    results = await self.aexecute_actions(planned)
+
+                step_results = []
+                observations = []
+                for (tool_name, query_input), action_state, (result, reused) in zip(planned, action_states, results):
+                    action_state.cache_hit = reused
+                    if isinstance(result, Exception):
+                        action_state.result = str(result)
+                        action_state.status = "failed"
+                    else:
+                        action_state.result = result
+                        action_state.status = "completed"
+
+                    rendered = render_observation(action_state.tool_name, action_state.result)
+                    if action_state.status == "failed":
+                        self.trace("system", f"Error using {tool_name}: {rendered}")
+                    else:
+                        self.trace("system", f"Observation from {tool_name}: {rendered}")
+
+                    step_results.append({
+                        "tool": action_state.tool_name,
+                        "input": action_state.input,
+                        "result": action_state.result
+                    })
+                    observations.append(f"{action_state.tool_name} ({action_state.input}): {rendered}")
+
+                # A single action keeps its raw result; parallel actions are fed back together
+                if len(step_results) == 1:
+                    self.last_action_result = step_results[0]["result"]
+                    self.last_observation = rendered
+                else:
+                    self.last_action_result = step_results
+                    self.last_observation = "\n" + "\n".join(observations)
                 return None
 
             elif "answer" in response:
                 final = response["answer"]
                 self.trace("assistant", f"Final Answer: {final}")
+                self.final_answer = final
                 return final
 
             else:
@@ -479,17 +1157,88 @@ class Agent:
             self.trace("assistant", f"I encountered an error: {str(e)}. Let me try again.")
             return None
 
-    def run_iter(self, query: Dict[str, Any]):
+    def answer_on_deadline(self) -> str:
+        """
+        Finish the run with the observations gathered so far, for when the deadline leaves no
+        time for another step.
+
+        Returns:
+            str: The final answer.
+        """
+        observations = [f"{state.tool_name} ({state.input}): "
+                        f"{render_observation(state.tool_name, state.result)[:DEADLINE_PREVIEW_CHARS]}"
+                        for state in self.action_history if state.status == "completed"]
+        if not observations and self.last_observation:
+            observations = [self.last_observation.strip()[:DEADLINE_PREVIEW_CHARS]]
+        if observations:
+            final = ("I ran out of time before I could finish researching this. Here is what I found so far:\n"
+                     + "\n".join(observations[-3:]))
+        else:
+            final = "I ran out of time before I could find an answer to this query."
+        logger.info("Answering with the observations so far because the query deadline is reached")
+        if self.root_span is not None:
+            self.root_span.set_attribute("agent.deadline_exceeded", True)
+        self.trace("assistant", f"Final Answer: {final}")
+        self.final_answer = final
+        self.deadline_exceeded = True
+        return final
+
+    def answer_ttl(self) -> Optional[int]:
         """
-        Run a single iteration of the agent's execution loop.
+        Return how long the final answer may be reused: no longer than the results of the
+        tools it is based on, so an answer built on a live or uncacheable tool is not replayed.
+
+        Returns:
+            Optional[int]: The shortest TTL in seconds of the tools used in the run (0 if one of
+                them must not be cached), or None if no tool was used.
+        """
+        ttls = [get_tool_ttl(state.tool_name) for state in self.action_history]
+        return min(ttls) if ttls else None
+
+    @property
+    def answered_on_deadline(self) -> bool:
+        """
+        Whether the final answer was forced or assembled because of the deadline. Such answers
+        may be incomplete, so they are neither cached nor counted as finished by the batch runner.
+        """
+        return self.final_answer is not None and (self.force_answer or self.deadline_exceeded)
+
+    def decide_and_act(self, response: dict):
+        """
+        Synchronous wrapper around `adecide_and_act`.
+
+        Args:
+            response (dict): The response from the model, parsed as JSON.
+
+        Returns:
+            Optional[Any]: The final answer, if available.
+        """
+        return asyncio.run(self.adecide_and_act(response))
+
+    async def arun_iter(self, query: Dict[str, Any], stream: bool = False,
+                        deadline: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the agent's execution loop as an async generator.
+
+        Both the model calls and the tool calls are awaited, so many queries can be
+        served concurrently from a single event loop.
 
         Args:
             query (Dict[str, Any]): A dictionary containing the query text and optional image path.
+            stream (bool): Stream model output: dispatch tool calls as soon as the action is
+                complete and yield the final answer text as it is generated.
+            deadline (Optional[float]): The time budget of the run in seconds; defaults to
+                `deadline_seconds`. Every model and tool call gets at most the remaining time,
+                and once less than `ANSWER_RESERVE_SECONDS` remain the model is told to answer.
 
         Yields:
-            Dict[str, Any]: The state of the agent after each iteration.
+            Dict[str, Any]: The state of the agent after each iteration. In streaming mode,
+                additional {"answer_delta": str} updates (with no messages and done=False)
+                are yielded while the answer is being written.
         """
         logger.info(f'Raw Query: {query}')
+        seconds = deadline if deadline is not None else self.deadline_seconds
+        self.deadline = Deadline(seconds) if seconds else None
 
         if isinstance(query, dict):
             self.query = query.get('text', '')
@@ -507,14 +1256,186 @@ class Agent:
             query_content = self.query
 
         self.trace("user", query_content)
-        final_answer = None
 
+        self.root_span = start_span("agent.run", **{"agent.model": self.model, "agent.multimodal": bool(self.image_path)})
+        self.trace_id = self.root_span.trace_id
+        logger.info(f"Trace ID for query: {self.trace_id}")
+
+        trace = []
+        try:
+            use_answer_cache = self.answer_cache_enabled and not self.image_path
+            if use_answer_cache:
+                cached = get_answer_cache().lookup(self.query)
+                if cached is not None:
+                    self.root_span.set_attribute("agent.answer_cache_hit", True)
+                    async for iteration in self._areplay(*cached):
+                        yield iteration
+                    return
+
+            route = None
+            if self.routing_enabled and not self.image_path:
+                route = match_route(self.query)
+            if route is None:
+                with span("agent.prefetch", parent=self.root_span), deadline_scope(self.deadline):
+                    self.start_prefetch()
+            else:
+                self.root_span.set_attribute("agent.route", route[0].name)
+                async for iteration in self._aroute(*route):
+                    if iteration["messages"]:
+                        trace.append(iteration)
+                    yield iteration
+                    if iteration["done"]:
+                        return
+
+            async for iteration in self._aloop(stream):
+                if iteration["messages"]:
+                    trace.append(iteration)
+                if use_answer_cache and iteration["done"] and self.final_answer is not None and trace \
+                        and not self.answered_on_deadline:
+                    ttl = self.answer_ttl()
+                    if ttl is None or ttl > 0:
+                        get_answer_cache().store(self.query, self.final_answer, trace, ttl)
+                    trace = []
+                yield iteration
+        finally:
+            self.prefetcher.cancel()
+            self.discard_dispatched()
+            for call in list(self.tool_calls.values()):
+                call.cancel()
+            self.root_span.set_attribute("agent.iterations", self.current_iteration)
+            self.root_span.set_attribute("agent.answered", self.final_answer is not None)
+            self.root_span.end()
+
+    async def _areplay(self, cached: CachedAnswer, similarity: float) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Answer the query from the answer cache by replaying the trace of the earlier run.
+
+        Args:
+            cached (CachedAnswer): The cached answer to a similar query.
+            similarity (float): The similarity between the two queries.
+
+        Yields:
+            Dict[str, Any]: The iterations of the earlier run, then a final done iteration.
+        """
+        self.answer_cache_hit = True
+        self.final_answer = cached.answer
+        self.trace("assistant", f"Thought: Reusing the answer to the similar recent query "
+                                f"'{cached.query}' (similarity {similarity:.2f}).")
+        note = [self.messages[-1]]
+        iteration_number = 0
+        for iteration in cached.iterations:
+            self.messages.extend(iteration["messages"])
+            self.history.extend(iteration["messages"])
+            iteration_number = iteration["iteration"]
+            yield {
+                "iteration": iteration_number,
+                "messages": note + list(iteration["messages"]),
+                "done": iteration["done"]
+            }
+            note = []
+        yield {
+            "iteration": iteration_number,
+            "messages": [],
+            "done": True,
+        }
+
+    async def _aroute(self, route: Route, match: Any, tool_input: Any) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Answer a routed query by calling its tool directly and rendering the answer from a template.
+
+        The tool call and the answer are recorded as ordinary iterations, so callers see the
+        same messages as for a planned run. If the result does not fit the route's template,
+        nothing is yielded with done=True and the regular loop takes over with the tool
+        result already in the history.
+
+        Args:
+            route (Route): The matched route.
+            match (Any): The regular expression match of the query.
+            tool_input (Any): The tool input built from the match.
+
+        Yields:
+            Dict[str, Any]: The state of the agent after each iteration.
+        """
+        steps = [{
+            "thought": f"The query maps directly to the {route.tool} tool; calling it without planning.",
+            "action": {"name": route.tool, "input": tool_input},
+        }]
+        while steps and self.current_iteration < self.max_iterations:
+            response = steps.pop(0)
+            self.current_iteration += 1
+            self.trace("assistant", f"Thought: {response}")
+            start_index = len(self.messages) - 1
+            with span("agent.act", parent=self.root_span, **{"agent.iteration": self.current_iteration}):
+                final_answer = await self.adecide_and_act(response)
+            yield {
+                "iteration": self.current_iteration,
+                "messages": self.messages[start_index:len(self.messages)],
+                "done": (final_answer is not None)
+            }
+            if final_answer is not None:
+                yield {
+                    "iteration": self.current_iteration,
+                    "messages": [],
+                    "done": True,
+                }
+                return
+            if "action" in response:
+                answer = render_answer(route, match, self.last_action_result)
+                if answer is not None:
+                    steps.append({"thought": "The tool result answers the query.", "answer": answer})
+
+    async def _aloop(self, stream: bool) -> AsyncIterator[Dict[str, Any]]:
+        """
+        The think/act loop behind `arun_iter`.
+
+        Args:
+            stream (bool): Stream model output, see `arun_iter`.
+
+        Yields:
+            Dict[str, Any]: The state of the agent after each iteration.
+        """
+        final_answer = None
         while final_answer is None and self.current_iteration < self.max_iterations:
-            response = self.think()
+            if self.deadline is not None:
+                remaining = self.deadline.remaining()
+                if remaining < ANSWER_RESERVE_SECONDS and not self.force_answer:
+                    logger.info(f"{remaining:.1f}s left before the query deadline; asking for a final answer")
+                    self.force_answer = True
+                if remaining <= 0:
+                    self.current_iteration += 1
+                    start_index = len(self.messages)
+                    final_answer = self.answer_on_deadline()
+                    yield {
+                        "iteration": self.current_iteration,
+                        "messages": self.messages[start_index:],
+                        "done": True,
+                    }
+                    break
+
+            if stream and not self.image_path:
+                response = None
+                async for kind, value in self.athink_stream():
+                    if kind == "delta":
+                        yield {
+                            "iteration": self.current_iteration,
+                            "messages": [],
+                            "done": False,
+                            "answer_delta": value,
+                        }
+                    else:
+                        response = value
+            else:
+                with span("agent.think", parent=self.root_span, **{"agent.iteration": self.current_iteration + 1}):
+                    response = await self.athink()
             if response is None:
+                messages = []
+                if self.force_answer or (self.deadline is not None and self.deadline.expired):
+                    start_index = len(self.messages)
+                    final_answer = self.answer_on_deadline()
+                    messages = self.messages[start_index:]
                 yield {
                     "iteration": self.current_iteration,
-                    "messages": [],
+                    "messages": messages,
                     "done": True,
                 }
                 break
@@ -522,17 +1443,11 @@ class Agent:
             iteration_messages = []
             start_index = len(self.messages) - 1
 
-            if self.image_path and "action" in response:
-                action = response["action"]
-                if action["name"] != "GEMINI_MULTIMODAL":
-                    # action["name"] = "GEMINI_MULTIMODAL"
-                    action["input"] = {
-                        "text": action.get("input", self.query),
-                        "image_path": self.image_path
-                    }
-                    response["action"] = action
-
-            final_answer = self.decide_and_act(response)
+            with span("agent.act", parent=self.root_span, **{"agent.iteration": self.current_iteration}):
+                final_answer = await self.adecide_and_act(response)
+            self.discard_dispatched()
+            # Prefetches target the first step only
+            self.prefetcher.cancel()
             end_index = len(self.messages)
 
             iteration_messages = self.messages[start_index:end_index]
@@ -549,10 +1464,170 @@ class Agent:
             "done": True,
         }
 
+    def run_iter(self, query: Dict[str, Any], stream: bool = False,
+                 deadline: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Run the agent's execution loop synchronously.
+
+        Thin wrapper that drives `arun_iter` on a private event loop, yielding each
+        iteration as soon as it is available.
+
+        Args:
+            query (Dict[str, Any]): A dictionary containing the query text and optional image path.
+            stream (bool): Stream model output, see `arun_iter`.
+            deadline (Optional[float]): The time budget of the run in seconds, see `arun_iter`.
+
+        Yields:
+            Dict[str, Any]: The state of the agent after each iteration.
+        """
+        loop = asyncio.new_event_loop()
+        iterations = self.arun_iter(query, stream, deadline)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(iterations.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(iterations.aclose())
+            # Closing does not wait for worker threads, so cancelled prefetches cannot hold up the caller
+            loop.close()
+
+
+TOOL_REGISTRY: Dict[Name, Callable] = {
+    Name.WIKI_SEARCH: get_wiki_search_results,
+    Name.GOOGLE_SEARCH: get_google_search_results,
+    Name.CAT_FACT: get_cat_fact,
+    Name.WALMART_SEARCH: get_walmart_basic_search,
+    Name.MULTIPLE_CAT_FACTS: get_multiple_cat_facts,
+    Name.CAT_BREEDS: get_cat_breeds,
+    Name.DOG_IMAGE: get_random_dog_image,
+    Name.MULTIPLE_DOG_IMAGES: get_multiple_dog_images,
+    Name.DOG_BREED_IMAGE: get_random_dog_breed_image,
+    Name.RANDOM_JOKE: get_random_joke,
+    Name.TEN_RANDOM_JOKES: get_ten_random_jokes,
+    Name.RANDOM_JOKE_BY_TYPE: get_random_joke_by_type,
+    Name.ZIP_INFO: get_zip_info,
+    Name.PUBLIC_IP: get_public_ip,
+    Name.CURRENT_LOCATION: get_public_ip_with_location,
+    Name.ISS_LOCATION: get_iss_location,
+    Name.LYRICS: get_lyrics,
+    Name.RANDOM_FOX_IMAGE: get_random_fox_image,
+    Name.TRIVIA_QUESTIONS: get_trivia_questions,
+    Name.EXCHANGE_RATES: get_exchange_rates,
+    Name.GOOGLE_IMAGE_SEARCH: get_google_image_search_results,
+    Name.GOOGLE_NEWS_SEARCH: get_google_news_search,
+    Name.GOOGLE_MAPS_SEARCH: get_google_maps_search,
+    Name.GOOGLE_MAPS_PLACE: get_google_maps_place,
+    Name.GOOGLE_JOBS_SEARCH: get_google_jobs_search,
+    Name.GOOGLE_SHOPPING_SEARCH: get_google_shopping_search,
+    Name.YOUTUBE_SEARCH: get_youtube_basic_search,
+    Name.GOOGLE_PLAY_SEARCH: get_google_play_query_search,
+    Name.GOOGLE_LOCAL_SEARCH: get_google_local_basic_search,
+    Name.GOOGLE_VIDEOS_SEARCH: get_google_videos_basic_search,
+    Name.GOOGLE_EVENTS_SEARCH: get_google_events_basic_search,
+    Name.GOOGLE_FINANCE_SEARCH: get_google_finance_basic_search,
+    Name.GOOGLE_FINANCE_CURRENCY_EXCHANGE: get_google_finance_currency_exchange,
+    Name.GOOGLE_LOCATION_SPECIFIC_SEARCH: get_google_location_specific_search,
+    Name.GEMINI_MULTIMODAL: get_multimodal_reasoning,
+}
+
+
+class AgentFactory:
+    """
+    Process-wide holder of the immutable pieces every agent needs.
+
+    The prompt templates are read once, the static prompt is rendered once, the tool
+    registry is built once and a single GenAI client (and its connection pool) is shared.
+    `create_agent` then only allocates the per-query state. All shared pieces are
+    read-only after construction, so one factory can serve agents on many threads.
+
+    Attributes:
+        model (str): The model used by created agents.
+        template (str): The static prompt template.
+        step_template (str): The per-iteration prompt template.
+        client: The shared GenAI client.
+        tools (Dict[Name, Tool]): The shared tool registry.
+        static_prompt (str): The static prompt rendered for `tools`.
+    """
+
+    def __init__(self, model: str = MODEL, client: Optional[Any] = None,
+                 registry: Optional[Dict[Name, Callable]] = None) -> None:
+        """
+        Build the shared pieces.
+
+        Args:
+            model (str): The model used by created agents.
+            client (Optional[Any]): A GenAI client to share; one is initialized if omitted.
+            registry (Optional[Dict[Name, Callable]]): Tool functions by name; defaults to `TOOL_REGISTRY`.
+        """
+        self.model = model
+        self.template = read_file(PROMPT_TEMPLATE_PATH)
+        self.step_template = read_file(STEP_TEMPLATE_PATH)
+        self.client = client if client is not None else initialize_genai_client()
+        registry = registry if registry is not None else TOOL_REGISTRY
+        self.tools: Dict[Name, Tool] = {name: Tool(name, func) for name, func in registry.items()}
+        self.static_prompt = self.template.format(
+            tools=', '.join([str(t.name) for t in self.tools.values()]),
+            max_actions=MAX_ACTIONS_PER_STEP
+        )
+        logger.info(f"Agent factory ready with {len(self.tools)} tools for model {self.model}")
+
+    def create_agent(self, max_iterations: int) -> Agent:
+        """
+        Create a per-query agent backed by the shared pieces.
+
+        Args:
+            max_iterations (int): The maximum number of iterations the agent can perform.
+
+        Returns:
+            Agent: A fresh agent with all tools registered.
+        """
+        return Agent(
+            model=self.model,
+            max_iterations=max_iterations,
+            template=self.template,
+            step_template=self.step_template,
+            static_prompt=self.static_prompt,
+            client=self.client,
+            tools=self.tools
+        )
+
+
+_agent_factory: Optional[AgentFactory] = None
+_agent_factory_lock = threading.Lock()
+
+
+def get_agent_factory() -> AgentFactory:
+    """
+    Return the process-wide AgentFactory, creating it on first use.
+
+    Returns:
+        AgentFactory: The shared factory.
+    """
+    global _agent_factory
+    if _agent_factory is None:
+        with _agent_factory_lock:
+            if _agent_factory is None:
+                _agent_factory = AgentFactory()
+    return _agent_factory
+
+
+def set_agent_factory(factory: Optional[AgentFactory]) -> None:
+    """
+    Replace the process-wide AgentFactory, e.g. with one built on an offline client.
+
+    Args:
+        factory (Optional[AgentFactory]): The factory to share, or None to build the default one on next use.
+    """
+    global _agent_factory
+    with _agent_factory_lock:
+        _agent_factory = factory
+
 
 def build_agent(max_iterations: int) -> Agent:
     """
-    Helper function to instantiate an Agent, register all tools, and return it.
+    Helper function to create an Agent with all tools registered, using the shared factory.
 
     Args:
         max_iterations (int): The maximum number of iterations the agent can perform.
@@ -560,60 +1635,23 @@ def build_agent(max_iterations: int) -> Agent:
     Returns:
         Agent: An instance of the Agent class with registered tools.
     """
-    agent = Agent(model=MODEL, max_iterations=max_iterations)
-
-    # Register tools for the agent
-    agent.register_tool(Name.WIKI_SEARCH, get_wiki_search_results)
-    agent.register_tool(Name.GOOGLE_SEARCH, get_google_search_results)
-    agent.register_tool(Name.CAT_FACT, get_cat_fact)
-    agent.register_tool(Name.WALMART_SEARCH, get_walmart_basic_search)
-    agent.register_tool(Name.MULTIPLE_CAT_FACTS, get_multiple_cat_facts)
-    agent.register_tool(Name.CAT_BREEDS, get_cat_breeds)
-    agent.register_tool(Name.DOG_IMAGE, get_random_dog_image)
-    agent.register_tool(Name.MULTIPLE_DOG_IMAGES, get_multiple_dog_images)
-    agent.register_tool(Name.DOG_BREED_IMAGE, get_random_dog_breed_image)
-    agent.register_tool(Name.RANDOM_JOKE, get_random_joke)
-    agent.register_tool(Name.TEN_RANDOM_JOKES, get_ten_random_jokes)
-    agent.register_tool(Name.RANDOM_JOKE_BY_TYPE, get_random_joke_by_type)
-    agent.register_tool(Name.ZIP_INFO, get_zip_info)
-    agent.register_tool(Name.PUBLIC_IP, get_public_ip)
-    agent.register_tool(Name.CURRENT_LOCATION, get_public_ip_with_location)
-    agent.register_tool(Name.ISS_LOCATION, get_iss_location)
-    agent.register_tool(Name.LYRICS, get_lyrics)
-    agent.register_tool(Name.RANDOM_FOX_IMAGE, get_random_fox_image)
-    agent.register_tool(Name.TRIVIA_QUESTIONS, get_trivia_questions)
-    agent.register_tool(Name.EXCHANGE_RATES, get_exchange_rates)
-    agent.register_tool(Name.GOOGLE_IMAGE_SEARCH, get_google_image_search_results)
-    agent.register_tool(Name.GOOGLE_NEWS_SEARCH, get_google_news_search)
-    agent.register_tool(Name.GOOGLE_MAPS_SEARCH, get_google_maps_search)
-    agent.register_tool(Name.GOOGLE_MAPS_PLACE, get_google_maps_place)
-    agent.register_tool(Name.GOOGLE_JOBS_SEARCH, get_google_jobs_search)
-    agent.register_tool(Name.GOOGLE_SHOPPING_SEARCH, get_google_shopping_search)
-    agent.register_tool(Name.YOUTUBE_SEARCH, get_youtube_basic_search)
-    agent.register_tool(Name.GOOGLE_PLAY_SEARCH, get_google_play_query_search)
-    agent.register_tool(Name.GOOGLE_LOCAL_SEARCH, get_google_local_basic_search)
-    agent.register_tool(Name.GOOGLE_VIDEOS_SEARCH, get_google_videos_basic_search)
-    agent.register_tool(Name.GOOGLE_EVENTS_SEARCH, get_google_events_basic_search)
-    agent.register_tool(Name.GOOGLE_FINANCE_SEARCH, get_google_finance_basic_search)
-    agent.register_tool(Name.GOOGLE_FINANCE_CURRENCY_EXCHANGE, get_google_finance_currency_exchange)
-    agent.register_tool(Name.GOOGLE_LOCATION_SPECIFIC_SEARCH, get_google_location_specific_search)
-    agent.register_tool(Name.GEMINI_MULTIMODAL, get_multimodal_reasoning)
-
-    return agent
-
-def run_react_agent(query: str, max_iterations: int):
+    return get_agent_factory().create_agent(max_iterations)
+
+def run_react_agent(query: str, max_iterations: int, stream: bool = False, deadline: Optional[float] = None):
     """
     Executes the ReAct agent with the given query and maximum iterations.
 
     Args:
         query (str): The input query string for the agent to process.
         max_iterations (int): The maximum number of iterations the agent is allowed.
+        stream (bool): Stream model output, see `Agent.arun_iter`.
+        deadline (Optional[float]): The time budget of the query in seconds, see `Agent.arun_iter`.
 
     Returns:
         Generator: A generator yielding data for each iteration, including messages and completion status.
     """
     agent = build_agent(max_iterations=max_iterations)
-    return agent.run_iter(query)
+    return agent.run_iter(query, stream, deadline)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,175 @@
+from src.config.logging import logger
+from typing import Callable
+from typing import Optional
+from typing import Pattern
+from typing import Union
+from typing import Tuple
+from typing import Dict
+from typing import List
+from typing import Any
+import datetime
+import re
+
+ToolInput = Union[str, Dict[str, Any]]
+
+CURRENCY_CODES = {
+    "USD", "EUR", "GBP", "JPY", "CNY", "INR", "CAD", "AUD", "NZD", "CHF", "SEK", "NOK", "DKK",
+    "HKD", "SGD", "KRW", "MXN", "BRL", "ZAR", "RUB", "TRY", "PLN", "THB", "IDR", "MYR", "PHP",
+    "AED", "SAR", "ILS", "CZK", "HUF",
+}
+
+
+class Route:
+    """
+    A deterministic mapping from a query pattern to a single tool call and its answer.
+
+    Attributes:
+        name (str): A short identifier used in logs.
+        pattern (Pattern): The regular expression a query must fully match.
+        tool (str): The tool name, e.g. 'ZIP_INFO'.
+        build_input (Callable[[re.Match], Optional[ToolInput]]): Builds the tool input from the
+            match, or returns None to reject it.
+        render (Callable[[re.Match, Any], str]): Formats the tool result as the final answer.
+            May raise if the result does not have the expected shape.
+    """
+
+    def __init__(self, name: str, pattern: str, tool: str,
+                 build_input: Callable[[re.Match], Optional[ToolInput]],
+                 render: Callable[[re.Match, Any], str]) -> None:
+        self.name = name
+        self.pattern: Pattern = re.compile(pattern, re.IGNORECASE)
+        self.tool = tool
+        self.build_input = build_input
+        self.render = render
+
+    def match(self, query: str) -> Optional[Tuple[re.Match, ToolInput]]:
+        """
+        Match the query against this route.
+
+        Args:
+            query (str): The user query.
+
+        Returns:
+            Optional[Tuple[re.Match, ToolInput]]: The match and the tool input, or None.
+        """
+        match = self.pattern.match(query)
+        if not match:
+            return None
+        tool_input = self.build_input(match)
+        if tool_input is None:
+            return None
+        return match, tool_input
+
+
+def _currency_input(match: re.Match) -> Optional[Dict[str, Any]]:
+    """
+    Build EXCHANGE_RATES input for a currency pair, rejecting unknown codes."""
+    base, target = match.group(1).upper(), match.group(2).upper()
+    if base not in CURRENCY_CODES or target not in CURRENCY_CODES or base == target:
+        return None
+    return {"base": base}
+
+
+def _render_currency(match: re.Match, result: Dict[str, Any]) -> str:
+    """
+    Format the rate for the requested pair."""
+    base, target = match.group(1).upper(), match.group(2).upper()
+    rate = result["rates"][target]
+    return f"1 {base} = {rate:.4f} {target} (rates last updated {result['time_last_update_utc']})."
+
+
+def _render_zip(match: re.Match, result: Dict[str, Any]) -> str:
+    """
+    Format the first place for a ZIP code."""
+    place = result["places"][0]
+    return (f"ZIP code {result['post code']} is in {place['place name']}, {place['state']}, "
+            f"{result['country']} (latitude {place['latitude']}, longitude {place['longitude']}).")
+
+
+def _render_iss(match: re.Match, result: Dict[str, Any]) -> str:
+    """
+    Format the ISS position and its timestamp."""
+    position = result["iss_position"]
+    as_of = datetime.datetime.fromtimestamp(int(result["timestamp"]), tz=datetime.timezone.utc)
+    return (f"The International Space Station is currently at latitude {position['latitude']}, "
+            f"longitude {position['longitude']} (as of {as_of:%Y-%m-%d %H:%M:%S} UTC).")
+
+
+def _render_ip(match: re.Match, result: Dict[str, Any]) -> str:
+    """
+    Format the public IP address."""
+    return f"Your public IP address is {result['ip']}."
+
+
+def _render_joke(match: re.Match, result: Dict[str, Any]) -> str:
+    """
+    Format a joke as setup and punchline."""
+    return f"{result['setup']}\n\n{result['punchline']}"
+
+
+def _render_cat_fact(match: re.Match, result: Dict[str, Any]) -> str:
+    """
+    Return the cat fact text."""
+    return result["fact"]
+
+
+ROUTES: List[Route] = [
+    Route("zip_info",
+          r"^\s*(?:what is |info (?:for|on|about) )?zip(?:\s*code)?\s*(\d{5})"
+          r"(?:\s*(?:info|information|details|location))?\s*\??\s*$",
+          "ZIP_INFO", lambda m: {"zip_code": m.group(1)}, _render_zip),
+    Route("currency_exchange",
+          r"^\s*(?:convert\s+)?([a-z]{3})\s*(?:to|/|in|into)\s*([a-z]{3})"
+          r"(?:\s*(?:exchange\s+)?rate)?\s*\??\s*$",
+          "EXCHANGE_RATES", _currency_input, _render_currency),
+    Route("iss_location",
+          r"^\s*where(?:\s+is|'s)\s+the\s+(?:iss|international space station)"
+          r"(?:\s+(?:now|right now|currently))?\s*\??\s*$",
+          "ISS_LOCATION", lambda m: "", _render_iss),
+    Route("public_ip",
+          r"^\s*(?:what(?:'s| is)\s+)?my\s+(?:public\s+)?ip(?:\s+address)?\s*\??\s*$",
+          "PUBLIC_IP", lambda m: "", _render_ip),
+    Route("random_joke",
+          r"^\s*(?:tell me a |give me a |a |random )?joke\s*[.!?]?\s*$",
+          "RANDOM_JOKE", lambda m: "", _render_joke),
+    Route("cat_fact",
+          r"^\s*(?:tell me a |give me a |a |random )?cat fact\s*[.!?]?\s*$",
+          "CAT_FACT", lambda m: "", _render_cat_fact),
+]
+
+
+def match_route(query: str) -> Optional[Tuple[Route, re.Match, ToolInput]]:
+    """
+    Find the first route matching a query.
+
+    Args:
+        query (str): The user query.
+
+    Returns:
+        Optional[Tuple[Route, re.Match, ToolInput]]: The route, its match and the tool input, or None.
+    """
+    for route in ROUTES:
+        matched = route.match(query)
+        if matched:
+            logger.info(f"Query routed to fast path '{route.name}' ({route.tool})")
+            return route, matched[0], matched[1]
+    return None
+
+
+def render_answer(route: Route, match: re.Match, result: Any) -> Optional[str]:
+    """
+    Render a routed tool result as the final answer.
+
+    Args:
+        route (Route): The matched route.
+        match (re.Match): The query match.
+        result (Any): The raw tool result.
+
+    Returns:
+        Optional[str]: The answer, or None if the result does not fit the template.
+    """
+    try:
+        return route.render(match, result)
+    except Exception as e:
+        logger.info(f"Fast path '{route.name}' could not render the result, deferring to the model: {e}")
+        return None
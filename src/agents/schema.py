@@ -0,0 +1,65 @@
+from google.genai import types
+from typing import Iterable
+
+
+def build_action_schema(tool_names: Iterable[str]) -> types.Schema:
+    """
+    Build the schema of a single tool call within a model response.
+
+    Tool inputs are free-form (a query string for most tools, several named arguments for
+    some), which the response schema cannot express as an open object, so inputs are
+    always strings and multi-argument inputs are passed as a JSON object encoded in one.
+
+    Args:
+        tool_names (Iterable[str]): The tool names the model may choose from, e.g. 'GOOGLE_SEARCH'.
+
+    Returns:
+        types.Schema: The action schema.
+    """
+    return types.Schema(
+        type="OBJECT",
+        properties={
+            "name": types.Schema(type="STRING", enum=list(tool_names)),
+            "reason": types.Schema(type="STRING"),
+            "input": types.Schema(
+                type="STRING",
+                description="The tool input. For tools taking several arguments, a JSON object "
+                            "of argument names to values, encoded as a string.",
+            ),
+        },
+        required=["name"],
+        property_ordering=["name", "reason", "input"],
+    )
+
+
+def build_response_schema(tool_names: Iterable[str], max_actions: int) -> types.Schema:
+    """
+    Build the response schema for one ReAct step: a thought followed by exactly one of a
+    single `action`, several independent `actions` or a final `answer`.
+
+    Each branch of the union requires its own field, so a bare thought, which would only
+    waste an iteration, is not a valid response. The fields are ordered so that the thought
+    is generated first, which keeps streamed responses dispatchable early.
+
+    Args:
+        tool_names (Iterable[str]): The tool names the model may choose from, e.g. 'GOOGLE_SEARCH'.
+        max_actions (int): The maximum number of tool calls in one step.
+
+    Returns:
+        types.Schema: The response schema.
+    """
+    action = build_action_schema(tool_names)
+    steps = {
+        "action": action,
+        "actions": types.Schema(type="ARRAY", items=action, min_items="1", max_items=str(max_actions)),
+        "answer": types.Schema(type="STRING"),
+    }
+    return types.Schema(any_of=[
+        types.Schema(
+            type="OBJECT",
+            properties={"thought": types.Schema(type="STRING"), field: schema},
+            required=["thought", field],
+            property_ordering=["thought", field],
+        )
+        for field, schema in steps.items()
+    ])
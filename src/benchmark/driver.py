@@ -0,0 +1,295 @@
+from concurrent.futures import ThreadPoolExecutor
+from src.benchmark.fake_genai import FakeGenAIClient
+from src.benchmark.stand_in import DEFAULT_SERP_RESULTS
+from src.benchmark.stand_in import LocalAPIServer
+from src.agents.react import set_agent_factory
+from src.agents.react import run_react_agent
+from src.agents.react import AgentFactory
+from src.workflow.batch import read_queries
+from src.tools.breaker import breaker_states
+from src.tools.http import set_transport
+from src.config.logging import logger
+from contextvars import ContextVar
+from typing import Optional
+from typing import Dict
+from typing import List
+from typing import Any
+import src.llm.response_cache as response_cache
+import src.config.ratelimit as ratelimit
+import src.agents.react as react
+import src.tools.cache as tool_cache
+import numpy as np
+import argparse
+import logging
+import requests
+import time
+import json
+import os
+
+DEFAULT_CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus.jsonl")
+DEFAULT_CONCURRENCY = 4
+DEFAULT_REPEAT = 5
+DEFAULT_MAX_ITERATIONS = 10
+
+_query_meter: ContextVar[Optional["QueryMeter"]] = ContextVar("query_meter", default=None)
+
+
+class QueryMeter:
+    """
+    Per-query counters of model and HTTP traffic.
+
+    The meter is set in a context variable before the query runs; the agent's tasks and
+    tool threads inherit that context, so every call made for the query is counted here.
+
+    Attributes:
+        llm_calls (int): Model calls made.
+        prompt_bytes (int): Bytes of prompt sent to the model.
+        response_bytes (int): Bytes of model response received.
+        http_requests (int): Tool HTTP requests made.
+        http_bytes (int): Bytes of tool HTTP response bodies received.
+    """
+    __slots__ = ("llm_calls", "prompt_bytes", "response_bytes", "http_requests", "http_bytes")
+
+    def __init__(self) -> None:
+        self.llm_calls = 0
+        self.prompt_bytes = 0
+        self.response_bytes = 0
+        self.http_requests = 0
+        self.http_bytes = 0
+
+
+def _record_llm_call(prompt_bytes: int, response_bytes: int) -> None:
+    """
+    Count a model call against the current query."""
+    meter = _query_meter.get()
+    if meter is not None:
+        meter.llm_calls += 1
+        meter.prompt_bytes += prompt_bytes
+        meter.response_bytes += response_bytes
+
+
+def _metered(server: LocalAPIServer):
+    """
+    Wrap the stand-in's `get` so every response is counted against the current query."""
+    def get(url: str, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> requests.Response:
+        response = server.get(url, params=params, **kwargs)
+        meter = _query_meter.get()
+        if meter is not None:
+            meter.http_requests += 1
+            meter.http_bytes += len(response.content)
+        return response
+    return get
+
+
+def load_corpus(path: str) -> List[Dict[str, Any]]:
+    """
+    Read the benchmark corpus.
+
+    Each line holds a {"id", "text", "script"} record, where `script` lists the model
+    responses to replay in order. Queries without a script search the web once and answer.
+
+    Args:
+        path (str): The path to the corpus JSONL file.
+
+    Returns:
+        List[Dict[str, Any]]: The query records, each with its `id`.
+    """
+    return [dict(record, id=query_id) for query_id, record in read_queries(path)]
+
+
+def run_query(record: Dict[str, Any], max_iterations: int, stream: bool) -> Dict[str, Any]:
+    """
+    Run one query to completion and measure it.
+
+    Args:
+        record (Dict[str, Any]): The query record.
+        max_iterations (int): The maximum number of agent iterations.
+        stream (bool): Stream model output.
+
+    Returns:
+        Dict[str, Any]: The latency, iteration count and traffic of the query.
+    """
+    meter = QueryMeter()
+    _query_meter.set(meter)
+    iterations = 0
+    answered = False
+    error: Optional[str] = None
+    start = time.perf_counter()
+    try:
+        for iteration in run_react_agent({"text": record["text"]}, max_iterations, stream):
+            iterations = max(iterations, iteration.get("iteration", 0))
+            answered = answered or iteration.get("done", False)
+    except Exception as e:
+        logger.error(f"Benchmark query {record['id']} failed: {e}")
+        error = str(e)
+    seconds = time.perf_counter() - start
+    _query_meter.set(None)
+
+    return {
+        "id": record["id"],
+        "seconds": seconds,
+        "iterations": iterations,
+        "answered": answered,
+        "llm_calls": meter.llm_calls,
+        "prompt_bytes": meter.prompt_bytes,
+        "response_bytes": meter.response_bytes,
+        "http_requests": meter.http_requests,
+        "http_bytes": meter.http_bytes,
+        "error": error,
+    }
+
+
+def summarize(results: List[Dict[str, Any]], wall_seconds: float) -> Dict[str, Any]:
+    """
+    Aggregate per-query measurements into the benchmark report.
+
+    Args:
+        results (List[Dict[str, Any]]): The per-query measurements.
+        wall_seconds (float): The wall-clock duration of the run.
+
+    Returns:
+        Dict[str, Any]: Throughput, latency percentiles and per-query means.
+    """
+    latencies = np.array([result["seconds"] for result in results]) * 1000.0
+
+    def mean(key: str) -> float:
+        return round(float(np.mean([result[key] for result in results])), 2) if results else 0.0
+
+    return {
+        "queries": len(results),
+        "errors": sum(1 for result in results if result["error"]),
+        "answered": sum(1 for result in results if result["answered"]),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_qps": round(len(results) / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(float(np.percentile(latencies, 50)), 2),
+            "p95": round(float(np.percentile(latencies, 95)), 2),
+            "p99": round(float(np.percentile(latencies, 99)), 2),
+            "mean": round(float(latencies.mean()), 2),
+            "max": round(float(latencies.max()), 2),
+        } if results else {},
+        "per_query": {
+            "iterations": mean("iterations"),
+            "llm_calls": mean("llm_calls"),
+            "prompt_bytes": mean("prompt_bytes"),
+            "response_bytes": mean("response_bytes"),
+            "http_requests": mean("http_requests"),
+            "http_bytes": mean("http_bytes"),
+        },
+    }
+
+
+def run_benchmark(corpus_path: str = DEFAULT_CORPUS_PATH,
+                  concurrency: int = DEFAULT_CONCURRENCY,
+                  repeat: int = DEFAULT_REPEAT,
+                  max_iterations: int = DEFAULT_MAX_ITERATIONS,
+                  llm_latency: float = 0.0,
+                  http_latency: float = 0.0,
+                  jitter: float = 0.0,
+                  serp_results: int = DEFAULT_SERP_RESULTS,
+                  stream: bool = False,
+                  use_caches: bool = False) -> Dict[str, Any]:
+    """
+    Run the corpus through `run_react_agent` against a scripted model and a local API stand-in.
+
+    No request leaves the machine: the agent factory is rebuilt on a `FakeGenAIClient` and
+    registry HTTP traffic is redirected to a `LocalAPIServer`. The LLM, tool and answer
+    caches are disabled unless `use_caches` is set, so every repetition does the full work,
+    and rate limits are lifted. All of these are restored when the run ends.
+
+    Args:
+        corpus_path (str): The path to the corpus JSONL file.
+        concurrency (int): The number of queries run at the same time.
+        repeat (int): How many times the corpus is run.
+        max_iterations (int): The maximum number of agent iterations per query.
+        llm_latency (float): Simulated seconds per model call.
+        http_latency (float): Simulated seconds per HTTP request.
+        jitter (float): Relative random variation of the model latency.
+        serp_results (int): The number of items in each SerpApi response.
+        stream (bool): Stream model output.
+        use_caches (bool): Enable the LLM cache and keep the tool and answer caches enabled.
+
+    Returns:
+        Dict[str, Any]: The benchmark report, including the circuit breaker states and the
+            settings it ran with.
+
+    Raises:
+        ValueError: If `concurrency` or `repeat` is not a positive integer.
+    """
+    if concurrency <= 0 or repeat <= 0:
+        raise ValueError("concurrency and repeat must be positive integers")
+
+    corpus = load_corpus(corpus_path)
+    scripts = {record["text"]: record["script"] for record in corpus if record.get("script")}
+    settings = {
+        "corpus": corpus_path, "concurrency": concurrency, "repeat": repeat, "max_iterations": max_iterations,
+        "llm_latency": llm_latency, "http_latency": http_latency, "jitter": jitter,
+        "serp_results": serp_results, "stream": stream, "use_caches": use_caches,
+    }
+
+    saved = (response_cache.LLM_CACHE_ENABLED, tool_cache.TOOL_CACHE_ENABLED, react.ANSWER_CACHE_ENABLED)
+    # The LLM cache is opt-in, so it is switched on here rather than left as configured
+    response_cache.LLM_CACHE_ENABLED = use_caches
+    if not use_caches:
+        tool_cache.TOOL_CACHE_ENABLED = False
+        react.ANSWER_CACHE_ENABLED = False
+
+    # The stand-in has no quota to protect
+    rate_limits_enabled = ratelimit.RATE_LIMITS_ENABLED
+    ratelimit.RATE_LIMITS_ENABLED = False
+
+    client = FakeGenAIClient(scripts, latency=llm_latency, jitter=jitter, on_call=_record_llm_call)
+    with LocalAPIServer(latency=http_latency, serp_results=serp_results) as server:
+        set_agent_factory(AgentFactory(client=client))
+        set_transport(_metered(server))
+        try:
+            jobs = corpus * repeat
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                results = list(executor.map(lambda record: run_query(record, max_iterations, stream), jobs))
+            wall_seconds = time.perf_counter() - start
+        finally:
+            set_transport(None)
+            set_agent_factory(None)
+            response_cache.LLM_CACHE_ENABLED, tool_cache.TOOL_CACHE_ENABLED, react.ANSWER_CACHE_ENABLED = saved
+            ratelimit.RATE_LIMITS_ENABLED = rate_limits_enabled
+
+    report = summarize(results, wall_seconds)
+    report["circuit_breakers"] = breaker_states()
+    report["settings"] = settings
+    return report
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse the command-line arguments of the benchmark driver."""
+    parser = argparse.ArgumentParser(description="Benchmark the ReAct agent offline with a scripted model and local APIs.")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_PATH, help="Corpus JSONL file of {\"id\", \"text\", \"script\"} records.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Number of queries run at the same time.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Number of passes over the corpus.")
+    parser.add_argument("--max-iterations", type=int, default=DEFAULT_MAX_ITERATIONS,
+                        help="Maximum number of agent iterations per query.")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated seconds per model call.")
+    parser.add_argument("--http-latency", type=float, default=0.0, help="Simulated seconds per HTTP request.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Relative variation of the model latency, e.g. 0.2.")
+    parser.add_argument("--serp-results", type=int, default=DEFAULT_SERP_RESULTS,
+                        help="Number of items in each SerpApi response.")
+    parser.add_argument("--stream", action="store_true", help="Stream model output.")
+    parser.add_argument("--use-caches", action="store_true", help="Enable the LLM cache and keep the tool and answer caches enabled.")
+    parser.add_argument("--output", help="Also write the JSON report to this file.")
+    parser.add_argument("--quiet", action="store_true", help="Only log warnings and errors while running.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.quiet:
+        logger.setLevel(logging.WARNING)
+    report = run_benchmark(args.corpus, args.concurrency, args.repeat, args.max_iterations,
+                           args.llm_latency, args.http_latency, args.jitter, args.serp_results,
+                           stream=args.stream, use_caches=args.use_caches)
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(rendered + "\n")
+    print(rendered)
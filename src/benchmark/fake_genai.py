@@ -0,0 +1,188 @@
+from src.agents.budget import estimate_tokens
+from typing import AsyncIterator
+from typing import Optional
+from typing import Callable
+from google.genai import types
+from typing import Dict
+from typing import List
+from typing import Any
+import threading
+import asyncio
+import random
+import json
+import time
+import re
+
+QUERY_PATTERN = re.compile(r"^Query: (.*)$", re.MULTILINE)
+STEP_MARKER = "assistant: Thought:"
+STREAM_CHUNKS = 4
+
+Step = Dict[str, Any]
+
+
+def default_script(query: str) -> List[Step]:
+    """
+    The script replayed for queries without one of their own: a web search, then an answer.
+
+    Args:
+        query (str): The user query.
+
+    Returns:
+        List[Step]: The scripted model responses, in order.
+    """
+    return [
+        {"thought": "I should search the web for this.", "action": {"name": "google_search", "input": query}},
+        {"thought": "The search results answer the question.", "answer": f"Here is what I found about: {query}"},
+    ]
+
+
+class _Models:
+    """
+    Synchronous `client.models` stand-in."""
+
+    def __init__(self, client: "FakeGenAIClient") -> None:
+        self._client = client
+
+    def generate_content(self, model: str, contents: Any, config: Optional[Any] = None) -> types.GenerateContentResponse:
+        text = self._client.next_response(contents)
+        self._client.sleep_sync(self._client.latency)
+        return self._client.response(contents, text)
+
+
+class _AsyncModels:
+    """
+    Asynchronous `client.aio.models` stand-in."""
+
+    def __init__(self, client: "FakeGenAIClient") -> None:
+        self._client = client
+
+    async def generate_content(self, model: str, contents: Any,
+                               config: Optional[Any] = None) -> types.GenerateContentResponse:
+        text = self._client.next_response(contents)
+        await asyncio.sleep(self._client.jittered(self._client.latency))
+        return self._client.response(contents, text)
+
+    async def generate_content_stream(self, model: str, contents: Any,
+                                      config: Optional[Any] = None) -> AsyncIterator[types.GenerateContentResponse]:
+        text = self._client.next_response(contents)
+        size = max(len(text) // STREAM_CHUNKS, 1)
+        pieces = [text[i:i + size] for i in range(0, len(text), size)]
+        delay = self._client.latency / max(len(pieces), 1)
+        for piece in pieces:
+            await asyncio.sleep(self._client.jittered(delay))
+            yield self._client.response(contents, piece)
+
+
+class _Aio:
+    """
+    `client.aio` stand-in."""
+
+    def __init__(self, client: "FakeGenAIClient") -> None:
+        self.models = _AsyncModels(client)
+
+
+class _Caches:
+    """
+    `client.caches` stand-in that accepts every cache, so the cached-prefix path is exercised."""
+
+    def __init__(self) -> None:
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def create(self, model: str, config: Optional[Any] = None) -> types.CachedContent:
+        with self._lock:
+            self._count += 1
+            return types.CachedContent(name=f"cachedContents/benchmark-{self._count}", model=model)
+
+    def update(self, name: str, config: Optional[Any] = None) -> types.CachedContent:
+        return types.CachedContent(name=name)
+
+
+class FakeGenAIClient:
+    """
+    An offline `genai.Client` that replays scripted ReAct responses.
+
+    The query is read from the "Query:" line of the step prompt and the step number from
+    the thoughts already in its history, so concurrent agents sharing one client each get
+    their own script. Each response is the JSON of the scripted step; once a script is
+    exhausted its last step is repeated.
+
+    Attributes:
+        scripts (Dict[str, List[Step]]): Scripted responses by query text.
+        latency (float): Seconds per model call; streamed calls spread it over the chunks.
+        jitter (float): Relative random variation of the latency, e.g. 0.2 for ±20%.
+        on_call (Optional[Callable[[int, int], None]]): Called with the prompt and response
+            sizes in bytes of every call.
+        models: The synchronous models interface.
+        aio: The asynchronous interface.
+        caches: The cached-content interface.
+        calls (int): The number of model calls served.
+    """
+
+    def __init__(self, scripts: Optional[Dict[str, List[Step]]] = None, latency: float = 0.0,
+                 jitter: float = 0.0, on_call: Optional[Callable[[int, int], None]] = None,
+                 seed: int = 0) -> None:
+        self.scripts = scripts or {}
+        self.latency = latency
+        self.jitter = jitter
+        self.on_call = on_call
+        self.models = _Models(self)
+        self.aio = _Aio(self)
+        self.caches = _Caches()
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def jittered(self, seconds: float) -> float:
+        """
+        Apply the configured jitter to a delay."""
+        if not self.jitter or seconds <= 0:
+            return seconds
+        with self._lock:
+            factor = self._random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+        return max(seconds * factor, 0.0)
+
+    def sleep_sync(self, seconds: float) -> None:
+        """
+        Block for a jittered delay."""
+        delay = self.jittered(seconds)
+        if delay > 0:
+            time.sleep(delay)
+
+    def next_response(self, contents: Any) -> str:
+        """
+        Pick the scripted response for a prompt.
+
+        Args:
+            contents (Any): The prompt sent to the model.
+
+        Returns:
+            str: The JSON text of the scripted step.
+        """
+        prompt = contents if isinstance(contents, str) else str(contents)
+        match = QUERY_PATTERN.search(prompt)
+        query = match.group(1).strip() if match else ""
+        script = self.scripts.get(query) or default_script(query)
+        step = min(prompt.count(STEP_MARKER), len(script) - 1)
+        text = json.dumps(script[step])
+
+        with self._lock:
+            self.calls += 1
+        if self.on_call is not None:
+            self.on_call(len(prompt.encode("utf-8")), len(text.encode("utf-8")))
+        return text
+
+    def response(self, contents: Any, text: str) -> types.GenerateContentResponse:
+        """
+        Wrap text in a response object with estimated token usage."""
+        prompt = contents if isinstance(contents, str) else str(contents)
+        prompt_tokens = estimate_tokens(prompt)
+        response_tokens = estimate_tokens(text)
+        return types.GenerateContentResponse(
+            candidates=[types.Candidate(content=types.Content(role="model", parts=[types.Part(text=text)]))],
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=response_tokens,
+                total_token_count=prompt_tokens + response_tokens,
+            ),
+        )
@@ -0,0 +1,230 @@
+from http.server import ThreadingHTTPServer
+from http.server import BaseHTTPRequestHandler
+from src.tools.http import get_session
+from src.config.logging import logger
+from urllib.parse import parse_qsl
+from urllib.parse import urlsplit
+from typing import Optional
+from typing import Dict
+from typing import Any
+import threading
+import requests
+import json
+import time
+
+DEFAULT_SERP_RESULTS = 10
+
+SERP_RESULT_KEYS = {
+    "google_maps": "local_results",
+    "google_local": "local_results",
+    "google_jobs": "jobs_results",
+    "google_shopping": "shopping_results",
+    "google_events": "events_results",
+    "google_videos": "video_results",
+    "youtube": "video_results",
+    "google_finance": "markets",
+}
+TBM_RESULT_KEYS = {
+    "nws": "news_results",
+    "isch": "images_results",
+}
+
+
+def serpapi_payload(params: Dict[str, str], results: int) -> Dict[str, Any]:
+    """
+    Build a SerpApi-shaped response with `results` items under the engine's result key.
+
+    :param params: The query parameters of the request.
+    :param results: The number of result items.
+    :return: The response body.
+    """
+    engine = params.get("engine", "google")
+    key = SERP_RESULT_KEYS.get(engine) or TBM_RESULT_KEYS.get(params.get("tbm", ""), "organic_results")
+    query = params.get("q") or params.get("search_query") or params.get("query") or ""
+    items = [
+        {
+            "position": i + 1,
+            "title": f"{query} - result {i + 1}",
+            "link": f"https://example.com/{engine}/{i + 1}",
+            "snippet": f"Benchmark snippet {i + 1} for '{query}'. " * 3,
+        }
+        for i in range(results)
+    ]
+    return {
+        "search_metadata": {"status": "Success", "engine": engine},
+        "search_parameters": {k: v for k, v in params.items() if k != "api_key"},
+        key: items,
+    }
+
+
+def public_api_payload(host: str, path: str, params: Dict[str, str]) -> Optional[Any]:
+    """
+    Build a canned response for one of the public APIs used by the tool registry.
+
+    :param host: The original host name.
+    :param path: The original request path.
+    :param params: The query parameters of the request.
+    :return: The response body, or None if the endpoint is unknown.
+    """
+    segments = [segment for segment in path.split("/") if segment]
+    if host == "catfact.ninja":
+        fact = {"fact": "Cats sleep for around 13 to 16 hours a day.", "length": 44}
+        if path.startswith("/facts"):
+            return {"data": [fact] * int(params.get("limit", 5))}
+        if path.startswith("/breeds"):
+            return {"data": [{"breed": "Abyssinian", "country": "Ethiopia", "origin": "Natural"}]}
+        return fact
+    if host == "dog.ceo":
+        image = "https://images.dog.ceo/breeds/hound-afghan/n02088094_1003.jpg"
+        if segments[-1:] != ["random"]:
+            return {"message": [image] * int(segments[-1]), "status": "success"}
+        return {"message": image, "status": "success"}
+    if host == "official-joke-api.appspot.com":
+        joke = {"id": 1, "type": "general", "setup": "Why did the benchmark cross the road?",
+                "punchline": "To measure the other side."}
+        return [joke] * 10 if path.startswith("/random_ten") else joke
+    if host == "api.zippopotam.us":
+        return {"post code": segments[-1], "country": "United States", "country abbreviation": "US",
+                "places": [{"place name": "Mountain View", "state": "California", "state abbreviation": "CA",
+                            "longitude": "-122.0838", "latitude": "37.4178"}]}
+    if host == "api.ipify.org":
+        return {"ip": "203.0.113.7"}
+    if host == "ip-api.com":
+        return {"status": "success", "country": "United States", "regionName": "California",
+                "city": "Mountain View", "lat": 37.4178, "lon": -122.0838, "query": segments[-1]}
+    if host == "api.open-notify.org":
+        return {"message": "success", "timestamp": int(time.time()),
+                "iss_position": {"latitude": "12.3456", "longitude": "-45.6789"}}
+    if host == "api.lyrics.ovh":
+        return {"lyrics": "La la la\n" * 20}
+    if host == "randomfox.ca":
+        return {"image": "https://randomfox.ca/images/1.jpg", "link": "https://randomfox.ca/?i=1"}
+    if host == "opentdb.com":
+        question = {"category": "General Knowledge", "type": "boolean", "difficulty": "easy",
+                    "question": "The benchmark is offline.", "correct_answer": "True", "incorrect_answers": ["False"]}
+        return {"response_code": 0, "results": [question] * int(params.get("amount", 1))}
+    if host == "en.wikipedia.org":
+        title = params.get("titles", "")
+        return {"batchcomplete": True, "query": {"pages": [
+            {"pageid": 1, "ns": 0, "title": title, "extract": f"{title} is the subject of this offline article."}]}}
+    if host == "open.er-api.com":
+        return {"result": "success", "base_code": segments[-1], "time_last_update_utc": "Mon, 01 Jan 2024 00:00:01 +0000",
+                "rates": {"USD": 1.0, "EUR": 0.92, "GBP": 0.79, "JPY": 151.3, "INR": 83.2, "CAD": 1.36}}
+    return None
+
+
+class LocalAPIServer:
+    """
+    A local HTTP stand-in for serpapi.com and the public APIs used by the tool registry.
+
+    Requests are sent to `http://127.0.0.1:<port>/<original host><original path>` by
+    `get`, which has the signature of `requests.get`, goes over the tools' pooled session
+    and can be installed with `src.tools.http.set_transport`. SerpApi responses carry `serp_results` items, which
+    sets the response size; every response is delayed by `latency` seconds.
+
+    Attributes:
+        latency (float): Seconds to wait before answering each request.
+        serp_results (int): The number of result items in each SerpApi response.
+        requests_served (int): The number of requests answered.
+        base_url (Optional[str]): The server URL, once started.
+    """
+
+    def __init__(self, latency: float = 0.0, serp_results: int = DEFAULT_SERP_RESULTS) -> None:
+        self.latency = latency
+        self.serp_results = serp_results
+        self.requests_served = 0
+        self.base_url: Optional[str] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def payload(self, host: str, path: str, params: Dict[str, str]) -> Optional[Any]:
+        """
+        Build the response body for a request to the original host and path.
+
+        :param host: The original host name.
+        :param path: The original request path.
+        :param params: The query parameters.
+        :return: The response body, or None if the endpoint is unknown.
+        """
+        with self._lock:
+            self.requests_served += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+        if host == "serpapi.com":
+            return serpapi_payload(params, self.serp_results)
+        return public_api_payload(host, path, params)
+
+    def start(self) -> "LocalAPIServer":
+        """
+        Start serving on a free local port in a background thread.
+
+        :return: The server itself.
+        """
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                parts = urlsplit(self.path)
+                host, _, path = parts.path.lstrip("/").partition("/")
+                body = stand_in.payload(host, "/" + path, dict(parse_qsl(parts.query)))
+                status = 200 if body is not None else 404
+                data = json.dumps(body if body is not None else {"error": "Unknown endpoint"}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up waiting, e.g. on a timeout
+                    pass
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Local API stand-in listening on {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "LocalAPIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def rewrite(self, url: str) -> str:
+        """
+        Map an external URL onto the stand-in.
+
+        :param url: The original request URL.
+        :return: The URL of the same endpoint on the stand-in.
+        """
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{self.base_url}/{parts.hostname}{parts.path or '/'}{query}"
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> requests.Response:
+        """
+        Send a GET request meant for `url` to the stand-in instead.
+
+        :param url: The original request URL.
+        :param params: Query parameters.
+        :param kwargs: Further arguments for `requests.Session.get`.
+        :return: The response.
+        """
+        return get_session().get(self.rewrite(url), params=params, **kwargs)
@@ -0,0 +1,424 @@
+from src.config.setup import LOGS_DIR
+from src.config.logging import logger
+from requests.structures import CaseInsensitiveDict
+from collections import deque
+from google.genai import types
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+from typing import TextIO
+from typing import Tuple
+from typing import Deque
+from typing import Dict
+from typing import Any
+import threading
+import requests
+import asyncio
+import hashlib
+import base64
+import gzip
+import json
+import time
+import os
+
+CASSETTE_MODE = os.environ.get("CASSETTE_MODE", "")
+CASSETTE_PATH = os.environ.get("CASSETTE_PATH", os.path.join(LOGS_DIR, "cassette.jsonl.gz"))
+CASSETTE_EMULATE_LATENCY = os.environ.get("CASSETTE_EMULATE_LATENCY", "") == "1"
+CASSETTE_VERSION = 1
+SECRET_PARAMS = {"api_key", "key"}
+
+
+class CassetteMissError(LookupError):
+    """
+    Raised in replay mode for a request that was not recorded."""
+
+
+class ReplayedError(Exception):
+    """
+    An error recorded from the original call, raised again on replay.
+
+    Attributes:
+        status_code (Optional[int]): The status code of the original error, so retry
+            policies behave as they did when the cassette was recorded.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def llm_key(model_id: str, prompt: Any, config: Optional[types.GenerateContentConfig] = None) -> str:
+    """
+    Fingerprint a model request for the cassette.
+
+    The name of a cached prompt prefix changes from run to run, so only whether one was
+    used is part of the key.
+
+    Args:
+        model_id (str): The model ID.
+        prompt (Any): The prompt contents; images should be replaced by a digest.
+        config (Optional[types.GenerateContentConfig]): The generation config, if any.
+
+    Returns:
+        str: A hex digest identifying the request.
+    """
+    dumped = config.model_dump(mode="json", exclude_none=True) if config is not None else {}
+    cached = dumped.pop("cached_content", None) is not None
+    payload = {"model": model_id, "prompt": prompt, "config": dumped, "cached": cached}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def http_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Fingerprint a GET request for the cassette, leaving out API keys.
+
+    Args:
+        url (str): The request URL.
+        params (Optional[Dict[str, Any]]): Query parameters.
+
+    Returns:
+        str: The method, URL and sorted non-secret parameters.
+    """
+    public = {k: v for k, v in (params or {}).items() if k not in SECRET_PARAMS and v is not None}
+    return f"GET {url} {json.dumps(public, sort_keys=True, default=str)}"
+
+
+def _dump_llm_response(response: Any) -> Dict[str, Any]:
+    """
+    Keep the parts of a model response the agent reads: its text and token usage."""
+    usage = getattr(response, "usage_metadata", None)
+    return {
+        "text": response.text if response is not None else None,
+        "usage": usage.model_dump(mode="json", exclude_none=True) if usage is not None else None,
+    }
+
+
+def _load_llm_response(recorded: Dict[str, Any]) -> types.GenerateContentResponse:
+    """
+    Rebuild a model response from its recording."""
+    usage = recorded.get("usage")
+    return types.GenerateContentResponse(
+        candidates=[types.Candidate(content=types.Content(role="model", parts=[types.Part(text=recorded["text"])]))],
+        usage_metadata=types.GenerateContentResponseUsageMetadata(**usage) if usage else None,
+    )
+
+
+def _dump_http_response(response: requests.Response) -> Dict[str, Any]:
+    """
+    Keep the status, content type and body of an HTTP response; never its URL, which may hold keys."""
+    body = response.content
+    try:
+        encoded, encoding = body.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        encoded, encoding = base64.b64encode(body).decode("ascii"), "base64"
+    return {
+        "status": response.status_code,
+        "reason": response.reason,
+        "content_type": response.headers.get("Content-Type"),
+        "body": encoded,
+        "encoding": encoding,
+    }
+
+
+def _load_http_response(recorded: Dict[str, Any], url: str) -> requests.Response:
+    """
+    Rebuild an HTTP response from its recording."""
+    response = requests.Response()
+    response.status_code = recorded["status"]
+    response.reason = recorded.get("reason")
+    response.url = url
+    response.encoding = "utf-8"
+    if recorded.get("content_type"):
+        response.headers = CaseInsensitiveDict({"Content-Type": recorded["content_type"]})
+    body = recorded["body"]
+    response._content = base64.b64decode(body) if recorded.get("encoding") == "base64" else body.encode("utf-8")
+    return response
+
+
+class Cassette:
+    """
+    Records model and HTTP interactions to a file, or serves them back from one.
+
+    A cassette is a gzip-compressed JSON lines file with one interaction per line: its
+    kind ('llm', 'llm_stream', 'http' or 'context_cache'), the request fingerprint, the
+    response or error and the original latency. Recording appends and flushes each
+    interaction as it completes, so an interrupted run keeps what it captured. On
+    replay, interactions with the same fingerprint are served in recorded order (the
+    last one is repeated once they run out) and, with `emulate_latency`, after the
+    original delay.
+
+    Attributes:
+        path (str): The cassette file.
+        mode (str): 'record' or 'replay'.
+        emulate_latency (bool): Whether replayed responses wait for their recorded latency.
+        recorded (int): Interactions written while recording.
+        replayed (int): Interactions served while replaying.
+    """
+
+    def __init__(self, path: str, mode: str, emulate_latency: bool = False) -> None:
+        """
+        Open a cassette.
+
+        Args:
+            path (str): The cassette file.
+            mode (str): 'record' to capture live traffic, 'replay' to serve a recording.
+            emulate_latency (bool): Wait for the recorded latency when replaying.
+
+        Raises:
+            ValueError: If `mode` is not 'record' or 'replay'.
+            OSError: If the file cannot be opened.
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.emulate_latency = emulate_latency
+        self.recorded = 0
+        self.replayed = 0
+        self._interactions: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+        if mode == "replay":
+            with gzip.open(path, 'rt', encoding='utf-8') as file:
+                for line in file:
+                    interaction = json.loads(line)
+                    if "kind" in interaction:
+                        self._interactions.setdefault((interaction["kind"], interaction["key"]), deque()).append(interaction)
+            logger.info(f"Replaying {sum(map(len, self._interactions.values()))} interactions from {path}")
+        else:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = gzip.open(path, 'wt', encoding='utf-8')
+            self._file.write(json.dumps({"version": CASSETTE_VERSION, "created_at": time.time()}) + "\n")
+            logger.info(f"Recording model and HTTP interactions to {path}")
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def close(self) -> None:
+        """
+        Finish writing a recording."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _append(self, kind: str, key: str, latency: float, **fields: Any) -> None:
+        """
+        Write one interaction to the recording."""
+        line = json.dumps({"kind": kind, "key": key, "latency": round(latency, 4), **fields},
+                          ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.recorded += 1
+
+    def _take(self, kind: str, key: str) -> Dict[str, Any]:
+        """
+        Return the next recorded interaction for a fingerprint.
+
+        Raises:
+            CassetteMissError: If nothing was recorded for it.
+        """
+        with self._lock:
+            queue = self._interactions.get((kind, key))
+            if not queue:
+                raise CassetteMissError(f"No recorded {kind} interaction for {key}")
+            interaction = queue.popleft() if len(queue) > 1 else queue[0]
+            self.replayed += 1
+            return interaction
+
+    @staticmethod
+    def _raise_recorded(interaction: Dict[str, Any]) -> None:
+        """
+        Raise the error of a recorded interaction, if it has one."""
+        if "error" in interaction:
+            raise ReplayedError(interaction["error"], interaction.get("status_code"))
+
+    def _wait(self, latency: float) -> None:
+        if self.emulate_latency and latency > 0:
+            time.sleep(latency)
+
+    async def _await(self, latency: float) -> None:
+        if self.emulate_latency and latency > 0:
+            await asyncio.sleep(latency)
+
+    def call(self, kind: str, key: str, func: Callable[[], Any],
+             dump: Callable[[Any], Any] = lambda value: value,
+             load: Callable[[Any], Any] = lambda value: value) -> Any:
+        """
+        Record or replay a blocking call.
+
+        Args:
+            kind (str): The interaction kind.
+            key (str): The request fingerprint.
+            func (Callable[[], Any]): Performs the live call; only used when recording.
+            dump (Callable[[Any], Any]): Turns the result into JSON-serializable data.
+            load (Callable[[Any], Any]): Rebuilds the result from that data.
+
+        Returns:
+            Any: The live or replayed result.
+
+        Raises:
+            CassetteMissError: If replaying a call that was not recorded.
+            ReplayedError: If replaying a call that failed when it was recorded.
+        """
+        if self.replaying:
+            interaction = self._take(kind, key)
+            self._wait(interaction["latency"])
+            self._raise_recorded(interaction)
+            return load(interaction["response"])
+
+        start = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            self._append(kind, key, time.perf_counter() - start, error=str(e), status_code=getattr(e, "status_code", None))
+            raise
+        self._append(kind, key, time.perf_counter() - start, response=dump(result))
+        return result
+
+    async def acall(self, kind: str, key: str, func: Callable[[], Awaitable[Any]],
+                    dump: Callable[[Any], Any] = lambda value: value,
+                    load: Callable[[Any], Any] = lambda value: value) -> Any:
+        """
+        Record or replay an awaitable call; see `call`."""
+        if self.replaying:
+            interaction = self._take(kind, key)
+            await self._await(interaction["latency"])
+            self._raise_recorded(interaction)
+            return load(interaction["response"])
+
+        start = time.perf_counter()
+        try:
+            result = await func()
+        except Exception as e:
+            self._append(kind, key, time.perf_counter() - start, error=str(e), status_code=getattr(e, "status_code", None))
+            raise
+        self._append(kind, key, time.perf_counter() - start, response=dump(result))
+        return result
+
+    def generate(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Record or replay a blocking model call."""
+        return self.call("llm", key, func, _dump_llm_response, _load_llm_response)
+
+    async def agenerate(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Record or replay an asynchronous model call."""
+        return await self.acall("llm", key, func, _dump_llm_response, _load_llm_response)
+
+    async def astream(self, key: str, open_stream: Callable[[], Awaitable[AsyncIterator[Any]]]) -> AsyncIterator[Any]:
+        """
+        Record or replay a streamed model call, chunk by chunk.
+
+        Each chunk is stored with its offset from the start of the call, so replay with
+        `emulate_latency` reproduces the original pacing.
+
+        Args:
+            key (str): The request fingerprint.
+            open_stream (Callable[[], Awaitable[AsyncIterator[Any]]]): Opens the live
+                stream; only used when recording.
+
+        Yields:
+            Any: Response chunks.
+        """
+        if self.replaying:
+            interaction = self._take("llm_stream", key)
+            elapsed = 0.0
+            for offset, text in interaction["chunks"]:
+                await self._await(offset - elapsed)
+                elapsed = offset
+                yield _load_llm_response({"text": text})
+            await self._await(interaction["latency"] - elapsed)
+            self._raise_recorded(interaction)
+            return
+
+        start = time.perf_counter()
+        chunks = []
+        try:
+            async for chunk in await open_stream():
+                chunks.append((round(time.perf_counter() - start, 4), chunk.text or ""))
+                yield chunk
+        except Exception as e:
+            self._append("llm_stream", key, time.perf_counter() - start, chunks=chunks,
+                         error=str(e), status_code=getattr(e, "status_code", None))
+            raise
+        self._append("llm_stream", key, time.perf_counter() - start, chunks=chunks)
+
+    def get(self, url: str, params: Optional[Dict[str, Any]], func: Callable[[], requests.Response]) -> requests.Response:
+        """
+        Record or replay an HTTP GET request.
+
+        Replayed transport errors are raised as `requests.RequestException`, like the original.
+        """
+        try:
+            return self.call("http", http_key(url, params), func, _dump_http_response,
+                             lambda recorded: _load_http_response(recorded, url))
+        except ReplayedError as e:
+            raise requests.RequestException(str(e)) from e
+
+
+_cassette: Optional[Cassette] = None
+_cassette_loaded = False
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """
+    Return the active cassette, if any.
+
+    On first use, a cassette is opened from the `CASSETTE_MODE` ('record' or 'replay'),
+    `CASSETTE_PATH` and `CASSETTE_EMULATE_LATENCY` ('1') environment variables, so any
+    entry point can be recorded or replayed without code changes.
+
+    Returns:
+        Optional[Cassette]: The active cassette, or None.
+    """
+    global _cassette, _cassette_loaded
+    if not _cassette_loaded:
+        with _cassette_lock:
+            if not _cassette_loaded:
+                if CASSETTE_MODE:
+                    _cassette = Cassette(CASSETTE_PATH, CASSETTE_MODE, CASSETTE_EMULATE_LATENCY)
+                _cassette_loaded = True
+    return _cassette
+
+
+def use_cassette(path: str, mode: str, emulate_latency: bool = False) -> Cassette:
+    """
+    Start recording to or replaying from a cassette, closing any active one.
+
+    Args:
+        path (str): The cassette file.
+        mode (str): 'record' or 'replay'.
+        emulate_latency (bool): Wait for the recorded latency when replaying.
+
+    Returns:
+        Cassette: The active cassette.
+    """
+    global _cassette, _cassette_loaded
+    cassette = Cassette(path, mode, emulate_latency)
+    with _cassette_lock:
+        if _cassette is not None:
+            _cassette.close()
+        _cassette = cassette
+        _cassette_loaded = True
+    return cassette
+
+
+def eject_cassette() -> None:
+    """
+    Close the active cassette and go back to live calls."""
+    global _cassette, _cassette_loaded
+    with _cassette_lock:
+        if _cassette is not None:
+            _cassette.close()
+            logger.info(f"Cassette {_cassette.path} closed: {_cassette.recorded} recorded, {_cassette.replayed} replayed")
+        _cassette = None
+        _cassette_loaded = True
@@ -0,0 +1,74 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+from typing import Optional
+import time
+
+_current_deadline: ContextVar[Optional["Deadline"]] = ContextVar("current_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when a query's time budget is used up before an operation could run."""
+
+
+class Deadline:
+    """
+    The point in time by which a query must be answered.
+
+    Attributes:
+        expires_at (float): The expiry on the `time.monotonic` clock.
+    """
+    __slots__ = ("expires_at",)
+
+    def __init__(self, seconds: float) -> None:
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """
+        Seconds left until the deadline; negative once it has passed."""
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def cap(self, timeout: float) -> float:
+        """
+        Limit a per-call timeout to the remaining budget.
+
+        Args:
+            timeout (float): The timeout the call would otherwise get.
+
+        Returns:
+            float: The smaller of `timeout` and the remaining budget.
+
+        Raises:
+            DeadlineExceeded: If the deadline has already passed.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("The query deadline has passed")
+        return min(timeout, remaining)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """
+    Return the deadline of the query running in the current context, if any."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[None]:
+    """
+    Make `deadline` current for everything called within the block, including work handed
+    to threads with `asyncio.to_thread` and tasks created inside it.
+
+    Args:
+        deadline (Optional[Deadline]): The query deadline, or None for no limit.
+    """
+    token = _current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
@@ -0,0 +1,263 @@
+from src.config.deadline import current_deadline
+from src.config.tracing import current_span
+from src.config.deadline import Deadline
+from src.config.logging import logger
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+from typing import Any
+import threading
+import hashlib
+import asyncio
+import json
+import time
+import os
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; limits then apply per process only
+    fcntl = None
+
+RATE_LIMITS_ENABLED = True
+# Sustained requests per second and burst size per credential; tune to the account's plan
+RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "SERP_API_KEY": (5.0, 10.0),
+    "GOOGLE_API_KEY": (15.0, 30.0),
+}
+# How long a request may queue for a token before it fails instead
+MAX_QUEUE_SECONDS = 5.0
+# Set to a directory to share the buckets between processes, e.g. batch workers on one host
+RATE_LIMIT_DIR = os.environ.get("RATE_LIMIT_DIR", "")
+
+
+class RateLimitTimeout(TimeoutError):
+    """
+    Raised when a request would have to queue longer than allowed for a token."""
+
+
+class TokenBucket:
+    """
+    A token bucket limiting the requests made with one credential in this process.
+
+    Requests reserve a token in arrival order: when none is left the bucket goes into
+    debt and the caller sleeps until its token has accrued, so bursts queue instead of
+    drawing 429s from the API.
+
+    Attributes:
+        name (str): The credential the bucket limits, e.g. 'SERP_API_KEY'.
+        rate (float): Tokens added per second.
+        burst (float): The most tokens the bucket holds.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float) -> None:
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._stats = {"acquired": 0, "queued": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+    def _take(self, tokens: float, updated: float, now: float, max_wait: float) -> Tuple[float, float]:
+        """
+        Reserve one token from a bucket state.
+
+        Args:
+            tokens (float): The tokens held when the state was last updated.
+            updated (float): When the state was last updated.
+            now (float): The current time on the same clock.
+            max_wait (float): The longest the caller may wait for the token.
+
+        Returns:
+            Tuple[float, float]: The tokens left after the reservation and the seconds to wait.
+
+        Raises:
+            RateLimitTimeout: If the token would take longer than `max_wait` to accrue.
+        """
+        tokens = min(self.burst, tokens + max(now - updated, 0.0) * self.rate)
+        wait = 0.0 if tokens >= 1.0 else (1.0 - tokens) / self.rate
+        if wait > max_wait:
+            raise RateLimitTimeout(f"Rate limit for {self.name} would delay the request by {wait:.1f}s")
+        return tokens - 1.0, wait
+
+    def reserve(self, max_wait: float) -> float:
+        """
+        Reserve the next token.
+
+        Args:
+            max_wait (float): The longest the caller may wait for the token.
+
+        Returns:
+            float: The seconds to wait before the request may be sent.
+
+        Raises:
+            RateLimitTimeout: If the token would take longer than `max_wait` to accrue.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, wait = self._take(self._tokens, self._updated, now, max_wait)
+            self._updated = now
+        return wait
+
+    def _max_wait(self, deadline: Optional[Deadline]) -> float:
+        deadline = deadline or current_deadline()
+        return min(MAX_QUEUE_SECONDS, deadline.remaining()) if deadline is not None else MAX_QUEUE_SECONDS
+
+    def _record(self, wait: float) -> None:
+        with self._lock:
+            self._stats["acquired"] += 1
+            if wait > 0:
+                self._stats["queued"] += 1
+                self._stats["wait_seconds"] += wait
+                self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], wait)
+        if wait > 0:
+            logger.info(f"Queued {wait:.3f}s for the {self.name} rate limit")
+            active = current_span()
+            if active is not None:
+                active.set_attribute("ratelimit.wait_ms", round(wait * 1000.0, 3))
+
+    def acquire(self, deadline: Optional[Deadline] = None) -> float:
+        """
+        Wait for a token, blocking the calling thread.
+
+        Args:
+            deadline (Optional[Deadline]): The query deadline, which bounds the wait as well
+                as `MAX_QUEUE_SECONDS`. Defaults to the deadline of the current context.
+
+        Returns:
+            float: The seconds spent queueing.
+
+        Raises:
+            RateLimitTimeout: If the token could not be had in time.
+        """
+        wait = self.reserve(self._max_wait(deadline))
+        if wait > 0:
+            time.sleep(wait)
+        self._record(wait)
+        return wait
+
+    async def aacquire(self, deadline: Optional[Deadline] = None) -> float:
+        """
+        Asynchronous counterpart of `acquire` that queues with `asyncio.sleep`.
+
+        Args:
+            deadline (Optional[Deadline]): The query deadline, which bounds the wait as well
+                as `MAX_QUEUE_SECONDS`. Defaults to the deadline of the current context.
+
+        Returns:
+            float: The seconds spent queueing.
+
+        Raises:
+            RateLimitTimeout: If the token could not be had in time.
+        """
+        wait = self.reserve(self._max_wait(deadline))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._record(wait)
+        return wait
+
+    def try_acquire(self) -> bool:
+        """
+        Take a token only if one is available now, without queueing; for optional requests
+        such as hedges, which are better skipped than delayed.
+
+        Returns:
+            bool: True if a token was taken.
+        """
+        try:
+            self.reserve(0.0)
+        except RateLimitTimeout:
+            return False
+        self._record(0.0)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return how many tokens were handed out, how many requests queued and for how long.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    A token bucket whose state lives in a file, so every process on the host that uses the
+    same credential draws from it. The file is locked with `fcntl.flock` while a token is
+    reserved, and the state is kept on the wall clock so processes agree on it.
+
+    Attributes:
+        path (str): The state file.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float, path: str) -> None:
+        super().__init__(name, rate, burst)
+        self.path = path
+
+    def reserve(self, max_wait: float) -> float:
+        with self._lock, open(self.path, 'a+') as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            file.seek(0)
+            raw = file.read()
+            now = time.time()
+            state = json.loads(raw) if raw else {"tokens": self.burst, "updated": now}
+            tokens, wait = self._take(state["tokens"], state["updated"], now, max_wait)
+            file.seek(0)
+            file.truncate()
+            file.write(json.dumps({"tokens": tokens, "updated": now}))
+            file.flush()
+        return wait
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(credential: str, secret: str) -> Optional[TokenBucket]:
+    """
+    Return the process-wide limiter for a credential, creating it on first use.
+
+    Different keys for the same service get separate buckets. With `RATE_LIMIT_DIR` set
+    the bucket is shared with other processes through a file named after a digest of the key.
+
+    Args:
+        credential (str): The credential name in `RATE_LIMITS`, e.g. 'SERP_API_KEY'.
+        secret (str): The key itself.
+
+    Returns:
+        Optional[TokenBucket]: The limiter, or None if rate limiting is disabled or the
+            credential has no limit.
+    """
+    if not RATE_LIMITS_ENABLED or credential not in RATE_LIMITS:
+        return None
+    bucket_id = f"{credential.lower()}-{hashlib.sha256(secret.encode('utf-8')).hexdigest()[:16]}"
+    limiter = _limiters.get(bucket_id)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(bucket_id)
+            if limiter is None:
+                rate, burst = RATE_LIMITS[credential]
+                if RATE_LIMIT_DIR and fcntl is not None:
+                    os.makedirs(RATE_LIMIT_DIR, exist_ok=True)
+                    path = os.path.join(RATE_LIMIT_DIR, f"{bucket_id}.json")
+                    limiter = SharedTokenBucket(credential, rate, burst, path)
+                else:
+                    limiter = TokenBucket(credential, rate, burst)
+                _limiters[bucket_id] = limiter
+    return limiter
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Return the queueing counters of every limiter, keyed by credential name.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Tokens acquired, requests queued and seconds spent queueing.
+    """
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    stats: Dict[str, Dict[str, Any]] = {}
+    for limiter in limiters:
+        totals = stats.setdefault(limiter.name, {"acquired": 0, "queued": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0})
+        for stat, value in limiter.stats().items():
+            totals[stat] = max(totals[stat], value) if stat == "max_wait_seconds" else totals[stat] + value
+    return stats
@@ -10,6 +10,8 @@ import os
 BASE_DIR: str = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT: str = os.path.dirname(os.path.dirname(BASE_DIR))
 DATA_DIR: str = os.path.join(PROJECT_ROOT, 'data')
+CACHE_DIR: str = os.path.join(DATA_DIR, 'cache')
+LOGS_DIR: str = os.path.join(PROJECT_ROOT, 'logs')
 IMAGES_DIR: str = os.path.join(PROJECT_ROOT, 'img')
 GOOGLE_ICON_PATH: str = os.path.join(IMAGES_DIR, 'google_logo.svg')
 TEMPLATES_DIR: str = os.path.join(PROJECT_ROOT, 'templates')
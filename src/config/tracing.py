@@ -0,0 +1,234 @@
+from src.config.setup import LOGS_DIR
+from src.config.logging import logger
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+from typing import Optional
+from typing import TextIO
+from typing import Dict
+from typing import Any
+import threading
+import json
+import time
+import os
+
+TRACING_ENABLED = True
+TRACE_EXPORT_PATH = os.path.join(LOGS_DIR, "traces.jsonl")
+# The export file is rotated once it reaches this size, keeping this many older files
+TRACE_MAX_BYTES = 64 * 1024 * 1024
+TRACE_BACKUPS = 3
+SERVICE_NAME = "agentic-search"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def _attribute_value(value: Any) -> Dict[str, Any]:
+    """
+    Encode an attribute value the way OTLP/JSON does."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Span:
+    """
+    A timed operation within a query, exported in the OpenTelemetry span shape.
+
+    All spans of one query share its `trace_id`, which doubles as the query's correlation ID.
+
+    Attributes:
+        name (str): The operation name, e.g. 'llm.generate'.
+        trace_id (str): 32 hex characters identifying the query.
+        span_id (str): 16 hex characters identifying this span.
+        parent_id (Optional[str]): The span id of the enclosing operation.
+        kind (str): 'INTERNAL' or 'CLIENT' (for calls to remote services).
+        attributes (Dict[str, Any]): Key/value details of the operation.
+        start_ns (int): Start time in nanoseconds since the epoch.
+        end_ns (Optional[int]): End time in nanoseconds since the epoch, once ended.
+        error (Optional[str]): The error message, if the operation failed.
+    """
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "kind", "attributes", "start_ns", "end_ns", "error")
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, kind: str = "INTERNAL",
+                 attributes: Optional[Dict[str, Any]] = None) -> None:
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.kind = kind
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """
+        Attach a detail to the span."""
+        self.attributes[key] = value
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        """
+        Finish the span, marking it failed if `error` is given, and export it once."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        get_exporter().export(self)
+
+    @property
+    def duration_ms(self) -> float:
+        """
+        The span duration in milliseconds (so far, if it has not ended)."""
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def to_otel(self) -> Dict[str, Any]:
+        """
+        Render the span as an OTLP/JSON span with its resource.
+
+        Returns:
+            Dict[str, Any]: The span record.
+        """
+        record = {
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": f"SPAN_KIND_{self.kind}",
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _attribute_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": "STATUS_CODE_ERROR", "message": self.error} if self.error else {"code": "STATUS_CODE_OK"},
+        }
+        if self.parent_id:
+            record["parentSpanId"] = self.parent_id
+        return record
+
+
+class SpanExporter:
+    """
+    Appends ended spans to a JSON lines file, one OTLP/JSON span per line.
+
+    Once the file reaches `max_bytes` it is renamed to `<path>.1`, shifting older files
+    up to `<path>.<backups>` and dropping the oldest, so traces never fill the disk.
+
+    Attributes:
+        path (str): The path to the export file.
+        max_bytes (int): The size at which the file is rotated.
+        backups (int): The number of rotated files kept.
+    """
+
+    def __init__(self, path: str = TRACE_EXPORT_PATH, max_bytes: int = TRACE_MAX_BYTES,
+                 backups: int = TRACE_BACKUPS) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file: Optional[TextIO] = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _rotate(self) -> None:
+        """
+        Close the export file and move it aside, shifting the older files along."""
+        self._file.close()
+        self._file = None
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def export(self, span: Span) -> None:
+        """
+        Write a span, if tracing is enabled. Export failures are logged and ignored."""
+        if not TRACING_ENABLED:
+            return
+        line = json.dumps(span.to_otel(), ensure_ascii=False, default=str)
+        with self._lock:
+            try:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    self._file = open(self.path, 'a')
+                    self._size = os.path.getsize(self.path)
+                self._file.write(line + "\n")
+                self._file.flush()
+                self._size += len(line.encode("utf-8")) + 1
+                if self._size >= self.max_bytes:
+                    self._rotate()
+            except OSError as e:
+                logger.error(f"Failed to export span {span.name}: {e}")
+
+
+_exporter: Optional[SpanExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter() -> SpanExporter:
+    """
+    Return the process-wide span exporter, creating it on first use."""
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = SpanExporter()
+    return _exporter
+
+
+def current_span() -> Optional[Span]:
+    """
+    Return the span active in the current context, if any."""
+    return _current_span.get()
+
+
+def start_span(name: str, parent: Optional[Span] = None, kind: str = "INTERNAL", **attributes: Any) -> Span:
+    """
+    Start a span without making it current; the caller must `end` it.
+
+    Use this for operations that span `yield`s of an async generator, where context
+    changes cannot be undone reliably.
+
+    Args:
+        name (str): The operation name.
+        parent (Optional[Span]): The enclosing span; defaults to the current span.
+        kind (str): 'INTERNAL' or 'CLIENT'.
+        **attributes: Initial span attributes.
+
+    Returns:
+        Span: The started span.
+    """
+    return Span(name, parent if parent is not None else current_span(), kind, attributes)
+
+
+@contextmanager
+def span(name: str, parent: Optional[Span] = None, kind: str = "INTERNAL", **attributes: Any) -> Iterator[Span]:
+    """
+    Time a block as a span that is current for everything called within it, including
+    work handed to threads with `asyncio.to_thread` and tasks created inside the block.
+
+    Args:
+        name (str): The operation name.
+        parent (Optional[Span]): The enclosing span; defaults to the current span.
+        kind (str): 'INTERNAL' or 'CLIENT'.
+        **attributes: Initial span attributes.
+
+    Yields:
+        Span: The active span, for adding attributes.
+    """
+    active = start_span(name, parent, kind, **attributes)
+    token = _current_span.set(active)
+    try:
+        yield active
+    except BaseException as e:
+        active.end(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        active.end()
+
@@ -0,0 +1,144 @@
+from src.config.cassette import get_cassette
+from src.config.logging import logger
+from google.genai import types
+from google import genai
+from typing import Optional
+from typing import Callable
+from typing import Tuple
+from typing import Dict
+import threading
+import hashlib
+import time
+
+CACHE_TTL_SECONDS = 3600
+REFRESH_MARGIN_SECONDS = 300
+RETRY_AFTER_SECONDS = 600
+
+
+class ContextCache:
+    """
+    Registers a static prompt prefix with the Gemini cached-content API and keeps it alive.
+
+    The cache is created lazily on first use and its TTL is extended whenever a lookup
+    happens within `refresh_margin` seconds of expiry. If creation fails (for instance
+    because the prefix is below the model's minimum cacheable size), lookups return None
+    for `retry_after` seconds so callers fall back to sending the prefix inline.
+
+    Attributes:
+        client (genai.Client): The GenAI client used to manage the cache.
+        model (str): The model the cache is bound to.
+        prefix (str): The static prompt prefix.
+        ttl (int): The TTL in seconds requested for the cache.
+        refresh_margin (int): Seconds before expiry at which the TTL is extended.
+        retry_after (int): Seconds to wait before retrying a failed creation.
+        name (Optional[str]): The server-side name of the cache, once created.
+        expires_at (float): Epoch time at which the cache expires.
+        clock (Callable[[], float]): Returns the current epoch time in seconds.
+    """
+
+    def __init__(self, client: genai.Client, model: str, prefix: str,
+                 ttl: int = CACHE_TTL_SECONDS,
+                 refresh_margin: int = REFRESH_MARGIN_SECONDS,
+                 retry_after: int = RETRY_AFTER_SECONDS,
+                 clock: Callable[[], float] = time.time) -> None:
+        self.client = client
+        self.model = model
+        self.prefix = prefix
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.retry_after = retry_after
+        self.clock = clock
+        self.name: Optional[str] = None
+        self.expires_at = 0.0
+        self._disabled_until = 0.0
+        self._lock = threading.Lock()
+
+    def _create(self) -> None:
+        """
+        Create the cached content and record its name and expiry."""
+        def create() -> str:
+            return self.client.caches.create(
+                model=self.model,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=self.prefix,
+                    display_name="react-static-prefix",
+                    ttl=f"{self.ttl}s",
+                ),
+            ).name
+
+        cassette = get_cassette()
+        if cassette is not None:
+            # Replays must see the same caching outcome as the recorded run
+            key = hashlib.sha256(f"{self.model}\n{self.prefix}".encode("utf-8")).hexdigest()
+            self.name = cassette.call("context_cache", key, create)
+        else:
+            self.name = create()
+        self.expires_at = self.clock() + self.ttl
+        logger.info(f"Created context cache {self.name} for model {self.model}")
+
+    def _refresh(self) -> None:
+        """
+        Extend the TTL of the existing cache, recreating it if the update fails."""
+        try:
+            self.client.caches.update(
+                name=self.name,
+                config=types.UpdateCachedContentConfig(ttl=f"{self.ttl}s"),
+            )
+            self.expires_at = self.clock() + self.ttl
+            logger.info(f"Refreshed context cache {self.name}")
+        except Exception as e:
+            logger.error(f"Failed to refresh context cache {self.name}: {e}; recreating")
+            self.name = None
+            self._create()
+
+    def get(self) -> Optional[str]:
+        """
+        Return the name of a live cache for the prefix, creating or refreshing it as needed.
+
+        Returns:
+            Optional[str]: The cached-content name, or None if caching is unavailable.
+        """
+        now = self.clock()
+        if now < self._disabled_until:
+            return None
+        if self.name and now < self.expires_at - self.refresh_margin:
+            return self.name
+
+        with self._lock:
+            now = self.clock()
+            try:
+                if self.name and now < self.expires_at - self.refresh_margin:
+                    return self.name
+                if self.name and now < self.expires_at:
+                    self._refresh()
+                else:
+                    self._create()
+                return self.name
+            except Exception as e:
+                logger.error(f"Context caching unavailable, sending prompt prefix inline: {e}")
+                self.name = None
+                self._disabled_until = now + self.retry_after
+                return None
+
+
+_caches: Dict[Tuple[str, str], ContextCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_context_cache(client: genai.Client, model: str, prefix: str) -> ContextCache:
+    """
+    Return the process-wide ContextCache for a (model, prefix) pair.
+
+    Args:
+        client (genai.Client): The GenAI client used if the cache has to be created.
+        model (str): The model the cache is bound to.
+        prefix (str): The static prompt prefix.
+
+    Returns:
+        ContextCache: The shared cache handle.
+    """
+    key = (model, hashlib.sha256(prefix.encode("utf-8")).hexdigest())
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = ContextCache(client, model, prefix)
+        return _caches[key]
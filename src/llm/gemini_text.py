@@ -1,12 +1,60 @@
 import time
 from src.config.setup import initialize_genai_client
+from src.config.setup import CONFIG
+from src.llm.response_cache import response_cache_key
+from src.llm.response_cache import get_response_cache
+from src.llm.response_cache import cached_response
+from src.config.ratelimit import get_rate_limiter
+from src.config.ratelimit import TokenBucket
+from src.config.cassette import get_cassette
+from src.config.cassette import Cassette
+from src.config.cassette import llm_key
+from src.config.deadline import DeadlineExceeded
+from src.config.deadline import Deadline
 from src.config.logging import logger
+from typing import AsyncIterator
+from google.genai import types
+from typing import Optional
 from google import genai
+import asyncio
+import inspect
 
 RETRYABLE_STATUS_CODES = [400, 500]
 MAX_RETRIES = 5
+CALL_TIMEOUT_SECONDS = 60.0
 
-def generate_content(client: genai.Client, model_id: str, prompt: str) -> str:
+def _attempt_timeout(deadline: Optional[Deadline]) -> float:
+    """
+    Time allowed for the next attempt: `CALL_TIMEOUT_SECONDS`, capped by the query deadline.
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed.
+    """
+    return deadline.cap(CALL_TIMEOUT_SECONDS) if deadline is not None else CALL_TIMEOUT_SECONDS
+
+def _backoff_delay(attempt: int, deadline: Optional[Deadline]) -> float:
+    """
+    The exponential backoff before the next attempt.
+
+    Raises:
+        DeadlineExceeded: If the query deadline would pass before the next attempt could start.
+    """
+    delay = 2 ** attempt
+    if deadline is not None and delay >= deadline.remaining():
+        raise DeadlineExceeded(f"Not enough time left to retry after {attempt + 1} attempt(s)")
+    return delay
+
+def _rate_limiter(cassette: Optional[Cassette]) -> Optional[TokenBucket]:
+    """
+    The limiter for the Gemini API key, or None when a cassette replays the calls instead."""
+    if cassette is not None and cassette.mode == "replay":
+        return None
+    return get_rate_limiter("GOOGLE_API_KEY", str(CONFIG.get("GOOGLE_API_KEY", "")))
+
+def generate_content(client: genai.Client, model_id: str, prompt: str,
+                     config: Optional[types.GenerateContentConfig] = None,
+                     bypass_cache: bool = False,
+                     deadline: Optional[Deadline] = None) -> str:
     """
     Generates content using the GenAI client and specified model with up to 5 retries
     (exponential backoff) if certain status codes (e.g., 400, 500) are encountered.
@@ -15,24 +63,53 @@ def generate_content(client: genai.Client, model_id: str, prompt: str) -> str:
         client (genai.Client): The GenAI client.
         model_id (str): The model ID to use for generation.
         prompt (str): The prompt for content generation.
+        config (Optional[types.GenerateContentConfig]): Optional generation config,
+            e.g. a `cached_content` reference for a cached prompt prefix.
+        bypass_cache (bool): Skip the response cache, e.g. for runs that must sample anew.
+        deadline (Optional[Deadline]): The query deadline. No attempt starts after it has
+            passed and no backoff is slept that would outlast it. Each attempt first queues
+            for a token of the API key's rate limit.
 
     Returns:
         str: The generated content.
 
     Raises:
+        DeadlineExceeded: If the deadline leaves no time for a (further) attempt.
+        RateLimitTimeout: If an attempt would queue too long for a rate-limit token.
         Exception: If content generation fails after retries or a non-retryable error occurs.
     """
+    cache = None if bypass_cache else get_response_cache()
+    key = response_cache_key(model_id, prompt, config) if cache else None
+    cassette = get_cassette()
+    limiter = _rate_limiter(cassette)
+    if key:
+        text = cache.get(key)
+        if text is not None:
+            logger.info("Response served from the LLM response cache.")
+            return cached_response(text)
+
     attempt = 0
     while attempt < MAX_RETRIES:
+        # Blocking calls cannot be interrupted; the deadline is only checked between attempts
+        _attempt_timeout(deadline)
+        if limiter is not None:
+            limiter.acquire(deadline)
         try:
             logger.info(f"Generating content using model: {model_id}, Attempt: {attempt + 1}")
             start_time = time.time()  # Start the timer
-            response = client.models.generate_content(model=model_id, contents=prompt)
+            if cassette is not None:
+                response = cassette.generate(
+                    llm_key(model_id, prompt, config),
+                    lambda: client.models.generate_content(model=model_id, contents=prompt, config=config))
+            else:
+                response = client.models.generate_content(model=model_id, contents=prompt, config=config)
             end_time = time.time()  # End the timer
             elapsed_time = end_time - start_time  # Calculate elapsed time
 
             logger.info(f"Content generated successfully in {elapsed_time:.2f} seconds.")
             logger.info(f"Response: {response.text.strip()}")
+            if key and response.text:
+                cache.set(key, model_id, response.text)
             return response
 
         except Exception as e:
@@ -42,7 +119,7 @@ def generate_content(client: genai.Client, model_id: str, prompt: str) -> str:
             # Retry if we hit one of our "retryable" status codes
             if status_code in RETRYABLE_STATUS_CODES:
                 logger.error("Retryable error encountered; applying exponential backoff.")
-                time.sleep(2 ** attempt)
+                time.sleep(_backoff_delay(attempt, deadline))
                 attempt += 1
             else:
                 # Non-retryable error or unknown status code; log partial response if any, then raise
@@ -60,6 +137,180 @@ def generate_content(client: genai.Client, model_id: str, prompt: str) -> str:
         logger.error("No response available due to an exception.")
     raise Exception("Max retries reached. Content generation failed.")
 
+async def agenerate_content(client: genai.Client, model_id: str, prompt: str,
+                            config: Optional[types.GenerateContentConfig] = None,
+                            bypass_cache: bool = False,
+                            deadline: Optional[Deadline] = None) -> str:
+    """
+    Asynchronous counterpart of `generate_content` using the client's `aio` interface.
+    Applies the same retry policy, backing off with `asyncio.sleep` so the event loop
+    keeps serving other queries while this one waits.
+
+    Args:
+        client (genai.Client): The GenAI client.
+        model_id (str): The model ID to use for generation.
+        prompt (str): The prompt for content generation.
+        config (Optional[types.GenerateContentConfig]): Optional generation config,
+            e.g. a `cached_content` reference for a cached prompt prefix.
+        bypass_cache (bool): Skip the response cache, e.g. for runs that must sample anew.
+        deadline (Optional[Deadline]): The query deadline. No attempt starts after it has
+            passed and no backoff is slept that would outlast it. Each attempt first queues
+            for a token of the API key's rate limit.
+
+    Returns:
+        str: The generated content.
+
+    Raises:
+        DeadlineExceeded: If the deadline leaves no time for a (further) attempt.
+        RateLimitTimeout: If an attempt would queue too long for a rate-limit token.
+        Exception: If content generation fails after retries or a non-retryable error occurs.
+    """
+    cache = None if bypass_cache else get_response_cache()
+    key = response_cache_key(model_id, prompt, config) if cache else None
+    cassette = get_cassette()
+    limiter = _rate_limiter(cassette)
+    if key:
+        text = await asyncio.to_thread(cache.get, key)
+        if text is not None:
+            logger.info("Response served from the LLM response cache.")
+            return cached_response(text)
+
+    attempt = 0
+    while attempt < MAX_RETRIES:
+        timeout = _attempt_timeout(deadline)
+        if limiter is not None:
+            await limiter.aacquire(deadline)
+            timeout = _attempt_timeout(deadline)
+        try:
+            logger.info(f"Generating content asynchronously using model: {model_id}, Attempt: {attempt + 1}")
+            start_time = time.time()
+            if cassette is not None:
+                call = cassette.agenerate(
+                    llm_key(model_id, prompt, config),
+                    lambda: client.aio.models.generate_content(model=model_id, contents=prompt, config=config))
+            else:
+                call = client.aio.models.generate_content(model=model_id, contents=prompt, config=config)
+            response = await asyncio.wait_for(call, timeout)
+            elapsed_time = time.time() - start_time
+
+            logger.info(f"Content generated successfully in {elapsed_time:.2f} seconds.")
+            logger.info(f"Response: {response.text.strip()}")
+            if key and response.text:
+                await asyncio.to_thread(cache.set, key, model_id, response.text)
+            return response
+
+        except Exception as e:
+            status_code = getattr(e, "status_code", None)
+            logger.error(f"Attempt {attempt + 1} failed. Error code: {status_code}, Exception: {e}")
+
+            # A timed-out attempt is retried like a server error while the deadline allows
+            if status_code in RETRYABLE_STATUS_CODES or isinstance(e, asyncio.TimeoutError):
+                logger.error("Retryable error encountered; applying exponential backoff.")
+                await asyncio.sleep(_backoff_delay(attempt, deadline))
+                attempt += 1
+            else:
+                logger.error("Non-retryable error or unknown status code. Aborting.")
+                raise
+
+    logger.error(f"Failed to generate content after {MAX_RETRIES} attempts.")
+    raise Exception("Max retries reached. Content generation failed.")
+
+async def _open_stream(client: genai.Client, model_id: str, prompt: str,
+                       config: Optional[types.GenerateContentConfig] = None) -> AsyncIterator[types.GenerateContentResponse]:
+    """
+    Start a streamed generation, whether the client returns the stream directly or as an awaitable."""
+    stream = client.aio.models.generate_content_stream(model=model_id, contents=prompt, config=config)
+    if inspect.isawaitable(stream):
+        stream = await stream
+    return stream
+
+async def agenerate_content_stream(client: genai.Client, model_id: str, prompt: str,
+                                   config: Optional[types.GenerateContentConfig] = None,
+                                   bypass_cache: bool = False,
+                                   deadline: Optional[Deadline] = None) -> AsyncIterator[str]:
+    """
+    Streams generated text chunk by chunk using the client's `aio` streaming interface.
+    Retryable errors are retried with exponential backoff only while nothing has been
+    yielded yet; once text has reached the caller the error is raised.
+
+    Args:
+        client (genai.Client): The GenAI client.
+        model_id (str): The model ID to use for generation.
+        prompt (str): The prompt for content generation.
+        config (Optional[types.GenerateContentConfig]): Optional generation config.
+        bypass_cache (bool): Skip the response cache, e.g. for runs that must sample anew.
+        deadline (Optional[Deadline]): The query deadline; every chunk must arrive within
+            `CALL_TIMEOUT_SECONDS` and before it. Each attempt first queues for a token of
+            the API key's rate limit.
+
+    Yields:
+        str: Successive pieces of the generated text. A cached response arrives as one piece.
+
+    Raises:
+        DeadlineExceeded: If the deadline leaves no time for a (further) attempt.
+        RateLimitTimeout: If an attempt would queue too long for a rate-limit token.
+        Exception: If streaming fails after retries or a non-retryable error occurs.
+    """
+    cache = None if bypass_cache else get_response_cache()
+    key = response_cache_key(model_id, prompt, config) if cache else None
+    cassette = get_cassette()
+    limiter = _rate_limiter(cassette)
+    if key:
+        text = await asyncio.to_thread(cache.get, key)
+        if text is not None:
+            logger.info("Response served from the LLM response cache.")
+            yield text
+            return
+
+    attempt = 0
+    while attempt < MAX_RETRIES:
+        streamed = False
+        _attempt_timeout(deadline)
+        if limiter is not None:
+            await limiter.aacquire(deadline)
+        try:
+            logger.info(f"Streaming content using model: {model_id}, Attempt: {attempt + 1}")
+            start_time = time.time()
+            if cassette is not None:
+                stream = cassette.astream(llm_key(model_id, prompt, config),
+                                          lambda: _open_stream(client, model_id, prompt, config))
+            else:
+                stream = await _open_stream(client, model_id, prompt, config)
+            chunks = []
+            iterator = stream.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(iterator.__anext__(), _attempt_timeout(deadline))
+                except StopAsyncIteration:
+                    break
+                if chunk.text:
+                    if not streamed:
+                        logger.info(f"First chunk received in {time.time() - start_time:.2f} seconds.")
+                    streamed = True
+                    chunks.append(chunk.text)
+                    yield chunk.text
+
+            logger.info(f"Content streamed successfully in {time.time() - start_time:.2f} seconds.")
+            if key and chunks:
+                await asyncio.to_thread(cache.set, key, model_id, ''.join(chunks))
+            return
+
+        except Exception as e:
+            status_code = getattr(e, "status_code", None)
+            logger.error(f"Attempt {attempt + 1} failed. Error code: {status_code}, Exception: {e}")
+
+            timed_out = isinstance(e, asyncio.TimeoutError) and not isinstance(e, DeadlineExceeded)
+            if (status_code in RETRYABLE_STATUS_CODES or timed_out) and not streamed:
+                logger.error("Retryable error encountered; applying exponential backoff.")
+                await asyncio.sleep(_backoff_delay(attempt, deadline))
+                attempt += 1
+            else:
+                logger.error("Non-retryable error, unknown status code or stream already started. Aborting.")
+                raise
+
+    logger.error(f"Failed to stream content after {MAX_RETRIES} attempts.")
+    raise Exception("Max retries reached. Content generation failed.")
+
 if __name__ == "__main__":
     try:
         gemini_client: genai.Client = initialize_genai_client()
@@ -1,7 +1,12 @@
 from src.config.setup import initialize_genai_client
+from src.config.ratelimit import get_rate_limiter
+from src.config.setup import CONFIG
+from src.config.cassette import get_cassette
+from src.config.cassette import llm_key
 from src.config.logging import logger
 from pathlib import Path
 from PIL import Image
+import hashlib
 
 
 def generate_multimodal_content(prompt: str, image_path: str) -> str:
@@ -19,10 +24,22 @@ def generate_multimodal_content(prompt: str, image_path: str) -> str:
         client = initialize_genai_client()
         image = Image.open(Path(image_path))
         
-        response = client.models.generate_content(
-            model="gemini-2.0-flash-exp",
-            contents=[image, prompt]
-        )
+        cassette = get_cassette()
+        limiter = get_rate_limiter("GOOGLE_API_KEY", str(CONFIG.get("GOOGLE_API_KEY", "")))
+        if limiter is not None and not (cassette is not None and cassette.mode == "replay"):
+            limiter.acquire()
+        if cassette is not None:
+            # Images are fingerprinted by their bytes
+            digest = hashlib.sha256(Path(image_path).read_bytes()).hexdigest()
+            response = cassette.generate(
+                llm_key("gemini-2.0-flash-exp", [f"image:{digest}", prompt]),
+                lambda: client.models.generate_content(model="gemini-2.0-flash-exp", contents=[image, prompt])
+            )
+        else:
+            response = client.models.generate_content(
+                model="gemini-2.0-flash-exp",
+                contents=[image, prompt]
+            )
         return response.text
         
     except Exception as e:
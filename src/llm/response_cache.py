@@ -0,0 +1,189 @@
+from src.config.cassette import get_cassette
+from src.config.cassette import llm_key
+from src.config.setup import CACHE_DIR
+from src.config.logging import logger
+from google.genai import types
+from typing import Optional
+from typing import Any
+import threading
+import sqlite3
+import time
+import zlib
+import os
+
+# Off by default, since a hit replays one sample for every identical prompt; set LLM_CACHE=1
+# (or pass --llm-cache to the batch runner) to reuse responses, e.g. while iterating on prompts
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE", "") == "1"
+LLM_CACHE_PATH = os.path.join(CACHE_DIR, 'llm_responses.sqlite')
+LLM_CACHE_TTL_SECONDS = 24 * 60 * 60
+MAX_LLM_CACHE_BYTES = 128 * 1024 * 1024
+
+
+def response_cache_key(model_id: str, prompt: Any,
+                       config: Optional[types.GenerateContentConfig] = None) -> str:
+    """
+    Fingerprint a generation request.
+
+    Keyed like the cassette: the name of a cached prompt prefix changes from run to run,
+    so only whether one was used is part of the key.
+
+    Args:
+        model_id (str): The model ID.
+        prompt (Any): The prompt contents.
+        config (Optional[types.GenerateContentConfig]): The generation config, if any.
+
+    Returns:
+        str: A hex digest identifying the (model, prompt, config) triple.
+    """
+    return llm_key(model_id, prompt, config)
+
+
+def cached_response(text: str) -> types.GenerateContentResponse:
+    """
+    Wrap cached text in a response object so callers can read `.text` as usual.
+
+    Args:
+        text (str): The cached response text.
+
+    Returns:
+        types.GenerateContentResponse: A single-candidate response holding the text.
+    """
+    return types.GenerateContentResponse(
+        candidates=[types.Candidate(content=types.Content(role="model", parts=[types.Part(text=text)]))]
+    )
+
+
+class ResponseCache:
+    """
+    A disk-backed cache of model response texts keyed on the request fingerprint.
+
+    Entries expire after `ttl` seconds. When the stored size exceeds `max_bytes`, expired
+    entries and then the least recently used ones are evicted. Failures are logged and
+    treated as misses.
+
+    Attributes:
+        path (str): The path to the SQLite database.
+        ttl (int): The time to live of an entry in seconds.
+        max_bytes (int): The maximum total size of the stored (compressed) texts.
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH,
+                 ttl: int = LLM_CACHE_TTL_SECONDS,
+                 max_bytes: int = MAX_LLM_CACHE_BYTES) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, model TEXT, value BLOB, size INTEGER, "
+                "expires_at REAL, accessed_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_accessed ON llm_responses (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Return this thread's connection to the database, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response text.
+
+        Args:
+            key (str): The request fingerprint (see `response_cache_key`).
+
+        Returns:
+            Optional[str]: The cached text, or None on a miss or expiry.
+        """
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value FROM llm_responses WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            with conn:
+                conn.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return zlib.decompress(row[0]).decode("utf-8")
+        except (sqlite3.Error, zlib.error) as e:
+            logger.error(f"LLM cache lookup failed, treating as a miss: {e}")
+            return None
+
+    def set(self, key: str, model_id: str, text: str) -> None:
+        """
+        Store a response text.
+
+        Args:
+            key (str): The request fingerprint (see `response_cache_key`).
+            model_id (str): The model ID, kept for inspection.
+            text (str): The response text.
+        """
+        now = time.time()
+        blob = zlib.compress(text.encode("utf-8"))
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, model, value, size, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model_id, blob, len(blob), now + self.ttl, now)
+                )
+            self._evict(conn, now)
+        except sqlite3.Error as e:
+            logger.error(f"LLM cache write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """
+        Bring the stored size under `max_bytes`: expired entries first, then least recently used."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        with conn:
+            conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (now,))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+            target = int(self.max_bytes * 0.9)
+            evicted = 0
+            for key, size in conn.execute("SELECT key, size FROM llm_responses ORDER BY accessed_at").fetchall():
+                if total <= target:
+                    break
+                conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                total -= size
+                evicted += 1
+        logger.info(f"LLM cache over {self.max_bytes} bytes; evicted {evicted} least recently used entries")
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Return the process-wide response cache, opening it on first use.
+
+    Returns:
+        Optional[ResponseCache]: The shared cache, or None if caching is disabled or unavailable,
+            or a cassette is recording or replaying.
+    """
+    global _response_cache
+    # With a cassette active every call must be recorded or replayed
+    if not LLM_CACHE_ENABLED or get_cassette() is not None:
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                try:
+                    _response_cache = ResponseCache()
+                except (sqlite3.Error, OSError) as e:
+                    logger.error(f"LLM response cache unavailable: {e}")
+                    return None
+    return _response_cache
@@ -0,0 +1,144 @@
+from src.config.logging import logger
+from typing import Optional
+from typing import Callable
+from typing import Tuple
+from typing import Dict
+from typing import Any
+import threading
+import requests
+import time
+import math
+
+BREAKERS_ENABLED = True
+# Consecutive failures that open a host's breaker, and seconds it stays open before a trial request
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT_SECONDS = 30.0
+# Per-host (failure threshold, reset timeout) overrides
+HOST_BREAKER_SETTINGS: Dict[str, Tuple[int, float]] = {
+    "serpapi.com": (8, 15.0),
+}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """
+    Raised instead of sending a request to a host whose breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Tracks the health of one upstream host.
+
+    The breaker is closed while requests succeed. After `failure_threshold` consecutive
+    failures it opens and rejects requests without sending them. Once `reset_timeout`
+    seconds have passed it is half-open: a single trial request goes through, closing the
+    breaker if it succeeds and opening it again if it fails. Time is read from `clock`,
+    a monotonic clock in seconds.
+    """
+
+    def __init__(self, host: str, failure_threshold: int = FAILURE_THRESHOLD,
+                 reset_timeout: float = RESET_TIMEOUT_SECONDS, clock: Callable[[], float] = time.monotonic) -> None:
+        self.host = host
+        self.clock = clock
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.trips = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        """
+        Let a request through or reject it.
+
+        :raises CircuitOpenError: If the breaker is open, or half-open with its trial request
+            still in flight.
+        """
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                logger.info(f"Circuit for {self.host} is half-open; sending a trial request")
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return
+            self.rejected += 1
+            retry_in = max(self.reset_timeout - (self.clock() - self.opened_at), 0.0)
+        raise CircuitOpenError(f"Tool unavailable: {self.host} is failing, so requests to it are skipped for "
+                               f"the next {math.ceil(retry_in)}s. Use a different tool or answer with what you have.")
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit for {self.host} closed")
+            self.state = CLOSED
+            self.failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self.state = OPEN
+                self.opened_at = self.clock()
+                self.trips += 1
+                logger.warning(f"Circuit for {self.host} opened after {self.failures} consecutive failure(s)")
+            self.trial_in_flight = False
+
+    def release(self) -> None:
+        """
+        Forget a request that ended without telling anything about the host's health."""
+        with self._lock:
+            self.trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the breaker's state and counters.
+
+        :return: The state, consecutive failures, times opened and requests rejected.
+        """
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "trips": self.trips, "rejected": self.rejected}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(host: str) -> Optional[CircuitBreaker]:
+    """
+    Return the process-wide breaker for a host, creating it on first use.
+
+    :param host: The upstream host name, e.g. 'api.lyrics.ovh'.
+    :return: The host's breaker, or None if breakers are disabled.
+    """
+    if not BREAKERS_ENABLED:
+        return None
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(host)
+            if breaker is None:
+                failure_threshold, reset_timeout = HOST_BREAKER_SETTINGS.get(
+                    host, (FAILURE_THRESHOLD, RESET_TIMEOUT_SECONDS))
+                breaker = _breakers[host] = CircuitBreaker(host, failure_threshold, reset_timeout)
+    return breaker
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """
+    Return the state and counters of every host's breaker, for metrics.
+
+    :return: Breaker snapshots keyed by host.
+    """
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.host: breaker.snapshot() for breaker in breakers}
@@ -0,0 +1,248 @@
+from collections import OrderedDict
+from src.config.cassette import get_cassette
+from src.config.setup import CACHE_DIR
+from src.config.logging import logger
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+from typing import Any
+import threading
+import sqlite3
+import hashlib
+import json
+import time
+import zlib
+import os
+
+TOOL_CACHE_ENABLED = True
+TOOL_CACHE_PATH = os.path.join(CACHE_DIR, 'tool_results.sqlite')
+MEMORY_CACHE_ITEMS = 256
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 3600
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# Per-tool TTLs in seconds, keyed by tool name. A TTL of 0 disables caching, which is
+# what tools returning random or caller-specific data need. Tools not listed use
+# DEFAULT_TTL_SECONDS.
+TOOL_TTLS: Dict[str, int] = {
+    "WIKI_SEARCH": 7 * DAY,
+    "CAT_BREEDS": 7 * DAY,
+    "ZIP_INFO": 30 * DAY,
+    "LYRICS": 30 * DAY,
+    "GOOGLE_MAPS_PLACE": 7 * DAY,
+    "GOOGLE_PLAY_SEARCH": 1 * DAY,
+    "GOOGLE_SEARCH": 1 * DAY,
+    "GOOGLE_LOCATION_SPECIFIC_SEARCH": 1 * DAY,
+    "GOOGLE_IMAGE_SEARCH": 1 * DAY,
+    "GOOGLE_MAPS_SEARCH": 1 * DAY,
+    "GOOGLE_LOCAL_SEARCH": 1 * DAY,
+    "GOOGLE_VIDEOS_SEARCH": 1 * DAY,
+    "YOUTUBE_SEARCH": 1 * DAY,
+    "GOOGLE_JOBS_SEARCH": 6 * HOUR,
+    "GOOGLE_EVENTS_SEARCH": 6 * HOUR,
+    "GOOGLE_SHOPPING_SEARCH": 6 * HOUR,
+    "WALMART_SEARCH": 6 * HOUR,
+    "GOOGLE_NEWS_SEARCH": 15 * MINUTE,
+    "EXCHANGE_RATES": 1 * HOUR,
+    "GOOGLE_FINANCE_SEARCH": 5 * MINUTE,
+    "GOOGLE_FINANCE_CURRENCY_EXCHANGE": 5 * MINUTE,
+    "PUBLIC_IP": 5 * MINUTE,
+    "CURRENT_LOCATION": 5 * MINUTE,
+    "ISS_LOCATION": 5,
+    "CAT_FACT": 0,
+    "MULTIPLE_CAT_FACTS": 0,
+    "DOG_IMAGE": 0,
+    "MULTIPLE_DOG_IMAGES": 0,
+    "DOG_BREED_IMAGE": 0,
+    "RANDOM_JOKE": 0,
+    "TEN_RANDOM_JOKES": 0,
+    "RANDOM_JOKE_BY_TYPE": 0,
+    "RANDOM_FOX_IMAGE": 0,
+    "TRIVIA_QUESTIONS": 0,
+    "GEMINI_MULTIMODAL": 0,
+}
+
+
+def get_tool_ttl(tool_name: str) -> int:
+    """
+    Return the cache TTL for a tool.
+
+    :param tool_name: The tool name, e.g. 'GOOGLE_SEARCH'.
+    :return: The TTL in seconds; 0 if results of the tool must not be cached.
+    """
+    return TOOL_TTLS.get(tool_name, DEFAULT_TTL_SECONDS)
+
+
+class ToolResultCache:
+    """
+    A persistent cache of tool results shared by every process on the host.
+
+    Results live in a SQLite database (zlib-compressed JSON, one row per call key) with
+    a small in-process LRU in front of it. Entries expire after their tool's TTL. When
+    the database grows beyond `max_bytes`, expired entries and then the least recently
+    used ones are evicted. Cache failures are logged and treated as misses, so a broken
+    cache never breaks a tool call.
+
+    Attributes:
+        path (str): The path to the SQLite database.
+        max_bytes (int): The maximum total size of the stored (compressed) values.
+        memory_items (int): The number of entries kept in the in-process LRU.
+    """
+
+    def __init__(self, path: str = TOOL_CACHE_PATH,
+                 max_bytes: int = MAX_CACHE_BYTES,
+                 memory_items: int = MEMORY_CACHE_ITEMS) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tool_results ("
+                "key TEXT PRIMARY KEY, tool TEXT, value BLOB, size INTEGER, "
+                "expires_at REAL, accessed_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tool_results_accessed ON tool_results (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Return this thread's connection to the database, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _hash(key: str) -> str:
+        """
+        Hash a canonical call key into a fixed-size row key."""
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, expires_at: float, value: Any) -> None:
+        """
+        Put an entry in the in-process LRU, evicting the least recently used one if full."""
+        with self._memory_lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached result.
+
+        :param key: The canonical call key (see `Tool.call_key`).
+        :return: The cached result, or None on a miss or expiry.
+        """
+        now = time.time()
+        row_key = self._hash(key)
+        with self._memory_lock:
+            entry = self._memory.get(row_key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(row_key)
+                    return entry[1]
+                del self._memory[row_key]
+
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, expires_at FROM tool_results WHERE key = ? AND expires_at > ?",
+                (row_key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            with conn:
+                conn.execute("UPDATE tool_results SET accessed_at = ? WHERE key = ?", (now, row_key))
+            value = json.loads(zlib.decompress(row[0]).decode("utf-8"))
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            logger.error(f"Tool cache lookup failed, treating as a miss: {e}")
+            return None
+
+        self._remember(row_key, row[1], value)
+        return value
+
+    def set(self, key: str, tool_name: str, value: Any, ttl: int) -> None:
+        """
+        Store a result for `ttl` seconds.
+
+        :param key: The canonical call key (see `Tool.call_key`).
+        :param tool_name: The tool name, e.g. 'GOOGLE_SEARCH'.
+        :param value: The JSON-serializable tool result.
+        :param ttl: The time to live in seconds.
+        """
+        now = time.time()
+        row_key = self._hash(key)
+        try:
+            blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        except (TypeError, ValueError) as e:
+            logger.info(f"Not caching {tool_name} result that is not JSON-serializable: {e}")
+            return
+
+        self._remember(row_key, now + ttl, value)
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO tool_results (key, tool, value, size, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (row_key, tool_name, blob, len(blob), now + ttl, now)
+                )
+            self._evict(conn, now)
+        except sqlite3.Error as e:
+            logger.error(f"Tool cache write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """
+        Bring the stored size under `max_bytes`: expired entries first, then least recently used."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM tool_results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        with conn:
+            conn.execute("DELETE FROM tool_results WHERE expires_at <= ?", (now,))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM tool_results").fetchone()[0]
+            # Leave some headroom so eviction does not run again on the next write
+            target = int(self.max_bytes * 0.9)
+            evicted = 0
+            for row_key, size in conn.execute("SELECT key, size FROM tool_results ORDER BY accessed_at").fetchall():
+                if total <= target:
+                    break
+                conn.execute("DELETE FROM tool_results WHERE key = ?", (row_key,))
+                total -= size
+                evicted += 1
+        logger.info(f"Tool cache over {self.max_bytes} bytes; evicted {evicted} least recently used entries")
+
+
+_tool_cache: Optional[ToolResultCache] = None
+_tool_cache_lock = threading.Lock()
+
+
+def get_tool_cache() -> Optional[ToolResultCache]:
+    """
+    Return the process-wide tool result cache, opening it on first use.
+
+    :return: The shared cache, or None if caching is disabled, the database cannot be opened or a
+        cassette is recording or replaying.
+    """
+    global _tool_cache
+    # With a cassette active every request must be recorded or replayed
+    if not TOOL_CACHE_ENABLED or get_cassette() is not None:
+        return None
+    if _tool_cache is None:
+        with _tool_cache_lock:
+            if _tool_cache is None:
+                try:
+                    _tool_cache = ToolResultCache()
+                except (sqlite3.Error, OSError) as e:
+                    logger.error(f"Tool cache unavailable: {e}")
+                    return None
+    return _tool_cache
@@ -0,0 +1,294 @@
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from src.config.tracing import current_span
+from src.config.logging import logger
+from contextvars import copy_context
+from concurrent.futures import Future
+from concurrent.futures import wait
+from collections import deque
+from typing import Optional
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import Set
+import threading
+import requests
+import time
+import os
+
+HEDGING_ENABLED = True
+# Tools whose GET requests may be hedged: idempotent lookups with long-tailed latency
+HEDGE_TOOLS: Set[str] = {
+    "GOOGLE_SEARCH",
+    "GOOGLE_LOCATION_SPECIFIC_SEARCH",
+    "GOOGLE_IMAGE_SEARCH",
+    "GOOGLE_NEWS_SEARCH",
+    "GOOGLE_MAPS_SEARCH",
+    "GOOGLE_MAPS_PLACE",
+    "GOOGLE_LOCAL_SEARCH",
+    "GOOGLE_JOBS_SEARCH",
+    "GOOGLE_EVENTS_SEARCH",
+    "GOOGLE_VIDEOS_SEARCH",
+    "GOOGLE_PLAY_SEARCH",
+    "GOOGLE_SHOPPING_SEARCH",
+    "GOOGLE_FINANCE_SEARCH",
+    "GOOGLE_FINANCE_CURRENCY_EXCHANGE",
+    "YOUTUBE_SEARCH",
+    "WALMART_SEARCH",
+    "ZIP_INFO",
+    "EXCHANGE_RATES",
+    "ISS_LOCATION",
+    "LYRICS",
+}
+# A request is hedged once it has run longer than this percentile of the tool's recent latencies
+HEDGE_PERCENTILE = 95.0
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+MIN_HEDGE_DELAY_SECONDS = 0.05
+# Each request earns this fraction of a hedge, so hedges add at most ~5% upstream load
+HEDGE_BUDGET_RATIO = 0.05
+HEDGE_BUDGET_BURST = 10.0
+# Threads sending hedgeable requests; kept as large as the HTTP connection pool by `set_pool_size`
+HEDGE_WORKERS = int(os.environ.get("HTTP_POOL_SIZE", "32"))
+
+
+class LatencyTracker:
+    """
+    A sliding window of a tool's recent request latencies.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """
+        Add the latency of a completed request.
+
+        :param seconds: How long the request took.
+        """
+        with self._lock:
+            self._samples.append(seconds)
+
+    def threshold(self) -> Optional[float]:
+        """
+        Return how long a request may run before it is hedged.
+
+        :return: The HEDGE_PERCENTILE latency in seconds, or None until MIN_LATENCY_SAMPLES
+            requests have completed.
+        """
+        with self._lock:
+            if len(self._samples) < MIN_LATENCY_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * HEDGE_PERCENTILE / 100.0))
+        return max(ordered[index], MIN_HEDGE_DELAY_SECONDS)
+
+
+class HedgeBudget:
+    """
+    A token bucket that bounds the extra load hedging puts on upstream APIs.
+
+    Every request earns `ratio` tokens, up to `burst`; every hedge spends one.
+    """
+
+    def __init__(self, ratio: float = HEDGE_BUDGET_RATIO, burst: float = HEDGE_BUDGET_BURST) -> None:
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+        self._lock = threading.Lock()
+
+    def earn(self) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """
+        Take one hedge from the budget.
+
+        :return: True if a hedge may be sent.
+        """
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    def available(self) -> bool:
+        """
+        Whether a hedge could be sent now, without taking it from the budget.
+        """
+        with self._lock:
+            return self._tokens >= 1.0
+
+
+def _discard(future: Future) -> None:
+    """
+    Release the connection of a request whose response lost the race."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+class Hedger:
+    """
+    Sends a second, identical request when the first runs past the tool's latency threshold,
+    and returns whichever response arrives first.
+
+    A request that is already on the wire cannot be interrupted, so the losing request is
+    cancelled if it has not started and otherwise left to finish with its response closed.
+    """
+
+    def __init__(self, budget: Optional[HedgeBudget] = None, workers: int = HEDGE_WORKERS) -> None:
+        self.budget = budget or HedgeBudget()
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "hedged": 0, "hedge_wins": 0, "over_budget": 0, "rate_limited": 0}
+
+    def hedges(self, tool_name: str) -> bool:
+        """
+        Whether requests of a tool are hedged.
+
+        :param tool_name: The tool name, e.g. 'GOOGLE_SEARCH'.
+        """
+        return tool_name in HEDGE_TOOLS
+
+    def _tracker(self, tool_name: str) -> LatencyTracker:
+        with self._lock:
+            tracker = self._trackers.get(tool_name)
+            if tracker is None:
+                tracker = self._trackers[tool_name] = LatencyTracker()
+            return tracker
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return how many requests were sent, how many were hedged, how often the hedge won, how
+        many hedges the budget refused and how many found no rate-limit token.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def resize(self, workers: int) -> None:
+        """
+        Replace the worker pool with one of `workers` threads. Requests already submitted
+        finish on the old pool.
+
+        :param workers: The most hedgeable requests sent at once.
+        """
+        with self._lock:
+            previous = self._executor
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hedge")
+        previous.shutdown(wait=False)
+
+    def _submit(self, fetch: Callable[[], requests.Response]) -> Future:
+        # Run in a copy of the caller's context so spans and deadlines carry over
+        with self._lock:
+            executor = self._executor
+        return executor.submit(copy_context().run, fetch)
+
+    def send(self, tool_name: str, fetch: Callable[[], requests.Response],
+             try_acquire: Optional[Callable[[], bool]] = None) -> requests.Response:
+        """
+        Make a request, hedging it if it runs slow.
+
+        :param tool_name: The tool the request is made for.
+        :param fetch: Sends the request and returns its response.
+        :param try_acquire: Takes a rate-limit token for the hedge without waiting, returning
+            False if none is available; the hedge is then skipped. The caller has already
+            taken the primary request's token.
+        :return: The first successful response.
+        :raises requests.RequestException: If every request sent fails.
+        """
+        tracker = self._tracker(tool_name)
+        threshold = tracker.threshold()
+        self.budget.earn()
+        self._count("requests")
+
+        start = time.monotonic()
+        # Without a threshold or a hedge to spend there is nothing to race, so keep the
+        # request on the caller's thread instead of queueing it for a worker
+        if threshold is None or not self.budget.available():
+            response = fetch()
+            tracker.record(time.monotonic() - start)
+            return response
+
+        primary = self._submit(fetch)
+
+        def record(future: Future) -> None:
+            if not future.cancelled() and future.exception() is None:
+                tracker.record(time.monotonic() - start)
+
+        primary.add_done_callback(record)
+        done, _ = wait([primary], timeout=threshold)
+        if done:
+            return primary.result()
+        if not self.budget.try_spend():
+            self._count("over_budget")
+            return primary.result()
+        if try_acquire is not None and not try_acquire():
+            self._count("rate_limited")
+            return primary.result()
+
+        logger.info(f"Hedging {tool_name} request after {threshold:.3f}s")
+        self._count("hedged")
+        hedge = self._submit(fetch)
+        active = current_span()
+        if active is not None:
+            active.set_attribute("http.hedged", True)
+
+        done, pending = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        winner = next((future for future in (primary, hedge) if future in done and future.exception() is None), None)
+        if winner is None and pending:
+            # The first request back failed; the other may still succeed
+            done, _ = wait(pending)
+            winner = next((future for future in done if future.exception() is None), None)
+        if winner is None:
+            return primary.result()
+
+        loser = primary if winner is hedge else hedge
+        if not loser.cancel():
+            loser.add_done_callback(_discard)
+        if winner is hedge:
+            self._count("hedge_wins")
+            if active is not None:
+                active.set_attribute("http.hedge_won", True)
+        return winner.result()
+
+
+_hedger: Optional[Hedger] = None
+_hedger_lock = threading.Lock()
+
+
+def get_hedger() -> Optional[Hedger]:
+    """
+    Return the process-wide hedger, creating it on first use.
+
+    :return: The shared hedger, or None if hedging is disabled.
+    """
+    global _hedger
+    if not HEDGING_ENABLED:
+        return None
+    if _hedger is None:
+        with _hedger_lock:
+            if _hedger is None:
+                _hedger = Hedger(workers=HEDGE_WORKERS)
+    return _hedger
+
+
+def set_hedge_workers(workers: int) -> None:
+    """
+    Size the hedging pool, so hedgeable requests do not queue for a worker when a run's
+    concurrency exceeds `HEDGE_WORKERS`.
+
+    :param workers: The most hedgeable requests sent at once.
+    """
+    global HEDGE_WORKERS
+    HEDGE_WORKERS = workers
+    with _hedger_lock:
+        hedger = _hedger
+    if hedger is not None:
+        hedger.resize(workers)
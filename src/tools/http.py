@@ -0,0 +1,274 @@
+from src.config.deadline import current_deadline
+from src.config.ratelimit import get_rate_limiter
+from src.config.cassette import get_cassette
+from contextlib import contextmanager
+from contextvars import ContextVar
+from src.config.tracing import span
+from src.tools.breaker import get_circuit_breaker
+from src.tools.breaker import CircuitOpenError
+from src.tools.hedge import set_hedge_workers
+from src.tools.hedge import get_hedger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from functools import partial
+from urllib.parse import urlsplit
+from typing import Iterator
+from typing import Optional
+from typing import Callable
+from typing import Tuple
+from typing import Dict
+from typing import Any
+import threading
+import requests
+import os
+
+Transport = Callable[..., requests.Response]
+Timeout = Tuple[float, float]
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT: Timeout = (3.05, 10.0)
+TOOL_TIMEOUTS: Dict[str, Timeout] = {
+    "LYRICS": (3.05, 5.0),
+    "TRIVIA_QUESTIONS": (3.05, 5.0),
+    "CAT_FACT": (3.05, 5.0),
+    "MULTIPLE_CAT_FACTS": (3.05, 5.0),
+    "CAT_BREEDS": (3.05, 5.0),
+    "DOG_IMAGE": (3.05, 5.0),
+    "MULTIPLE_DOG_IMAGES": (3.05, 5.0),
+    "DOG_BREED_IMAGE": (3.05, 5.0),
+    "RANDOM_JOKE": (3.05, 5.0),
+    "TEN_RANDOM_JOKES": (3.05, 5.0),
+    "RANDOM_JOKE_BY_TYPE": (3.05, 5.0),
+    "RANDOM_FOX_IMAGE": (3.05, 5.0),
+    "PUBLIC_IP": (3.05, 5.0),
+    "CURRENT_LOCATION": (3.05, 5.0),
+    "ISS_LOCATION": (3.05, 5.0),
+    "ZIP_INFO": (3.05, 5.0),
+    "EXCHANGE_RATES": (3.05, 5.0),
+    "GOOGLE_SEARCH": (3.05, 20.0),
+    "GOOGLE_MAPS_SEARCH": (3.05, 20.0),
+    "GOOGLE_SHOPPING_SEARCH": (3.05, 20.0),
+    "WALMART_SEARCH": (3.05, 20.0),
+}
+
+# Hosts whose requests draw on a per-credential rate limit, and the query parameter carrying the key
+RATE_LIMITED_HOSTS: Dict[str, Tuple[str, str]] = {
+    "serpapi.com": ("SERP_API_KEY", "api_key"),
+}
+
+# Connections kept alive per host, and hosts with a pool; size the former to the concurrency
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "32"))
+HTTP_POOL_HOSTS = 16
+# Connection failures and gateway errors are retried before a GET is reported as failed. Read
+# timeouts are not: the request reached the API (and may be billed), and slow responses are the
+# hedger's job
+HTTP_RETRIES = Retry(total=2, connect=2, read=0, status=2, backoff_factor=0.1,
+                     status_forcelist=(502, 503, 504), allowed_methods=frozenset({"GET"}),
+                     raise_on_status=False, respect_retry_after_header=False)
+HTTP_HEADERS = {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+
+_transport: Optional[Transport] = None
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_current_tool: ContextVar[Optional[str]] = ContextVar("current_tool", default=None)
+
+
+def get_tool_timeout(tool_name: str) -> Timeout:
+    """
+    Return the HTTP timeouts for a tool.
+
+    :param tool_name: The tool name, e.g. 'GOOGLE_SEARCH'.
+    :return: The (connect, read) timeouts in seconds.
+    """
+    return TOOL_TIMEOUTS.get(tool_name, DEFAULT_TIMEOUT)
+
+
+def current_tool() -> Optional[str]:
+    """
+    Return the name of the tool whose requests are being made in the current context.
+
+    :return: The tool name, or None outside of `tool_scope`.
+    """
+    return _current_tool.get()
+
+
+@contextmanager
+def tool_scope(tool_name: str) -> Iterator[None]:
+    """
+    Attribute every request made within the block to a tool, so its timeouts and hedging
+    policy apply.
+
+    :param tool_name: The tool name, e.g. 'GOOGLE_SEARCH'.
+    """
+    token = _current_tool.set(tool_name)
+    try:
+        yield
+    finally:
+        _current_tool.reset(token)
+
+
+def request_timeout(timeout: Optional[Any] = None) -> Timeout:
+    """
+    Work out the (connect, read) timeouts of a request.
+
+    An explicit timeout wins over the current tool's; either is capped by what is left of
+    the current query's deadline.
+
+    :param timeout: An explicit timeout, as one number or a (connect, read) pair.
+    :return: The (connect, read) timeouts in seconds.
+    :raises requests.Timeout: If the query deadline has already passed.
+    """
+    if timeout is None:
+        tool_name = current_tool()
+        connect, read = get_tool_timeout(tool_name) if tool_name else DEFAULT_TIMEOUT
+    elif isinstance(timeout, (int, float)):
+        connect = read = float(timeout)
+    else:
+        connect, read = timeout
+    deadline = current_deadline()
+    if deadline is not None:
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            raise requests.Timeout("The query deadline passed before the request was sent")
+        connect, read = min(connect, remaining), min(read, remaining)
+    return connect, read
+
+
+def build_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """
+    Build a session that keeps connections alive in per-host pools and retries idempotent GETs.
+
+    :param pool_size: The most connections kept open to one host.
+    :return: The session.
+    """
+    session = requests.Session()
+    session.headers.update(HTTP_HEADERS)
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=pool_size, max_retries=HTTP_RETRIES)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide session shared by every registry tool, creating it on first use.
+
+    :return: The shared session.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def set_pool_size(pool_size: int) -> None:
+    """
+    Replace the shared session with one keeping up to `pool_size` connections per host,
+    and size the hedging pool to match.
+
+    Call this before a run whose concurrency exceeds `HTTP_POOL_SIZE`; otherwise
+    connections beyond the pool are opened and closed for every request, and hedgeable
+    requests queue for a worker.
+
+    :param pool_size: The most connections kept open to one host.
+    """
+    global _session
+    with _session_lock:
+        previous, _session = _session, build_session(pool_size)
+    if previous is not None:
+        previous.close()
+    set_hedge_workers(pool_size)
+
+
+def set_transport(transport: Optional[Transport]) -> None:
+    """
+    Send registry GET requests through `transport` instead of the shared session.
+
+    Used to point the tools at a local stand-in or at recorded traffic; pass None to go
+    back to the network.
+
+    :param transport: A callable with the signature of `requests.get`, or None.
+    """
+    global _transport
+    _transport = transport
+
+
+def http_get(url: str, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> requests.Response:
+    """
+    Issue a GET request for a registry tool over the shared session, recorded as a client span.
+
+    Query parameters are not recorded, since they carry API keys. Timeouts come from
+    `request_timeout`, so no request outlives its tool's limits or the query's deadline.
+    Requests of tools listed in `HEDGE_TOOLS` are hedged when they run slow, and requests
+    to a host whose circuit breaker is open fail at once without being sent. Requests to
+    `RATE_LIMITED_HOSTS` queue for a token of their credential's rate limit first, and are
+    only hedged if another token is available at once.
+
+    :param url: The request URL.
+    :param params: Query parameters.
+    :param kwargs: Further arguments for `requests.Session.get`.
+    :return: The response.
+    :raises requests.RequestException: If the request fails or times out.
+    :raises CircuitOpenError: If the host's breaker is open.
+    :raises RateLimitTimeout: If the request would queue too long for a rate-limit token.
+    """
+    kwargs["timeout"] = request_timeout(kwargs.get("timeout"))
+    parts = urlsplit(url)
+    cassette = get_cassette()
+    limited = RATE_LIMITED_HOSTS.get(parts.hostname or "")
+    limiter = None
+    # Queue before asking the breaker, so a half-open trial is never held up by the limiter.
+    # Replayed requests never reach the API, so they use none of its quota
+    if limited and params and params.get(limited[1]) and not (cassette is not None and cassette.mode == "replay"):
+        limiter = get_rate_limiter(limited[0], str(params[limited[1]]))
+        if limiter is not None:
+            limiter.acquire()
+    breaker = get_circuit_breaker(parts.hostname or "")
+    if breaker is not None:
+        breaker.before_request()
+    attributes = {"http.request.method": "GET", "server.address": parts.hostname or "", "url.path": parts.path}
+    if params and params.get("engine"):
+        attributes["serpapi.engine"] = params["engine"]
+    with span("http.get", kind="CLIENT", **attributes) as active:
+        send = _transport or get_session().get
+
+        def fetch() -> requests.Response:
+            return send(url, params=params, **kwargs)
+
+        tool_name = current_tool()
+        hedger = get_hedger()
+        if tool_name and hedger is not None and hedger.hedges(tool_name):
+            # A hedge is a second billed request, so it needs a token of its own
+            fetch = partial(hedger.send, tool_name, fetch, limiter.try_acquire if limiter is not None else None)
+        try:
+            if cassette is not None:
+                response = cassette.get(url, params, fetch)
+            else:
+                response = fetch()
+        except CircuitOpenError:
+            raise
+        except requests.RequestException:
+            # A timeout cut short by the query deadline says nothing about the host
+            deadline = current_deadline()
+            if breaker is not None:
+                if deadline is not None and deadline.expired:
+                    breaker.release()
+                else:
+                    breaker.record_failure()
+            raise
+        except BaseException:
+            # Anything else says nothing about the host, but must not leave a trial in flight
+            if breaker is not None:
+                breaker.release()
+            raise
+        if breaker is not None:
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            active.set_attribute("circuit.state", breaker.state)
+        active.set_attribute("http.response.status_code", response.status_code)
+        active.set_attribute("http.response.body.size", len(response.content))
+        return response
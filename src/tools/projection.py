@@ -0,0 +1,105 @@
+from src.tools.serpapi import SERPAPI_ENGINES
+from src.config.logging import logger
+from typing import Optional
+from typing import Dict
+from typing import List
+from typing import Any
+import json
+
+
+MAX_OBSERVATION_BYTES = 8000
+MAX_LIST_ITEMS = 10
+
+# Top-level keys that never help the model answer a query.
+NOISE_KEYS = {
+    "search_metadata",
+    "search_parameters",
+    "search_information",
+    "pagination",
+    "serpapi_pagination",
+    "related_searches",
+    "inline_images",
+    "filters",
+}
+
+# Per-tool projection rules, keyed by tool name. Each rule maps a top-level key of the
+# raw payload to the fields kept from it (for lists of dicts or dicts), or to None to
+# keep the value as-is. Keys not listed are dropped. SerpApi rules are declared with
+# their endpoints in `SERPAPI_ENGINES`.
+PROJECTIONS: Dict[str, Dict[str, Optional[List[str]]]] = {
+    tool_name: engine.projection for tool_name, engine in SERPAPI_ENGINES.items() if engine.projection
+}
+
+
+def _project_value(value: Any, fields: Optional[List[str]]) -> Any:
+    """
+    Keep only the given fields of a dict, or of each dict in a list, and cap list length.
+
+    :param value: The raw value from the payload.
+    :param fields: The fields to keep, or None to keep the value whole.
+    :return: The projected value.
+    """
+    if isinstance(value, list):
+        value = value[:MAX_LIST_ITEMS]
+        if fields is None:
+            return value
+        return [_project_value(item, fields) for item in value]
+    if isinstance(value, dict) and fields is not None:
+        return {field: value[field] for field in fields if field in value}
+    return value
+
+
+def project_observation(tool_name: str, result: Any) -> Any:
+    """
+    Reduce a raw tool result to the fields that are useful to the model.
+
+    Tools with a rule in `PROJECTIONS` keep only the listed keys and fields. Other
+    dict payloads (or payloads a rule does not match) only lose the `NOISE_KEYS`.
+
+    :param tool_name: The tool name, e.g. 'GOOGLE_SEARCH'.
+    :param result: The raw tool result.
+    :return: The projected result.
+    """
+    if not isinstance(result, dict):
+        return result
+
+    rule = PROJECTIONS.get(tool_name)
+    if rule:
+        projected = {key: _project_value(result[key], fields) for key, fields in rule.items() if key in result}
+        if projected:
+            return projected
+        logger.info(f"No projection keys matched for {tool_name}; falling back to noise filtering")
+
+    return {key: _project_value(value, None) for key, value in result.items() if key not in NOISE_KEYS}
+
+
+def truncate_observation(text: str, max_bytes: int = MAX_OBSERVATION_BYTES) -> str:
+    """
+    Cap an observation at `max_bytes` of UTF-8, marking how much was cut.
+
+    :param text: The serialized observation.
+    :param max_bytes: The maximum size in bytes.
+    :return: The (possibly truncated) observation.
+    """
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    kept = encoded[:max_bytes].decode("utf-8", errors="ignore")
+    return f"{kept}... [truncated {len(encoded) - max_bytes} bytes]"
+
+
+def render_observation(tool_name: str, result: Any, max_bytes: int = MAX_OBSERVATION_BYTES) -> str:
+    """
+    Project, serialize and size-cap a tool result for inclusion in the prompt.
+
+    :param tool_name: The tool name, e.g. 'GOOGLE_SEARCH'.
+    :param result: The raw tool result.
+    :param max_bytes: The maximum size in bytes of the rendered observation.
+    :return: The rendered observation.
+    """
+    projected = project_observation(tool_name, result)
+    if isinstance(projected, str):
+        text = projected
+    else:
+        text = json.dumps(projected, ensure_ascii=False, default=str)
+    return truncate_observation(text, max_bytes)
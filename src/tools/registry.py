@@ -1,20 +1,24 @@
 from src.llm.gemini_text_image import generate_multimodal_content
-from src.config.setup import get_serp_api_key
+from src.tools.serpapi import serpapi_tool
+from src.tools.http import http_get
 from src.config.logging import logger
 from typing import Optional
 from typing import Union
 from typing import Dict 
 from typing import List 
 from typing import Any 
-import wikipediaapi
 import requests
 import json
 import os 
 
+WIKI_API_URL = "https://en.wikipedia.org/w/api.php"
+# Wikipedia asks API clients to identify themselves
+WIKI_HEADERS = {"User-Agent": "ReAct Agents (shankar.arunp@gmail.com)"}
+
 
 def get_wiki_search_results(query: str) -> Optional[str]:
     """
-    Fetch Wikipedia information for a given search query using Wikipedia-API and return as JSON.
+    Fetch Wikipedia information for a given search query using the Wikipedia API and return as JSON.
 
     Args:
         query (str): The search query string.
@@ -22,20 +26,22 @@ def get_wiki_search_results(query: str) -> Optional[str]:
     Returns:
         Optional[str]: A JSON string containing the query, title, and summary, or None if no result is found.
     """
-    # Initialize Wikipedia API with a user agent
-    wiki = wikipediaapi.Wikipedia(user_agent='ReAct Agents (shankar.arunp@gmail.com)',
-                                  language='en')
-
     try:
         logger.info(f"Searching Wikipedia for: {query}")
-        page = wiki.page(query)
+        # The plain-text introduction of the page, following redirects
+        params = {"action": "query", "format": "json", "formatversion": 2, "prop": "extracts",
+                  "exintro": 1, "explaintext": 1, "redirects": 1, "titles": query}
+        response = http_get(WIKI_API_URL, params=params, headers=WIKI_HEADERS)
+        response.raise_for_status()
+        pages = response.json().get("query", {}).get("pages", [])
+        page = pages[0] if pages else {}
 
-        if page.exists():
+        if page and not page.get("missing") and not page.get("invalid"):
             # Create a dictionary with query, title, and summary
             result = {
                 "query": query,
-                "title": page.title,
-                "summary": page.summary
+                "title": page["title"],
+                "summary": page.get("extract", "").strip()
             }
             logger.info(f"Successfully retrieved summary for: {query}")
             return json.dumps(result, ensure_ascii=False, indent=2)
@@ -59,7 +65,7 @@ def get_cat_fact(max_length: Optional[int] = None) -> Dict[str, Any]:
     base_url = "https://catfact.ninja/fact"
     params = {"max_length": max_length} if max_length else {}
     try:
-        response = requests.get(base_url, params=params)
+        response = http_get(base_url, params=params)
         response.raise_for_status()
         fact = response.json()
         logger.info(f"Retrieved cat fact: {fact}")
@@ -80,7 +86,7 @@ def get_multiple_cat_facts(limit: int) -> Dict[str, Any]:
     base_url = "https://catfact.ninja/facts"
     params = {"limit": limit}
     try:
-        response = requests.get(base_url, params=params)
+        response = http_get(base_url, params=params)
         response.raise_for_status()
         facts = response.json()
         logger.info(f"Retrieved {limit} cat facts: {facts}")
@@ -101,7 +107,7 @@ def get_cat_breeds(limit: Optional[int] = None) -> Dict[str, Any]:
     base_url = "https://catfact.ninja/breeds"
     params = {"limit": limit} if limit else {}
     try:
-        response = requests.get(base_url, params=params)
+        response = http_get(base_url, params=params)
         response.raise_for_status()
         breeds = response.json()
         logger.info(f"Retrieved cat breeds: {breeds}")
@@ -120,7 +126,7 @@ def get_random_dog_image() -> Dict[str, Any]:
     """
     base_url = "https://dog.ceo/api/breeds/image/random"
     try:
-        response = requests.get(base_url)
+        response = http_get(base_url)
         response.raise_for_status()
         image = response.json()
         logger.info(f"Retrieved dog image: {image}")
@@ -140,7 +146,7 @@ def get_multiple_dog_images(number: int) -> Dict[str, Any]:
     """
     base_url = f"https://dog.ceo/api/breeds/image/random/{number}"
     try:
-        response = requests.get(base_url)
+        response = http_get(base_url)
         response.raise_for_status()
         images = response.json()
         logger.info(f"Retrieved {number} random dog images: {images}")
@@ -160,7 +166,7 @@ def get_random_dog_breed_image(breed: str) -> Dict[str, Any]:
     """
     base_url = f"https://dog.ceo/api/breed/{breed}/images/random"
     try:
-        response = requests.get(base_url)
+        response = http_get(base_url)
         response.raise_for_status()
         image = response.json()
         logger.info(f"Retrieved random dog image for breed '{breed}': {image}")
@@ -179,7 +185,7 @@ def get_random_joke() -> Dict[str, Any]:
     """
     base_url = "https://official-joke-api.appspot.com/random_joke"
     try:
-        response = requests.get(base_url)
+        response = http_get(base_url)
         response.raise_for_status()
         joke = response.json()
         logger.info(f"Retrieved random joke: {joke}")
@@ -198,7 +204,7 @@ def get_ten_random_jokes() -> List[Dict[str, Any]]:
     """
     base_url = "https://official-joke-api.appspot.com/random_ten"
     try:
-        response = requests.get(base_url)
+        response = http_get(base_url)
         response.raise_for_status()
         jokes = response.json()
         logger.info(f"Retrieved ten random jokes: {jokes}")
@@ -218,7 +224,7 @@ def get_random_joke_by_type(joke_type: str) -> Dict[str, Any]:
     """
     base_url = f"https://official-joke-api.appspot.com/jokes/{joke_type}/random"
     try:
-        response = requests.get(base_url)
+        response = http_get(base_url)
         response.raise_for_status()
         joke = response.json()
         logger.info(f"Retrieved random joke of type '{joke_type}': {joke}")
@@ -238,7 +244,7 @@ def get_zip_info(zip_code: str) -> Dict[str, Any]:
     """
     base_url = f"https://api.zippopotam.us/us/{zip_code}"
     try:
-        response = requests.get(base_url)
+        response = http_get(base_url)
         response.raise_for_status()
         zip_info = response.json()
         logger.info(f"Retrieved ZIP info for '{zip_code}': {zip_info}")
@@ -258,7 +264,7 @@ def get_public_ip() -> Dict[str, Any]:
     base_url = "https://api.ipify.org"
     params = {"format": "json"}
     try:
-        response = requests.get(base_url, params=params)
+        response = http_get(base_url, params=params)
         response.raise_for_status()
         ip_info = response.json()
         logger.info(f"Retrieved public IP: {ip_info}")
@@ -281,14 +287,14 @@ def get_public_ip_with_location() -> Dict[str, Any]:
 
     try:
         # Step 1: Get the public IP address
-        response = requests.get(ip_base_url, params=ip_params)
+        response = http_get(ip_base_url, params=ip_params)
         response.raise_for_status()
         ip_info = response.json()
         public_ip = ip_info.get("ip")
         logger.info(f"Retrieved public IP: {public_ip}")
 
         # Step 2: Get the location of the IP address
-        location_response = requests.get(f"{geo_base_url}/{public_ip}")
+        location_response = http_get(f"{geo_base_url}/{public_ip}")
         location_response.raise_for_status()
         location_info = location_response.json()
         logger.info(f"Retrieved geolocation info: {location_info}")
@@ -309,7 +315,7 @@ def get_iss_location() -> Dict[str, Any]:
     """
     base_url = "http://api.open-notify.org/iss-now.json"
     try:
-        response = requests.get(base_url)
+        response = http_get(base_url)
         response.raise_for_status()
         iss_location = response.json()
         logger.info(f"Retrieved ISS location: {iss_location}")
@@ -330,7 +336,7 @@ def get_lyrics(artist: str, title: str) -> Dict[str, Any]:
     """
     base_url = f"https://api.lyrics.ovh/v1/{artist}/{title}"
     try:
-        response = requests.get(base_url)
+        response = http_get(base_url)
         response.raise_for_status()
         lyrics = response.json()
         logger.info(f"Retrieved lyrics for '{artist} - {title}': {lyrics}")
@@ -349,7 +355,7 @@ def get_random_fox_image() -> Dict[str, Any]:
     """
     base_url = "https://randomfox.ca/floof/"
     try:
-        response = requests.get(base_url)
+        response = http_get(base_url)
         response.raise_for_status()
         fox_image = response.json()
         logger.info(f"Retrieved random fox image: {fox_image}")
@@ -379,7 +385,7 @@ def get_trivia_questions(amount: Optional[int] = 1, category: Optional[int] = No
     if question_type:
         params["type"] = question_type
     try:
-        response = requests.get(base_url, params=params)
+        response = http_get(base_url, params=params)
         response.raise_for_status()
         trivia_data = response.json()
         logger.info(f"Retrieved trivia questions: {trivia_data}")
@@ -399,7 +405,7 @@ def get_exchange_rates(base: Optional[str] = "USD") -> Dict[str, Any]:
     """
     base_url = f"https://open.er-api.com/v6/latest/{base}"
     try:
-        response = requests.get(base_url)
+        response = http_get(base_url)
         response.raise_for_status()
         exchange_data = response.json()
         logger.info(f"Retrieved exchange rates for base '{base}': {exchange_data}")
@@ -409,491 +415,23 @@ def get_exchange_rates(base: Optional[str] = "USD") -> Dict[str, Any]:
         raise
 
 
-def get_google_search_results(q: str, location: Optional[str] = None, google_domain: Optional[str] = None, gl: Optional[str] = None, hl: Optional[str] = None, safe: Optional[str] = None, num: Optional[int] = None, start: Optional[int] = None) -> Dict[str, Any]:
-    """
-    Retrieve Google search results using SerpApi.
-
-    :param q: Search query (required).
-    :param location: Location for the search (optional).
-    :param google_domain: Google domain to use (optional).
-    :param gl: Country code for the search (optional).
-    :param hl: Language for the search (optional).
-    :param safe: Safe search setting (optional).
-    :param num: Number of results to return (optional).
-    :param start: Starting index for results (optional).
-    :return: A dictionary containing the search results.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"q": q, "api_key": get_serp_api_key()}
-    if location:
-        params["location"] = location
-    if google_domain:
-        params["google_domain"] = google_domain
-    if gl:
-        params["gl"] = gl
-    if hl:
-        params["hl"] = hl
-    if safe:
-        params["safe"] = safe
-    if num:
-        params["num"] = num
-    if start:
-        params["start"] = start
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        search_results = response.json()
-        logger.info(f"Retrieved Google search results for query '{q}': {search_results}")
-        return search_results
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve Google search results for query '{q}': {e}")
-        raise
-
-
-def get_google_image_search_results(q: str, tbm: str = "isch", gl: Optional[str] = None, hl: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Retrieve Google Images search results using SerpApi.
-
-    :param q: Search query (required).
-    :param tbm: Specifies image search (required, default is 'isch').
-    :param gl: Country code for the search (optional).
-    :param hl: Language for the search (optional).
-    :return: A dictionary containing the image search results.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"q": q, "tbm": tbm, "api_key": get_serp_api_key()}
-    if gl:
-        params["gl"] = gl
-    if hl:
-        params["hl"] = hl
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        image_results = response.json()
-        logger.info(f"Retrieved Google Images search results for query '{q}': {image_results}")
-        return image_results
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve Google Images search results for query '{q}': {e}")
-        raise
-
-
-def get_google_location_specific_search(q: str, location: Optional[str] = None, hl: Optional[str] = None, gl: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Retrieve Google search results simulating queries from a given geographic location.
-
-    :param q: Search query (required).
-    :param location: Geographic location (optional).
-    :param hl: Language for the search (optional).
-    :param gl: Country code for the search (optional).
-    :return: A dictionary containing location-specific search results.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"q": q, "api_key": get_serp_api_key()}
-    if location:
-        params["location"] = location
-    if hl:
-        params["hl"] = hl
-    if gl:
-        params["gl"] = gl
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        location_results = response.json()
-        logger.info(f"Retrieved location-specific search results for query '{q}': {location_results}")
-        return location_results
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve location-specific search results for query '{q}': {e}")
-        raise
-
-
-def get_google_news_search(q: str, tbm: str = "nws", hl: Optional[str] = None, gl: Optional[str] = None, num: Optional[int] = None, start: Optional[int] = None) -> Dict[str, Any]:
-    """
-    Retrieve Google News search results using SerpApi.
-
-    :param q: Search query (required).
-    :param tbm: Specifies news search (required, default is 'nws').
-    :param hl: Language for the search (optional).
-    :param gl: Country code for the search (optional).
-    :param num: Number of results to return (optional).
-    :param start: Starting index for results (optional).
-    :param api_key: SerpApi API key (required).
-    :return: A dictionary containing the news search results.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"q": q, "tbm": tbm, "api_key": get_serp_api_key()}
-    if hl:
-        params["hl"] = hl
-    if gl:
-        params["gl"] = gl
-    if num:
-        params["num"] = num
-    if start:
-        params["start"] = start
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        news_results = response.json()
-        logger.info(f"Retrieved Google News search results for query '{q}': {news_results}")
-        return news_results
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve Google News search results for query '{q}': {e}")
-        raise
-
-
-def get_google_maps_search(q: Optional[str] = None, ll: Optional[str] = None, hl: Optional[str] = None, gl: Optional[str] = None, start: Optional[int] = None) -> Dict[str, Any]:
-    """
-    Retrieve Google Maps search results from SerpApi.
-
-    :param q: Search query (optional).
-    :param ll: Latitude and longitude coordinates (optional).
-    :param hl: Language for the search (optional).
-    :param gl: Country code for the search (optional).
-    :param start: Starting index for results (optional).
-    :param api_key: SerpApi API key (required).
-    :return: A dictionary containing Google Maps search results.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"engine": "google_maps", "api_key": get_serp_api_key()}
-    if q:
-        params["q"] = q
-    if ll:
-        params["ll"] = ll
-    if hl:
-        params["hl"] = hl
-    if gl:
-        params["gl"] = gl
-    if start:
-        params["start"] = start
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        maps_results = response.json()
-        logger.info(f"Retrieved Google Maps search results for query '{q}': {maps_results}")
-        return maps_results
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve Google Maps search results for query '{q}': {e}")
-        raise
-
-
-def get_google_maps_place(place_id: str, hl: Optional[str] = None, gl: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Retrieve details of a specific place on Google Maps using place_id.
-
-    :param place_id: The place ID (required).
-    :param hl: Language for the search (optional).
-    :param gl: Country code for the search (optional).
-    :param api_key: SerpApi API key (required).
-    :return: A dictionary containing place details.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"engine": "google_maps", "place_id": place_id, "api_key": get_serp_api_key()}
-    if hl:
-        params["hl"] = hl
-    if gl:
-        params["gl"] = gl
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        place_details = response.json()
-        logger.info(f"Retrieved place details for place ID '{place_id}': {place_details}")
-        return place_details
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve place details for place ID '{place_id}': {e}")
-        raise
-
-
-def get_google_jobs_search(q: str, location: Optional[str] = None, hl: Optional[str] = None, gl: Optional[str] = None, lrad: Optional[int] = None, ltype: Optional[str] = None, next_page_token: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Retrieve Google Jobs search results from SerpApi.
-
-    :param q: Search query (required).
-    :param location: Location for the job search (optional).
-    :param hl: Language for the search (optional).
-    :param gl: Country code for the search (optional).
-    :param lrad: Search radius in miles (optional).
-    :param ltype: Location type (e.g., 'city') (optional).
-    :param next_page_token: Token for the next page of results (optional).
-    :param api_key: SerpApi API key (required).
-    :return: A dictionary containing job search results.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"engine": "google_jobs", "q": q, "api_key": get_serp_api_key()}
-    if location:
-        params["location"] = location
-    if hl:
-        params["hl"] = hl
-    if gl:
-        params["gl"] = gl
-    if lrad:
-        params["lrad"] = lrad
-    if ltype:
-        params["ltype"] = ltype
-    if next_page_token:
-        params["next_page_token"] = next_page_token
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        jobs_results = response.json()
-        logger.info(f"Retrieved Google Jobs search results for query '{q}': {jobs_results}")
-        return jobs_results
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve Google Jobs search results for query '{q}': {e}")
-        raise
-
-
-def get_google_shopping_search(q: str, location: Optional[str] = None, google_domain: Optional[str] = None, gl: Optional[str] = None, hl: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Retrieve Google Shopping search results from SerpApi.
-
-    :param q: Search query (required).
-    :param location: Location for the search (optional).
-    :param google_domain: Google domain to use (optional).
-    :param gl: Country code for the search (optional).
-    :param hl: Language for the search (optional).
-    :return: A dictionary containing shopping search results.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"engine": "google_shopping", "q": q, "api_key": get_serp_api_key()}
-    if location:
-        params["location"] = location
-    if google_domain:
-        params["google_domain"] = google_domain
-    if gl:
-        params["gl"] = gl
-    if hl:
-        params["hl"] = hl
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        shopping_results = response.json()
-        logger.info(f"Retrieved Google Shopping search results for query '{q}': {shopping_results}")
-        return shopping_results
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve Google Shopping search results for query '{q}': {e}")
-        raise
-
-
-def get_walmart_basic_search(query: str, page: Optional[int] = None) -> Dict[str, Any]:
-    """
-    Retrieve Walmart search results using a query from SerpApi.
-
-    :param query: Search query (required).
-    :param page: Page number for results (optional).
-    :return: A dictionary containing Walmart search results.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"engine": "walmart", "query": query, "api_key": get_serp_api_key()}
-    if page:
-        params["page"] = page
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        search_results = response.json()
-        logger.info(f"Retrieved Walmart search results for query '{query}': {search_results}")
-        return search_results
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve Walmart search results for query '{query}': {e}")
-        raise
-
-
-def get_google_local_basic_search(q: str, location: Optional[str] = None, hl: Optional[str] = None, gl: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Retrieve local business results by query using SerpApi's Google Local API.
-
-    :param q: Search query (required).
-    :param location: Location for the search (optional).
-    :param hl: Language for the search (optional).
-    :param gl: Geographic region for the search (optional).
-    :return: A dictionary containing local business results.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"engine": "google_local", "q": q, "api_key": get_serp_api_key()}
-    if location:
-        params["location"] = location
-    if hl:
-        params["hl"] = hl
-    if gl:
-        params["gl"] = gl
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        local_results = response.json()
-        logger.info(f"Retrieved Google Local search results for query '{q}': {local_results}")
-        return local_results
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve Google Local search results for query '{q}': {e}")
-        raise
-
-
-def get_google_finance_basic_search(q: str, hl: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Retrieve Google Finance data for a given ticker or search query from SerpApi.
-
-    :param q: Search query or ticker (required).
-    :param hl: Language for the search (optional).
-    :return: A dictionary containing Google Finance data.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"engine": "google_finance", "q": q, "api_key": get_serp_api_key()}
-    if hl:
-        params["hl"] = hl
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        finance_data = response.json()
-        logger.info(f"Retrieved Google Finance data for query '{q}': {finance_data}")
-        return finance_data
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve Google Finance data for query '{q}': {e}")
-        raise
-
-
-def get_google_finance_currency_exchange(q: str, hl: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Retrieve exchange rate data for a currency pair using SerpApi.
-
-    :param q: Currency pair (e.g., 'USD/EUR') (required).
-    :param hl: Language for the search (optional).
-    :return: A dictionary containing currency exchange rate data.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"engine": "google_finance", "q": q, "api_key": get_serp_api_key()}
-    if hl:
-        params["hl"] = hl
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        exchange_data = response.json()
-        logger.info(f"Retrieved currency exchange data for query '{q}': {exchange_data}")
-        return exchange_data
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve currency exchange data for query '{q}': {e}")
-        raise
-
-
-def get_google_events_basic_search(q: str, hl: Optional[str] = None, gl: Optional[str] = None, location: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Retrieve events based on a query using SerpApi's Google Events API.
-
-    :param q: Search query (e.g., 'Events in Austin, TX') (required).
-    :param hl: Language for the search (optional).
-    :param gl: Geographic region for the search (optional).
-    :param location: Location for the events (optional).
-    :return: A dictionary containing events data.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"engine": "google_events", "q": q, "api_key": get_serp_api_key()}
-    if hl:
-        params["hl"] = hl
-    if gl:
-        params["gl"] = gl
-    if location:
-        params["location"] = location
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        events_data = response.json()
-        logger.info(f"Retrieved events for query '{q}': {events_data}")
-        return events_data
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve events for query '{q}': {e}")
-        raise
-
-
-def get_google_play_query_search(q: Optional[str] = None, hl: Optional[str] = None, gl: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Retrieve app listings from the Google Play Store by search query using SerpApi.
-
-    :param q: Search query (optional).
-    :param hl: Language for the search (optional).
-    :param gl: Geographic region for the search (optional).
-    :return: A dictionary containing app listings.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"engine": "google_play", "api_key": get_serp_api_key()}
-    if q:
-        params["q"] = q
-    if hl:
-        params["hl"] = hl
-    if gl:
-        params["gl"] = gl
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        play_data = response.json()
-        logger.info(f"Retrieved Google Play app listings for query '{q}': {play_data}")
-        return play_data
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve Google Play app listings for query '{q}': {e}")
-        raise
-
-
-def get_google_videos_basic_search(q: str, hl: Optional[str] = None, gl: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Retrieve video search results from Google Videos by query using SerpApi.
-
-    :param q: Search query (required).
-    :param hl: Language for the search (optional).
-    :param gl: Geographic region for the search (optional).
-    :return: A dictionary containing video search results.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"engine": "google_videos", "q": q, "api_key": get_serp_api_key()}
-    if hl:
-        params["hl"] = hl
-    if gl:
-        params["gl"] = gl
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        video_data = response.json()
-        logger.info(f"Retrieved Google Videos results for query '{q}': {video_data}")
-        return video_data
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve Google Videos results for query '{q}': {e}")
-        raise
-
-
-def get_youtube_basic_search(q: str, hl: Optional[str] = None, gl: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Retrieve YouTube search results by providing a search query using SerpApi.
-
-    :param q: Search query (required).
-    :param hl: Language for the search (optional).
-    :param gl: Geographic region for the search (optional).
-    :return: A dictionary containing YouTube search results.
-    :raises requests.HTTPError: If the request fails.
-    """
-    base_url = "https://serpapi.com/search"
-    params = {"engine": "youtube", "search_query": q, "api_key": get_serp_api_key()}
-    if hl:
-        params["hl"] = hl
-    if gl:
-        params["gl"] = gl
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        youtube_data = response.json()
-        logger.info(f"Retrieved YouTube results for query '{q}': {youtube_data}")
-        return youtube_data
-    except requests.RequestException as e:
-        logger.error(f"Failed to retrieve YouTube results for query '{q}': {e}")
-        raise
+# SerpApi endpoints are declared in `SERPAPI_ENGINES` and share one request pipeline
+get_google_search_results = serpapi_tool("GOOGLE_SEARCH", "get_google_search_results")
+get_google_image_search_results = serpapi_tool("GOOGLE_IMAGE_SEARCH", "get_google_image_search_results")
+get_google_location_specific_search = serpapi_tool("GOOGLE_LOCATION_SPECIFIC_SEARCH", "get_google_location_specific_search")
+get_google_news_search = serpapi_tool("GOOGLE_NEWS_SEARCH", "get_google_news_search")
+get_google_maps_search = serpapi_tool("GOOGLE_MAPS_SEARCH", "get_google_maps_search")
+get_google_maps_place = serpapi_tool("GOOGLE_MAPS_PLACE", "get_google_maps_place")
+get_google_jobs_search = serpapi_tool("GOOGLE_JOBS_SEARCH", "get_google_jobs_search")
+get_google_shopping_search = serpapi_tool("GOOGLE_SHOPPING_SEARCH", "get_google_shopping_search")
+get_walmart_basic_search = serpapi_tool("WALMART_SEARCH", "get_walmart_basic_search")
+get_google_local_basic_search = serpapi_tool("GOOGLE_LOCAL_SEARCH", "get_google_local_basic_search")
+get_google_finance_basic_search = serpapi_tool("GOOGLE_FINANCE_SEARCH", "get_google_finance_basic_search")
+get_google_finance_currency_exchange = serpapi_tool("GOOGLE_FINANCE_CURRENCY_EXCHANGE", "get_google_finance_currency_exchange")
+get_google_events_basic_search = serpapi_tool("GOOGLE_EVENTS_SEARCH", "get_google_events_basic_search")
+get_google_play_query_search = serpapi_tool("GOOGLE_PLAY_SEARCH", "get_google_play_query_search")
+get_google_videos_basic_search = serpapi_tool("GOOGLE_VIDEOS_SEARCH", "get_google_videos_basic_search")
+get_youtube_basic_search = serpapi_tool("YOUTUBE_SEARCH", "get_youtube_basic_search")
 
 
 def get_multimodal_reasoning(q: Union[str, Dict[str, str]]) -> str:
@@ -0,0 +1,259 @@
+from src.config.setup import get_serp_api_key
+from src.config.logging import logger
+from src.tools.http import http_get
+from inspect import Parameter
+from inspect import Signature
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+from typing import List
+from typing import Any
+import requests
+
+SERPAPI_URL = "https://serpapi.com/search"
+
+# Descriptions of the parameters the engines accept, used for the tools' docstrings
+PARAM_DOCS: Dict[str, str] = {
+    "q": "Search query",
+    "place_id": "The place ID",
+    "query": "Search query",
+    "location": "Location for the search, e.g. 'Austin,Texas,United States'",
+    "google_domain": "Google domain to use",
+    "gl": "Country code for the search",
+    "hl": "Language for the search",
+    "safe": "Safe search setting",
+    "num": "Number of results to return",
+    "start": "Starting index for results",
+    "tbm": "Search type, e.g. 'isch' for images or 'nws' for news",
+    "ll": "Latitude, longitude and zoom, e.g. '@40.7455096,-74.0083012,14z'",
+    "lrad": "Search radius in miles",
+    "ltype": "Location type, e.g. 'city'",
+    "next_page_token": "Token for the next page of results",
+    "page": "Page number for results",
+}
+
+
+class SerpApiEngine:
+    """
+    A SerpApi endpoint described as data: what it is called, which parameters it takes and
+    which parts of its response reach the model.
+
+    Attributes:
+        description (str): What the endpoint returns, for docstrings and logs.
+        engine (Optional[str]): The SerpApi `engine` parameter; None for plain Google search.
+        params (Tuple[str, ...]): The accepted parameters in call order; the first one is
+            what a string input is passed as.
+        required (Tuple[str, ...]): The parameters that must be given; they lead `params`.
+        defaults (Dict[str, Any]): Defaults of optional parameters, sent unless overridden.
+        aliases (Dict[str, str]): Parameters sent to SerpApi under another name.
+        projection (Optional[Dict[str, Optional[List[str]]]]): The response keys, and the
+            fields of each, that are shown to the model (see `src.tools.projection`).
+    """
+    __slots__ = ("description", "engine", "params", "required", "defaults", "aliases", "projection")
+
+    def __init__(self, description: str, engine: Optional[str] = None,
+                 params: Tuple[str, ...] = ("q", "hl", "gl"), required: Tuple[str, ...] = ("q",),
+                 defaults: Optional[Dict[str, Any]] = None, aliases: Optional[Dict[str, str]] = None,
+                 projection: Optional[Dict[str, Optional[List[str]]]] = None) -> None:
+        self.description = description
+        self.engine = engine
+        self.params = params
+        self.required = required
+        self.defaults = defaults or {}
+        self.aliases = aliases or {}
+        self.projection = projection
+
+
+# Every SerpApi-backed tool, keyed by tool name
+SERPAPI_ENGINES: Dict[str, SerpApiEngine] = {
+    "GOOGLE_SEARCH": SerpApiEngine(
+        "Google search results",
+        params=("q", "location", "google_domain", "gl", "hl", "safe", "num", "start"),
+        projection={
+            "answer_box": None,
+            "knowledge_graph": ["title", "type", "description", "website"],
+            "organic_results": ["title", "snippet", "link", "date"],
+            "top_stories": ["title", "source", "date", "link"],
+            "related_questions": ["question", "snippet"],
+        }),
+    "GOOGLE_IMAGE_SEARCH": SerpApiEngine(
+        "Google Images search results",
+        params=("q", "tbm", "gl", "hl"), defaults={"tbm": "isch"},
+        projection={
+            "images_results": ["title", "original", "source", "link"],
+        }),
+    "GOOGLE_LOCATION_SPECIFIC_SEARCH": SerpApiEngine(
+        "location-specific search results",
+        params=("q", "location", "hl", "gl"),
+        projection={
+            "answer_box": None,
+            "local_results": None,
+            "organic_results": ["title", "snippet", "link"],
+        }),
+    "GOOGLE_NEWS_SEARCH": SerpApiEngine(
+        "Google News search results",
+        params=("q", "tbm", "hl", "gl", "num", "start"), defaults={"tbm": "nws"},
+        projection={
+            "news_results": ["title", "snippet", "date", "source", "link"],
+        }),
+    "GOOGLE_MAPS_SEARCH": SerpApiEngine(
+        "Google Maps search results", engine="google_maps",
+        params=("q", "ll", "hl", "gl", "start"), required=(),
+        projection={
+            "local_results": ["title", "place_id", "address", "rating", "reviews", "type", "gps_coordinates"],
+            "place_results": ["title", "place_id", "address", "rating", "reviews", "type", "gps_coordinates"],
+        }),
+    "GOOGLE_MAPS_PLACE": SerpApiEngine(
+        "Google Maps place details", engine="google_maps",
+        params=("place_id", "hl", "gl"), required=("place_id",),
+        projection={
+            "place_results": ["title", "place_id", "address", "phone", "website", "rating", "reviews",
+                              "type", "hours", "description", "gps_coordinates"],
+        }),
+    "GOOGLE_JOBS_SEARCH": SerpApiEngine(
+        "Google Jobs search results", engine="google_jobs",
+        params=("q", "location", "hl", "gl", "lrad", "ltype", "next_page_token"),
+        projection={
+            "jobs_results": ["title", "company_name", "location", "via", "detected_extensions"],
+        }),
+    "GOOGLE_SHOPPING_SEARCH": SerpApiEngine(
+        "Google Shopping search results", engine="google_shopping",
+        params=("q", "location", "google_domain", "gl", "hl"),
+        projection={
+            "shopping_results": ["title", "price", "source", "rating", "reviews", "link"],
+        }),
+    "WALMART_SEARCH": SerpApiEngine(
+        "Walmart search results", engine="walmart",
+        params=("query", "page"), required=("query",),
+        projection={
+            "organic_results": ["title", "primary_offer", "rating", "reviews", "product_page_url"],
+        }),
+    "GOOGLE_LOCAL_SEARCH": SerpApiEngine(
+        "Google Local business results", engine="google_local",
+        params=("q", "location", "hl", "gl"),
+        projection={
+            "local_results": ["title", "address", "rating", "reviews", "type", "place_id"],
+        }),
+    "GOOGLE_FINANCE_SEARCH": SerpApiEngine(
+        "Google Finance data", engine="google_finance",
+        params=("q", "hl"),
+        projection={
+            "summary": None,
+            "knowledge_graph": None,
+            "news_results": ["title", "snippet", "source", "date", "link"],
+        }),
+    "GOOGLE_FINANCE_CURRENCY_EXCHANGE": SerpApiEngine(
+        "currency exchange data", engine="google_finance",
+        params=("q", "hl"),
+        projection={
+            "summary": None,
+        }),
+    "GOOGLE_EVENTS_SEARCH": SerpApiEngine(
+        "Google Events results", engine="google_events",
+        params=("q", "hl", "gl", "location"),
+        projection={
+            "events_results": ["title", "date", "address", "venue", "link"],
+        }),
+    "GOOGLE_PLAY_SEARCH": SerpApiEngine(
+        "Google Play app listings", engine="google_play",
+        required=(),
+        projection={
+            "organic_results": None,
+        }),
+    "GOOGLE_VIDEOS_SEARCH": SerpApiEngine(
+        "Google Videos results", engine="google_videos",
+        projection={
+            "video_results": ["title", "snippet", "date", "duration", "link"],
+        }),
+    "YOUTUBE_SEARCH": SerpApiEngine(
+        "YouTube search results", engine="youtube",
+        aliases={"q": "search_query"},
+        projection={
+            "video_results": ["title", "channel", "published_date", "views", "length", "link"],
+        }),
+}
+
+
+def build_params(engine: SerpApiEngine, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turn a tool call's arguments into SerpApi query parameters.
+
+    :param engine: The endpoint called.
+    :param arguments: The arguments given, by parameter name.
+    :return: The query parameters, without empty values and with the API key.
+    :raises ValueError: If an argument is not accepted by the endpoint or a required one is missing.
+    """
+    unknown = [name for name in arguments if name not in engine.params]
+    if unknown:
+        raise ValueError(f"Unsupported parameters for {engine.description}: {unknown}; "
+                         f"accepted are {list(engine.params)}")
+    missing = [name for name in engine.required if arguments.get(name) in (None, "")]
+    if missing:
+        raise ValueError(f"Missing required parameters for {engine.description}: {missing}")
+
+    params: Dict[str, Any] = {"engine": engine.engine} if engine.engine else {}
+    for name, value in {**engine.defaults, **arguments}.items():
+        if value is not None and value != "":
+            params[engine.aliases.get(name, name)] = value
+    params["api_key"] = get_serp_api_key()
+    return params
+
+
+def serpapi_search(tool_name: str, **arguments: Any) -> Dict[str, Any]:
+    """
+    Call a SerpApi endpoint from `SERPAPI_ENGINES`.
+
+    Every endpoint goes through this one pipeline: `http_get` adds pooling, rate limiting,
+    hedging, circuit breaking and tracing, and the agent caches and projects the result
+    by tool name.
+
+    :param tool_name: The tool name, e.g. 'GOOGLE_NEWS_SEARCH'.
+    :param arguments: The call's arguments, by parameter name.
+    :return: The SerpApi response payload.
+    :raises ValueError: If the arguments do not fit the endpoint.
+    :raises requests.HTTPError: If the request fails.
+    """
+    engine = SERPAPI_ENGINES[tool_name]
+    params = build_params(engine, arguments)
+    subject = arguments.get(engine.params[0])
+    try:
+        response = http_get(SERPAPI_URL, params=params)
+        response.raise_for_status()
+        results = response.json()
+        logger.info(f"Retrieved {engine.description} for '{subject}' ({len(response.content)} bytes)")
+        return results
+    except requests.RequestException as e:
+        logger.error(f"Failed to retrieve {engine.description} for '{subject}': {e}")
+        raise
+
+
+def serpapi_tool(tool_name: str, function_name: str) -> Callable[..., Dict[str, Any]]:
+    """
+    Build the registry function of a SerpApi endpoint.
+
+    The function's signature lists the endpoint's parameters, so the agent can map string
+    and dict inputs onto it like any hand-written tool.
+
+    :param tool_name: The tool name, e.g. 'GOOGLE_NEWS_SEARCH'.
+    :param function_name: The name the function is exported under.
+    :return: The tool function.
+    """
+    engine = SERPAPI_ENGINES[tool_name]
+    signature = Signature(
+        [Parameter(name, Parameter.POSITIONAL_OR_KEYWORD,
+                   default=Parameter.empty if name in engine.required else engine.defaults.get(name))
+         for name in engine.params],
+        return_annotation=Dict[str, Any])
+
+    def search(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+        return serpapi_search(tool_name, **signature.bind(*args, **kwargs).arguments)
+
+    param_docs = "\n".join(f":param {name}: {PARAM_DOCS.get(name, name)}"
+                           f"{' (required)' if name in engine.required else ' (optional)'}." for name in engine.params)
+    search.__name__ = search.__qualname__ = function_name
+    search.__signature__ = signature
+    search.__doc__ = (f"Retrieve {engine.description} using SerpApi.\n\n{param_docs}\n"
+                      f":return: A dictionary containing the {engine.description}.\n"
+                      f":raises requests.HTTPError: If the request fails.")
+    return search
@@ -0,0 +1,178 @@
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+from typing import List
+from typing import Any
+import json
+
+Event = Tuple[str, str, Any]
+
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class StreamingJSONParser:
+    """
+    Incrementally scans a JSON object arriving in chunks and reports its top-level fields.
+
+    Text before the first `{` (such as a ```json fence) is ignored. Each call to `feed`
+    returns the events completed by that chunk:
+
+    - ("field", key, value): a top-level field has been fully received and decoded.
+    - ("delta", key, text): more characters of a top-level string field listed in
+      `stream_keys`, decoded, before the string itself is complete.
+
+    Attributes:
+        stream_keys (Iterable[str]): Top-level string fields whose content is streamed as deltas.
+        done (bool): Whether the top-level object has been closed.
+    """
+
+    def __init__(self, stream_keys: Iterable[str] = ()) -> None:
+        self.stream_keys = set(stream_keys)
+        self.done = False
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._unicode: Optional[str] = None
+        self._high_surrogate: Optional[int] = None
+        self._key_buffer: List[str] = []
+        self._reading_key = False
+        self._current_key: Optional[str] = None
+        self._expect_key = True
+        self._value_chars: List[str] = []
+        self._in_value = False
+        self._streaming = False
+
+    def feed(self, chunk: str) -> List[Event]:
+        """
+        Consume the next chunk of text.
+
+        Args:
+            chunk (str): The next piece of the model output.
+
+        Returns:
+            List[Event]: Events completed by this chunk, in order.
+        """
+        events: List[Event] = []
+        delta: List[str] = []
+
+        for char in chunk:
+            if self.done:
+                break
+
+            if not self._started:
+                if char == '{':
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_value:
+                self._value_chars.append(char)
+
+            if self._in_string:
+                if self._streaming:
+                    self._stream_char(char, delta)
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._reading_key:
+                        self._reading_key = False
+                        self._current_key = json.loads('"' + ''.join(self._key_buffer) + '"')
+                        self._key_buffer = []
+                    elif self._depth == 1:
+                        self._flush_delta(delta, events)
+                        self._streaming = False
+                        self._complete_value(events)
+                if self._reading_key and self._in_string:
+                    self._key_buffer.append(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._reading_key = True
+                elif self._depth == 1 and not self._in_value:
+                    self._start_value(char)
+                    self._streaming = self._current_key in self.stream_keys
+            elif char in '{[':
+                if self._depth == 1 and not self._in_value:
+                    self._start_value(char)
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 1 and self._in_value:
+                    self._complete_value(events)
+                elif self._depth == 0:
+                    if self._in_value:
+                        self._value_chars.pop()
+                        self._complete_value(events)
+                    self.done = True
+            elif self._depth == 1:
+                if char == ':':
+                    self._expect_key = False
+                elif char == ',':
+                    if self._in_value:
+                        self._value_chars.pop()
+                        self._complete_value(events)
+                    self._expect_key = True
+                elif not char.isspace() and not self._in_value:
+                    self._start_value(char)
+
+        self._flush_delta(delta, events)
+        return events
+
+    def _start_value(self, char: str) -> None:
+        """
+        Begin capturing a top-level value starting with `char`."""
+        self._in_value = True
+        self._value_chars = [char]
+
+    def _complete_value(self, events: List[Event]) -> None:
+        """
+        Decode the captured top-level value and emit it as a field event."""
+        raw = ''.join(self._value_chars).strip()
+        self._in_value = False
+        self._value_chars = []
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+        events.append(("field", self._current_key, value))
+
+    def _stream_char(self, char: str, delta: List[str]) -> None:
+        """
+        Decode one character of a streamed string value into `delta`."""
+        if self._unicode is not None:
+            self._unicode += char
+            if len(self._unicode) == 4:
+                try:
+                    code_point = int(self._unicode, 16)
+                except ValueError:
+                    code_point = None
+                self._unicode = None
+                if code_point is None:
+                    return
+                if 0xD800 <= code_point <= 0xDBFF:
+                    self._high_surrogate = code_point
+                elif 0xDC00 <= code_point <= 0xDFFF and self._high_surrogate is not None:
+                    delta.append(chr(0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code_point - 0xDC00)))
+                    self._high_surrogate = None
+                else:
+                    delta.append(chr(code_point))
+        elif self._escape:
+            if char == 'u':
+                self._unicode = ''
+            else:
+                delta.append(_ESCAPES.get(char, char))
+        elif char not in '\\"':
+            delta.append(char)
+
+    def _flush_delta(self, delta: List[str], events: List[Event]) -> None:
+        """
+        Emit any decoded streamed characters as a single delta event."""
+        if delta:
+            events.append(("delta", self._current_key, ''.join(delta)))
+            delta.clear()
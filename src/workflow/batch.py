@@ -0,0 +1,295 @@
+from concurrent.futures import ThreadPoolExecutor
+from src.agents.react import MAX_PARALLEL_ACTIONS
+from src.agents.react import get_agent_factory
+from src.config.cassette import eject_cassette
+from src.config.cassette import use_cassette
+from src.tools.http import HTTP_POOL_SIZE
+from src.tools.http import set_pool_size
+from src.config.logging import logger
+from src.llm import response_cache
+from typing import Iterator
+from typing import Optional
+from typing import TextIO
+from typing import Tuple
+from typing import Dict
+from typing import Set
+from typing import Any
+import argparse
+import asyncio
+import json
+import time
+import os
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_ITERATIONS = 10
+
+
+def read_queries(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Stream query records from a JSONL file without loading it into memory.
+
+    Each line holds a {"text", "image_path"} record. Records are identified by their
+    `id` field if present, otherwise by their line number.
+
+    Args:
+        path (str): The path to the input JSONL file.
+
+    Yields:
+        Tuple[str, Dict[str, Any]]: The record id and the record.
+    """
+    with open(path, 'r') as file:
+        for line_number, line in enumerate(file, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.error(f"Skipping invalid JSON on line {line_number} of {path}: {e}")
+                continue
+            if not isinstance(record, dict) or not record.get("text"):
+                logger.error(f"Skipping line {line_number} of {path}: expected a record with a 'text' field")
+                continue
+            yield str(record.get("id", line_number)), record
+
+
+def load_completed_ids(path: str) -> Set[str]:
+    """
+    Collect the ids of queries already answered in an existing output file.
+
+    Only successful results count, so failed queries and answers cut short by the deadline
+    are retried when a run is resumed.
+
+    Args:
+        path (str): The path to the output JSONL file.
+
+    Returns:
+        Set[str]: The ids of completed queries.
+    """
+    completed: Set[str] = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path, 'r') as file:
+        for line in file:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                # A run interrupted mid-write can leave a partial last line
+                continue
+            if result.get("status") == "ok":
+                completed.add(str(result.get("id")))
+    return completed
+
+
+async def run_query(query_id: str, record: Dict[str, Any], max_iterations: int,
+                    bypass_llm_cache: bool = False, deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Run one query through a fresh agent and summarize the outcome.
+
+    Args:
+        query_id (str): The record id.
+        record (Dict[str, Any]): The query record with `text` and optional `image_path`.
+        max_iterations (int): The maximum number of iterations for the agent.
+        bypass_llm_cache (bool): Skip the LLM response cache.
+        deadline (Optional[float]): The time budget of the query in seconds; defaults to the agent's.
+
+    Returns:
+        Dict[str, Any]: The result record: final answer, iteration count, tool calls and timings.
+    """
+    query = {"text": record["text"], "image_path": record.get("image_path")}
+    started_at = time.time()
+    start = time.perf_counter()
+    first_iteration_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+    agent = get_agent_factory().create_agent(max_iterations)
+    agent.bypass_llm_cache = bypass_llm_cache
+    try:
+        async for iteration in agent.arun_iter(query, deadline=deadline):
+            if first_iteration_seconds is None and iteration["messages"]:
+                first_iteration_seconds = time.perf_counter() - start
+    except Exception as e:
+        logger.error(f"Query {query_id} failed: {e}")
+        error = str(e)
+
+    if error is not None:
+        status = "error"
+    elif agent.final_answer is None:
+        status = "no_answer"
+    elif agent.answered_on_deadline:
+        # Answered from partial research; retried on --resume
+        status = "deadline"
+    else:
+        status = "ok"
+
+    return {
+        "id": query_id,
+        "trace_id": agent.trace_id,
+        "text": record["text"],
+        "image_path": record.get("image_path"),
+        "status": status,
+        "answer": agent.final_answer,
+        "iterations": agent.current_iteration,
+        "answer_cache_hit": agent.answer_cache_hit,
+        "token_usage": agent.token_usage,
+        "tool_calls": [
+            {"tool": state.tool_name, "input": state.input, "status": state.status, "cache_hit": state.cache_hit}
+            for state in agent.action_history
+        ],
+        "timings": {
+            "started_at": started_at,
+            "total_seconds": round(time.perf_counter() - start, 3),
+            "first_iteration_seconds": round(first_iteration_seconds, 3) if first_iteration_seconds is not None else None,
+        },
+        "error": error,
+    }
+
+
+async def _worker(queue: asyncio.Queue, output: TextIO, max_iterations: int, bypass_llm_cache: bool,
+                  deadline: Optional[float], counts: Dict[str, int]) -> None:
+    """
+    Take queries off the queue until a None sentinel, appending each result to the output."""
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        query_id, record = item
+        result = await run_query(query_id, record, max_iterations, bypass_llm_cache, deadline)
+        # Writes happen on the event loop thread, so lines never interleave
+        output.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+        output.flush()
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+        logger.info(f"Query {query_id} finished with status {result['status']} "
+                    f"in {result['timings']['total_seconds']}s ({sum(counts.values())} done)")
+
+
+async def arun_batch(input_path: str, output_path: str,
+                     concurrency: int = DEFAULT_CONCURRENCY,
+                     max_iterations: int = DEFAULT_MAX_ITERATIONS,
+                     resume: bool = True,
+                     bypass_llm_cache: bool = False,
+                     deadline: Optional[float] = None) -> Dict[str, int]:
+    """
+    Run every query of a JSONL file through the agent with bounded concurrency.
+
+    Queries are read lazily and handed to `concurrency` workers through a small queue, so
+    memory use does not grow with the size of the input. Results are appended to the
+    output file as soon as each query finishes. With `resume`, queries already answered
+    in the output file are skipped.
+
+    Args:
+        input_path (str): The path to the input JSONL file of {"text", "image_path"} records.
+        output_path (str): The path to the output JSONL file.
+        concurrency (int): The number of queries run at the same time.
+        max_iterations (int): The maximum number of iterations per query.
+        resume (bool): Skip queries already answered in the output file instead of overwriting it.
+        bypass_llm_cache (bool): Skip the LLM response cache, e.g. for evaluations that must sample anew.
+        deadline (Optional[float]): The time budget of each query in seconds; defaults to the agent's.
+
+    Returns:
+        Dict[str, int]: The number of results per status, plus `skipped`.
+
+    Raises:
+        ValueError: If `concurrency` is not a positive integer.
+    """
+    if not isinstance(concurrency, int) or concurrency <= 0:
+        raise ValueError("concurrency must be a positive integer")
+
+    # Tool and model calls run in worker threads; size the pool for every in-flight call
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency * (MAX_PARALLEL_ACTIONS + 1)))
+    # Keep a connection per worker thread alive, since all of them may call the same host
+    if concurrency * (MAX_PARALLEL_ACTIONS + 1) > HTTP_POOL_SIZE:
+        set_pool_size(concurrency * (MAX_PARALLEL_ACTIONS + 1))
+
+    completed = load_completed_ids(output_path) if resume else set()
+    counts: Dict[str, int] = {"skipped": 0}
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    with open(output_path, 'a' if resume else 'w') as output:
+        workers = [
+            asyncio.create_task(_worker(queue, output, max_iterations, bypass_llm_cache, deadline, counts))
+            for _ in range(concurrency)
+        ]
+        try:
+            for query_id, record in read_queries(input_path):
+                if query_id in completed:
+                    counts["skipped"] += 1
+                    continue
+                await queue.put((query_id, record))
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    logger.info(f"Batch finished: {counts}")
+    return counts
+
+
+def run_batch(input_path: str, output_path: str,
+              concurrency: int = DEFAULT_CONCURRENCY,
+              max_iterations: int = DEFAULT_MAX_ITERATIONS,
+              resume: bool = True,
+              bypass_llm_cache: bool = False,
+              deadline: Optional[float] = None) -> Dict[str, int]:
+    """
+    Synchronous wrapper around `arun_batch`.
+
+    Args:
+        input_path (str): The path to the input JSONL file of {"text", "image_path"} records.
+        output_path (str): The path to the output JSONL file.
+        concurrency (int): The number of queries run at the same time.
+        max_iterations (int): The maximum number of iterations per query.
+        resume (bool): Skip queries already answered in the output file instead of overwriting it.
+        bypass_llm_cache (bool): Skip the LLM response cache, e.g. for evaluations that must sample anew.
+        deadline (Optional[float]): The time budget of each query in seconds; defaults to the agent's.
+
+    Returns:
+        Dict[str, int]: The number of results per status, plus `skipped`.
+    """
+    return asyncio.run(arun_batch(input_path, output_path, concurrency, max_iterations, resume,
+                                  bypass_llm_cache, deadline))
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse the command-line arguments of the batch runner."""
+    parser = argparse.ArgumentParser(description="Run a JSONL file of queries through the ReAct agent.")
+    parser.add_argument("input", help="Input JSONL file of {\"text\", \"image_path\"} records.")
+    parser.add_argument("output", help="Output JSONL file, one result per query.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Number of queries run at the same time.")
+    parser.add_argument("--max-iterations", type=int, default=DEFAULT_MAX_ITERATIONS,
+                        help="Maximum number of agent iterations per query.")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Overwrite the output file instead of skipping answered queries.")
+    parser.add_argument("--llm-cache", action="store_true",
+                        help="Reuse cached model responses for repeated prompts instead of calling the model "
+                             "(off by default, or set LLM_CACHE=1).")
+    parser.add_argument("--deadline", type=float,
+                        help="Time budget of each query in seconds; the agent answers with what it has when it runs low.")
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record-cassette", metavar="PATH",
+                          help="Record every model and HTTP interaction to a cassette file.")
+    cassette.add_argument("--replay-cassette", metavar="PATH",
+                          help="Serve model and HTTP interactions from a recorded cassette instead of the network.")
+    parser.add_argument("--emulate-latency", action="store_true",
+                        help="When replaying, wait for the recorded latency of each interaction.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.llm_cache:
+        response_cache.LLM_CACHE_ENABLED = True
+    if args.record_cassette:
+        use_cassette(args.record_cassette, "record")
+    elif args.replay_cassette:
+        use_cassette(args.replay_cassette, "replay", emulate_latency=args.emulate_latency)
+    try:
+        run_batch(args.input, args.output, args.concurrency, args.max_iterations,
+                  resume=not args.no_resume, deadline=args.deadline)
+    finally:
+        eject_cassette()
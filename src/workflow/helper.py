@@ -539,8 +539,25 @@ def handle_query_and_display_result(
     )
 
     try:
-        # Iterate through the agent's reasoning steps
-        for iteration_count, data in enumerate(run_react_agent(query_data, max_iterations), start=1):
+        # Iterate through the agent's reasoning steps, rendering the answer as it streams
+        iteration_count = 0
+        streaming_answer = None
+        streamed_text = ""
+        for data in run_react_agent(query_data, max_iterations, stream=True):
+            if "answer_delta" in data:
+                if streaming_answer is None:
+                    streaming_answer = final_answer_container.empty()
+                streamed_text += data["answer_delta"]
+                streaming_answer.markdown(streamed_text)
+                continue
+
+            # The complete answer is rendered below; drop the streaming preview
+            if streaming_answer is not None:
+                streaming_answer.empty()
+                streaming_answer = None
+                streamed_text = ""
+
+            iteration_count += 1
             st.markdown(
                 f"""
                 <div style='margin:24px 0 12px 0;'>
@@ -0,0 +1,5 @@
+import sys
+import os
+
+# The tests import the project as `src.*`, like the entry points run with PYTHONPATH=.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
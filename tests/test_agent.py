@@ -0,0 +1,193 @@
+from src.benchmark.fake_genai import FakeGenAIClient
+from src.agents.answer_cache import AnswerCache
+from src.tools.cache import get_tool_ttl
+from src.agents.react import AgentFactory
+from src.llm import response_cache
+from src.config import tracing
+from src.agents import react
+from src.agents.react import Name
+from src.tools import cache
+import threading
+import asyncio
+import pytest
+
+QUERY = "how tall is the eiffel tower"
+
+
+@pytest.fixture
+def answer_cache(monkeypatch):
+    """
+    Keep the agents off the network and the shared caches, with a fresh answer cache."""
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", False)
+    monkeypatch.setattr(response_cache, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(cache, "TOOL_CACHE_ENABLED", False)
+    monkeypatch.setattr(react, "PREFETCH_ENABLED", False)
+    monkeypatch.setattr(react, "ROUTING_ENABLED", False)
+    monkeypatch.setattr(react, "ANSWER_CACHE_ENABLED", True)
+    answers = AnswerCache()
+    monkeypatch.setattr(react, "get_answer_cache", lambda: answers)
+    return answers
+
+
+def run(agent, deadline=None):
+    return list(agent.run_iter({"text": QUERY}, deadline=deadline))
+
+
+def test_deadline_answer_reports_completed_tool_results(answer_cache, monkeypatch):
+    def search(q):
+        return {"answer_box": {"answer": "330 metres"}}
+
+    # The model keeps asking for searches, each call taking long enough to hit the deadline
+    script = [{"thought": "I should search the web.", "action": {"name": "google_search", "input": QUERY}}]
+    client = FakeGenAIClient({QUERY: script}, latency=0.1)
+    monkeypatch.setattr(react, "ANSWER_RESERVE_SECONDS", 0.15)
+    agent = AgentFactory(client=client, registry={Name.GOOGLE_SEARCH: search}).create_agent(max_iterations=50)
+
+    run(agent, deadline=0.3)
+
+    assert any(state.status == "completed" for state in agent.action_history)
+    assert agent.answered_on_deadline
+    assert "Here is what I found so far" in agent.final_answer
+    assert "330 metres" in agent.final_answer
+    assert answer_cache.lookup(QUERY) is None
+
+
+def test_finished_answer_is_cached(answer_cache):
+    def search(q):
+        return {"answer_box": {"answer": "330 metres"}}
+
+    script = [{"thought": "I should search the web.", "action": {"name": "google_search", "input": QUERY}},
+              {"thought": "The search answers it.", "answer": "It is 330 metres tall."}]
+    factory = AgentFactory(client=FakeGenAIClient({QUERY: script}), registry={Name.GOOGLE_SEARCH: search})
+    agent = factory.create_agent(max_iterations=5)
+
+    run(agent)
+
+    assert not agent.answered_on_deadline
+    assert answer_cache.lookup(QUERY) is not None
+
+
+def test_failed_tool_call_is_retried(answer_cache):
+    calls = []
+
+    def search(q):
+        calls.append(q)
+        if len(calls) == 1:
+            raise ConnectionError("upstream unavailable")
+        return {"answer_box": {"answer": "330 metres"}}
+
+    action = {"thought": "I should search the web.", "action": {"name": "google_search", "input": QUERY}}
+    script = [action, action, {"thought": "The search answers it.", "answer": "It is 330 metres tall."}]
+    factory = AgentFactory(client=FakeGenAIClient({QUERY: script}), registry={Name.GOOGLE_SEARCH: search})
+    agent = factory.create_agent(max_iterations=5)
+
+    run(agent)
+
+    assert len(calls) == 2
+    assert [(state.status, state.cache_hit) for state in agent.action_history] == [("failed", False), ("completed", False)]
+    assert "upstream unavailable" in agent.action_history[0].result
+
+
+def test_streamed_dispatch_is_not_a_cache_hit(answer_cache):
+    calls = []
+
+    def search(q):
+        calls.append(q)
+        return {"answer_box": {"answer": "330 metres"}}
+
+    action = {"thought": "I should search the web.", "action": {"name": "google_search", "input": QUERY}}
+    script = [action, action, {"thought": "The search answers it.", "answer": "It is 330 metres tall."}]
+    # Slow enough for the early-dispatched call to finish before the response does
+    client = FakeGenAIClient({QUERY: script}, latency=0.05)
+    agent = AgentFactory(client=client, registry={Name.GOOGLE_SEARCH: search}).create_agent(max_iterations=5)
+
+    list(agent.run_iter({"text": QUERY}, stream=True))
+
+    assert len(calls) == 1
+    assert [state.cache_hit for state in agent.action_history] == [False, True]
+
+
+def test_identical_calls_in_one_step_share_a_request(answer_cache):
+    calls = []
+
+    def search(q):
+        calls.append(q)
+        return {"answer_box": {"answer": "330 metres"}}
+
+    action = {"name": "google_search", "input": QUERY}
+    script = [{"thought": "I should search twice.", "actions": [action, action]},
+              {"thought": "The search answers it.", "answer": "It is 330 metres tall."}]
+    factory = AgentFactory(client=FakeGenAIClient({QUERY: script}), registry={Name.GOOGLE_SEARCH: search})
+    agent = factory.create_agent(max_iterations=5)
+
+    run(agent)
+
+    assert len(calls) == 1
+    assert sorted(state.cache_hit for state in agent.action_history) == [False, True]
+    assert all(state.status == "completed" for state in agent.action_history)
+
+
+def test_answer_from_uncacheable_tool_is_not_stored(answer_cache):
+    def cat_fact():
+        return {"fact": "Cats sleep for most of the day."}
+
+    query = "tell me a cat fact"
+    script = [{"thought": "I should fetch a fact.", "action": {"name": "cat_fact", "input": ""}},
+              {"thought": "The fact answers it.", "answer": "Cats sleep for most of the day."}]
+    factory = AgentFactory(client=FakeGenAIClient({query: script}), registry={Name.CAT_FACT: cat_fact})
+    agent = factory.create_agent(max_iterations=5)
+
+    list(agent.run_iter({"text": query}))
+
+    assert agent.final_answer is not None
+    assert agent.answer_ttl() == 0
+    assert answer_cache.lookup(query) is None
+
+
+def test_answer_expires_with_its_tools(answer_cache):
+    def news(q):
+        return {"news_results": [{"title": "Tower repainted"}]}
+
+    script = [{"thought": "I should check the news.", "action": {"name": "google_news_search", "input": QUERY}},
+              {"thought": "The news answers it.", "answer": "It was just repainted."}]
+    factory = AgentFactory(client=FakeGenAIClient({QUERY: script}), registry={Name.GOOGLE_NEWS_SEARCH: news})
+    agent = factory.create_agent(max_iterations=5)
+
+    run(agent)
+
+    entry, _ = answer_cache.lookup(QUERY)
+    assert entry.expires_at - entry.created_at == get_tool_ttl("GOOGLE_NEWS_SEARCH")
+
+
+def test_mismatched_dispatch_is_cancelled_and_rerun(answer_cache):
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def search(q):
+        calls.append(q)
+        if q != QUERY:
+            started.set()
+            release.wait(1)
+        return {"answer_box": {"answer": "330 metres"}}
+
+    factory = AgentFactory(client=FakeGenAIClient({}), registry={Name.GOOGLE_SEARCH: search})
+    agent = factory.create_agent(max_iterations=5)
+    agent.query = QUERY
+
+    async def step():
+        # The streamed action is cut short of the input the complete response settles on
+        agent.dispatch_actions({"action": {"name": "google_search", "input": "eiffel tower"}})
+        _, task = agent.dispatched
+        await asyncio.to_thread(started.wait, 1)
+        response = {"thought": "I should search the web.", "action": {"name": "google_search", "input": QUERY}}
+        await agent.adecide_and_act(response)
+        release.set()
+        return task
+
+    task = asyncio.run(step())
+
+    assert task.cancelled()
+    assert calls == ["eiffel tower", QUERY]
+    assert [(state.input, state.status) for state in agent.action_history] == [(QUERY, "completed")]
+    assert agent.action_history[0].result == {"answer_box": {"answer": "330 metres"}}
@@ -0,0 +1,30 @@
+from src.agents.answer_cache import AnswerCache
+import pytest
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("convert 100 eur to usd", "convert 100 usd to eur"),
+    ("flights from london to paris", "flights from paris to london"),
+    ("exchange rate usd to jpy", "exchange rate jpy to usd"),
+])
+def test_reversed_direction_is_a_miss(stored, asked):
+    cache = AnswerCache()
+    cache.store(stored, "answer", [])
+
+    assert cache.lookup(asked) is None
+    assert cache.lookup(stored) is not None
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("what is the weather in paris", "weather in paris please"),
+    ("what's the weather in Paris?", "tell me the weather in paris"),
+    ("give me some cat facts", "cat facts"),
+])
+def test_rephrased_query_is_a_hit(stored, asked):
+    cache = AnswerCache()
+    cache.store(stored, "answer", [])
+
+    hit = cache.lookup(asked)
+    assert hit is not None
+    assert hit[0].query == stored
+
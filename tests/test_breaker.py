@@ -0,0 +1,112 @@
+from src.tools.breaker import CircuitOpenError
+from src.tools.breaker import CircuitBreaker
+from src.tools.breaker import HALF_OPEN
+from src.tools.breaker import CLOSED
+from src.tools.breaker import OPEN
+import pytest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("api.example.com", failure_threshold=3, reset_timeout=30.0, clock=clock)
+
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.before_request()
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures(breaker):
+    for _ in range(breaker.failure_threshold - 1):
+        breaker.before_request()
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.before_request()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError, match="next 30s"):
+        breaker.before_request()
+    assert breaker.snapshot() == {"state": OPEN, "failures": 3, "trips": 1, "rejected": 1}
+
+
+def test_success_resets_the_failure_count(breaker):
+    for _ in range(breaker.failure_threshold - 1):
+        breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CLOSED
+
+
+def test_stays_open_until_the_reset_timeout(breaker, clock):
+    trip(breaker)
+
+    clock.advance(29.5)
+    with pytest.raises(CircuitOpenError, match="next 1s"):
+        breaker.before_request()
+    assert breaker.state == OPEN
+
+    clock.advance(0.5)
+    breaker.before_request()
+    assert breaker.state == HALF_OPEN
+
+
+def test_half_open_lets_one_trial_through(breaker, clock):
+    trip(breaker)
+    clock.advance(30.0)
+
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.release()
+    breaker.before_request()
+    assert breaker.state == HALF_OPEN
+
+
+def test_successful_trial_closes(breaker, clock):
+    trip(breaker)
+    clock.advance(30.0)
+
+    breaker.before_request()
+    breaker.record_success()
+
+    assert breaker.state == CLOSED
+    breaker.before_request()
+    breaker.before_request()
+
+
+def test_failed_trial_reopens_for_a_full_timeout(breaker, clock):
+    trip(breaker)
+    clock.advance(30.0)
+
+    breaker.before_request()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.trips == 2
+    clock.advance(29.0)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    clock.advance(1.0)
+    breaker.before_request()
+    assert breaker.state == HALF_OPEN
@@ -0,0 +1,75 @@
+from src.benchmark.fake_genai import FakeGenAIClient
+from src.agents.budget import KEEP_RECENT_ENTRIES
+from src.agents.budget import CHARS_PER_TOKEN
+from src.agents.budget import estimate_tokens
+from src.agents.budget import PREVIEW_CHARS
+from src.agents.budget import fit_history
+from src.agents.react import AgentFactory
+from src.config import tracing
+import pytest
+
+ENTRY_CHARS = 400
+
+
+def entries(count):
+    return [f"{index}:" + chr(ord("a") + index) * (ENTRY_CHARS - 2) for index in range(count)]
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", False)
+    agent = AgentFactory(client=FakeGenAIClient({})).create_agent(max_iterations=5)
+    agent.query = "how tall is the eiffel tower"
+    for line in entries(8):
+        agent.trace("assistant", line)
+    agent.last_observation = "330 metres"
+    return agent
+
+
+def test_over_budget_keeps_recent_previews_older_and_drops_oldest():
+    lines = entries(8)
+    # Room for the recent entries whole, two previews and the marker
+    preview_chars = len(f"{lines[0][:PREVIEW_CHARS]}... [shortened]\n")
+    budget = (KEEP_RECENT_ENTRIES * (ENTRY_CHARS + 1) + 2 * preview_chars + 64) // CHARS_PER_TOKEN
+
+    history, shortened, dropped = fit_history(lines, budget)
+    rendered = history.split("\n")
+
+    assert (shortened, dropped) == (2, 2)
+    assert rendered[0] == "[2 earlier entries omitted to fit the prompt budget]"
+    assert rendered[1:3] == [f"{line[:PREVIEW_CHARS]}... [shortened]" for line in lines[2:4]]
+    assert rendered[3:] == lines[-KEEP_RECENT_ENTRIES:]
+    assert estimate_tokens(history) <= budget
+
+
+def test_recent_entries_are_dropped_when_they_alone_do_not_fit():
+    lines = entries(8)
+
+    history, shortened, dropped = fit_history(lines, 2 * ENTRY_CHARS // CHARS_PER_TOKEN)
+    rendered = history.split("\n")
+
+    assert (shortened, dropped) == (0, 7)
+    assert rendered == ["[7 earlier entries omitted to fit the prompt budget]", lines[-1]]
+
+
+def test_unbounded_prompt_keeps_the_whole_history(agent):
+    agent.prompt_token_budget = None
+
+    prompt = agent.assemble_prompt(cached=False)
+
+    assert all(line in prompt for line in entries(8))
+    assert "omitted to fit the prompt budget" not in prompt
+    assert agent.token_usage[-1]["history_shortened"] == 0
+    assert agent.token_usage[-1]["history_dropped"] == 0
+
+
+def test_budgeted_prompt_trims_history_but_keeps_the_last_result(agent):
+    agent.prompt_token_budget = estimate_tokens(agent.build_prompt()) - ENTRY_CHARS
+
+    prompt = agent.assemble_prompt(cached=False)
+    usage = agent.token_usage[-1]
+
+    assert usage["prompt_tokens"] <= agent.prompt_token_budget
+    assert usage["history_shortened"] + usage["history_dropped"] > 0
+    assert "Last action result: 330 metres" in prompt
+    assert agent.history.lines[-1] in prompt
@@ -0,0 +1,72 @@
+from src.benchmark.fake_genai import FakeGenAIClient
+from src.benchmark.stand_in import LocalAPIServer
+from src.config.cassette import eject_cassette
+from src.config.cassette import use_cassette
+from src.agents.react import AgentFactory
+from src.llm import response_cache
+from src.llm import context_cache
+from src.config import ratelimit
+from src.config import tracing
+from src.agents import react
+from src.tools import cache
+from src.tools import hedge
+from src.tools import http
+import pytest
+
+QUERY = "who designed the eiffel tower"
+SCRIPT = [
+    {"thought": "Wikipedia should know.", "action": {"name": "wiki_search", "input": "Eiffel Tower"}},
+    {"thought": "The article answers it.", "answer": "Gustave Eiffel's company designed it."},
+]
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", False)
+    monkeypatch.setattr(response_cache, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(cache, "TOOL_CACHE_ENABLED", False)
+    monkeypatch.setattr(hedge, "HEDGING_ENABLED", False)
+    monkeypatch.setattr(ratelimit, "RATE_LIMITS_ENABLED", False)
+    monkeypatch.setattr(react, "PREFETCH_ENABLED", False)
+    monkeypatch.setattr(react, "ROUTING_ENABLED", False)
+    monkeypatch.setattr(react, "ANSWER_CACHE_ENABLED", False)
+    monkeypatch.setattr(context_cache, "_caches", {})
+    yield
+    eject_cassette()
+    http.set_transport(None)
+
+
+def run(client):
+    agent = AgentFactory(client=client).create_agent(max_iterations=5)
+    list(agent.run_iter({"text": QUERY}))
+    return agent
+
+
+def test_record_then_replay_offline(tmp_path):
+    path = str(tmp_path / "cassette.jsonl.gz")
+
+    cassette = use_cassette(path, "record")
+    with LocalAPIServer() as server:
+        http.set_transport(server.get)
+        recorded = run(FakeGenAIClient({QUERY: SCRIPT}))
+    eject_cassette()
+    assert recorded.action_history[0].status == "completed"
+    assert "Eiffel Tower" in recorded.action_history[0].result
+    recorded_count = cassette.recorded
+    assert recorded_count > 0
+
+    def offline(*args, **kwargs):
+        raise AssertionError("replay must not reach the network")
+
+    def no_model(prompt_bytes, response_bytes):
+        raise AssertionError("replay must not call the model")
+
+    # A fresh process: the context cache is created again, from the recording
+    context_cache._caches.clear()
+    cassette = use_cassette(path, "replay")
+    http.set_transport(offline)
+    replayed = run(FakeGenAIClient({QUERY: SCRIPT}, on_call=no_model))
+
+    assert cassette.replayed == recorded_count
+    assert replayed.final_answer == recorded.final_answer
+    assert replayed.action_history[0].result == recorded.action_history[0].result
@@ -0,0 +1,120 @@
+from src.llm.context_cache import get_context_cache
+from src.llm.context_cache import ContextCache
+from src.llm import context_cache
+from google.genai import types
+from types import SimpleNamespace
+import pytest
+
+PREFIX = "You are a ReAct agent."
+MODEL = "gemini-test"
+
+
+class CountingCaches:
+    """
+    A `client.caches` stub that counts calls and fails on request."""
+
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.fail_create = False
+        self.fail_update = False
+
+    def create(self, model, config=None):
+        self.created += 1
+        if self.fail_create:
+            raise ValueError("prefix is below the minimum cacheable size")
+        return types.CachedContent(name=f"cachedContents/test-{self.created}", model=model)
+
+    def update(self, name, config=None):
+        self.updated += 1
+        if self.fail_update:
+            raise ValueError("cache not found")
+        return types.CachedContent(name=name)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def caches():
+    return CountingCaches()
+
+
+@pytest.fixture
+def client(caches):
+    return SimpleNamespace(caches=caches)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(client, clock):
+    return ContextCache(client, MODEL, PREFIX, ttl=3600, refresh_margin=300, retry_after=600, clock=clock)
+
+
+def test_created_once_per_model_and_prefix(client, caches, monkeypatch):
+    monkeypatch.setattr(context_cache, "_caches", {})
+
+    shared = get_context_cache(client, MODEL, PREFIX)
+    names = {get_context_cache(client, MODEL, PREFIX).get() for _ in range(5)}
+
+    assert names == {"cachedContents/test-1"}
+    assert caches.created == 1
+    assert get_context_cache(client, MODEL, PREFIX) is shared
+    assert get_context_cache(client, "other-model", PREFIX) is not shared
+    assert get_context_cache(client, MODEL, PREFIX + " Be brief.") is not shared
+
+
+def test_ttl_is_refreshed_near_expiry(cache, caches, clock):
+    name = cache.get()
+
+    clock.now += 3600 - 301
+    assert cache.get() == name
+    assert caches.updated == 0
+
+    clock.now += 2
+    assert cache.get() == name
+    assert caches.updated == 1
+    assert cache.expires_at == clock.now + 3600
+    assert caches.created == 1
+
+
+def test_failed_refresh_recreates(cache, caches, clock):
+    cache.get()
+    caches.fail_update = True
+
+    clock.now += 3600 - 1
+
+    assert cache.get() == "cachedContents/test-2"
+    assert caches.created == 2
+
+
+def test_expired_cache_is_recreated(cache, caches, clock):
+    cache.get()
+
+    clock.now += 3600
+
+    assert cache.get() == "cachedContents/test-2"
+    assert caches.updated == 0
+
+
+def test_failed_create_backs_off(cache, caches, clock):
+    caches.fail_create = True
+
+    assert cache.get() is None
+    clock.now += 599
+    assert cache.get() is None
+    assert caches.created == 1
+
+    caches.fail_create = False
+    clock.now += 1
+    assert cache.get() == "cachedContents/test-2"
+    assert caches.created == 2
@@ -0,0 +1,35 @@
+from src.tools.hedge import MIN_LATENCY_SAMPLES
+from src.tools.hedge import HedgeBudget
+from src.tools.hedge import Hedger
+import threading
+
+
+def warmed_up(hedger, tool_name="GOOGLE_SEARCH"):
+    for _ in range(MIN_LATENCY_SAMPLES):
+        hedger.send(tool_name, lambda: "response")
+    return hedger
+
+
+def test_request_stays_on_caller_thread_without_a_hedge_to_spend():
+    hedger = warmed_up(Hedger(budget=HedgeBudget(ratio=0.0, burst=0.0), workers=1))
+    threads = []
+
+    def fetch():
+        threads.append(threading.current_thread())
+        return "response"
+
+    assert hedger.send("GOOGLE_SEARCH", fetch) == "response"
+    assert threads == [threading.current_thread()]
+
+
+def test_resize_keeps_hedging():
+    hedger = warmed_up(Hedger(workers=1))
+    hedger.resize(4)
+    threads = []
+
+    def fetch():
+        threads.append(threading.current_thread())
+        return "response"
+
+    assert hedger.send("GOOGLE_SEARCH", fetch) == "response"
+    assert threads[0].name.startswith("hedge")
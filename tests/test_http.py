@@ -0,0 +1,114 @@
+from src.config.ratelimit import RateLimitTimeout
+from src.tools.breaker import HALF_OPEN
+from src.tools.breaker import CLOSED
+from src.tools.breaker import OPEN
+import src.config.ratelimit as ratelimit
+import src.config.tracing as tracing
+import src.tools.breaker as breaker
+import src.tools.hedge as hedge
+import src.tools.http as http
+import pytest
+import time
+
+
+class FakeResponse:
+    status_code = 200
+    content = b"{}"
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def isolated(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", False)
+    monkeypatch.setattr(hedge, "HEDGING_ENABLED", False)
+    monkeypatch.setattr(breaker, "_breakers", {})
+    monkeypatch.setattr(ratelimit, "_limiters", {})
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_DIR", "")
+    monkeypatch.setattr(http, "_transport", lambda url, params=None, **kwargs: FakeResponse())
+
+
+def test_rate_limit_timeout_does_not_strand_half_open_trial(isolated, monkeypatch):
+    host_breaker = breaker.get_circuit_breaker("serpapi.com")
+    host_breaker.state = OPEN
+    host_breaker.opened_at = -1e9
+
+    # An empty bucket with no time to queue
+    monkeypatch.setitem(ratelimit.RATE_LIMITS, "SERP_API_KEY", (0.001, 1.0))
+    monkeypatch.setattr(ratelimit, "MAX_QUEUE_SECONDS", 0.0)
+    ratelimit.get_rate_limiter("SERP_API_KEY", "key").reserve(0.0)
+
+    with pytest.raises(RateLimitTimeout):
+        http.http_get("https://serpapi.com/search", params={"q": "coffee", "api_key": "key"})
+    assert not host_breaker.trial_in_flight
+
+    monkeypatch.setattr(ratelimit, "RATE_LIMITS_ENABLED", False)
+    response = http.http_get("https://serpapi.com/search", params={"q": "coffee", "api_key": "key"})
+    assert response.status_code == 200
+    assert host_breaker.state == CLOSED
+
+
+def test_unexpected_error_releases_half_open_trial(isolated, monkeypatch):
+    host_breaker = breaker.get_circuit_breaker("api.lyrics.ovh")
+    host_breaker.state = OPEN
+    host_breaker.opened_at = -1e9
+
+    def broken(url, params=None, **kwargs):
+        raise RuntimeError("transport bug")
+
+    monkeypatch.setattr(http, "_transport", broken)
+    with pytest.raises(RuntimeError):
+        http.http_get("https://api.lyrics.ovh/v1/adele/hello")
+    assert host_breaker.state == HALF_OPEN
+    assert not host_breaker.trial_in_flight
+
+
+def stall_after(monkeypatch, warmup):
+    """
+    A transport whose request right after `warmup` fast ones stalls long enough to be hedged."""
+    sent = []
+
+    def transport(url, params=None, **kwargs):
+        sent.append(url)
+        if len(sent) == warmup + 1:
+            time.sleep(0.5)
+        return FakeResponse()
+
+    monkeypatch.setattr(http, "_transport", transport)
+    return sent
+
+
+@pytest.fixture
+def hedged(isolated, monkeypatch):
+    monkeypatch.setattr(hedge, "HEDGING_ENABLED", True)
+    monkeypatch.setattr(hedge, "_hedger", hedge.Hedger(workers=4))
+    return hedge._hedger
+
+
+def serp_search():
+    with http.tool_scope("GOOGLE_SEARCH"):
+        return http.http_get("https://serpapi.com/search", params={"q": "coffee", "api_key": "key"})
+
+
+def test_hedge_takes_a_rate_limit_token(hedged, monkeypatch):
+    monkeypatch.setitem(ratelimit.RATE_LIMITS, "SERP_API_KEY", (1000.0, 1000.0))
+    sent = stall_after(monkeypatch, hedge.MIN_LATENCY_SAMPLES)
+    for _ in range(hedge.MIN_LATENCY_SAMPLES + 1):
+        serp_search()
+
+    assert hedged.stats()["hedged"] == 1
+    assert len(sent) == hedge.MIN_LATENCY_SAMPLES + 2
+    assert ratelimit.rate_limit_stats()["SERP_API_KEY"]["acquired"] == len(sent)
+
+
+def test_hedge_is_skipped_without_a_rate_limit_token(hedged, monkeypatch):
+    monkeypatch.setitem(ratelimit.RATE_LIMITS, "SERP_API_KEY", (0.001, float(hedge.MIN_LATENCY_SAMPLES + 1)))
+    sent = stall_after(monkeypatch, hedge.MIN_LATENCY_SAMPLES)
+    for _ in range(hedge.MIN_LATENCY_SAMPLES + 1):
+        serp_search()
+
+    assert hedged.stats()["hedged"] == 0
+    assert hedged.stats()["rate_limited"] == 1
+    assert len(sent) == hedge.MIN_LATENCY_SAMPLES + 1
+    assert ratelimit.rate_limit_stats()["SERP_API_KEY"]["acquired"] == len(sent)
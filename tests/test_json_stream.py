@@ -0,0 +1,56 @@
+from src.utils.json_stream import StreamingJSONParser
+import json
+
+
+def feed_all(parser, chunks):
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return events
+
+
+def fields(events):
+    return [(key, value) for kind, key, value in events if kind == "field"]
+
+
+def streamed(events, key):
+    return ''.join(value for kind, k, value in events if kind == "delta" and k == key)
+
+
+def test_escaped_quotes_and_braces_stay_inside_strings():
+    response = {"thought": 'He said "use {x}" \\ then } and ]', "answer": "a \"quoted\" {brace}"}
+    parser = StreamingJSONParser(stream_keys=("answer",))
+
+    events = feed_all(parser, [json.dumps(response)])
+
+    assert fields(events) == list(response.items())
+    assert streamed(events, "answer") == response["answer"]
+    assert parser.done
+
+
+def test_chunk_boundaries_inside_tokens():
+    response = {"thought": "café \U0001F600 \"ok\"", "answer": "line\nbreak \\ é \U0001F600"}
+    text = "```json\n" + json.dumps(response) + "\n```"
+    parser = StreamingJSONParser(stream_keys=("answer",))
+
+    # One character at a time splits every escape, key and \uXXXX sequence
+    events = feed_all(parser, list(text))
+
+    assert fields(events) == list(response.items())
+    assert streamed(events, "answer") == response["answer"]
+    assert parser.done
+
+
+def test_actions_complete_before_answer():
+    actions = [{"name": "google_search", "input": "eiffel tower height"},
+               {"name": "wikipedia_search", "input": "Eiffel Tower"}]
+    text = json.dumps({"thought": "I should look it up.", "actions": actions, "answer": "pending"})
+    cut = text.index('"answer"')
+    parser = StreamingJSONParser(stream_keys=("answer",))
+
+    events = parser.feed(text[:cut])
+
+    assert fields(events) == [("thought", "I should look it up."), ("actions", actions)]
+    assert not parser.done
+    assert fields(parser.feed(text[cut:])) == [("answer", "pending")]
+    assert parser.done
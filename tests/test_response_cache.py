@@ -0,0 +1,11 @@
+from src.llm.response_cache import response_cache_key
+from google.genai import types
+
+
+def test_key_ignores_cached_content_name():
+    first = types.GenerateContentConfig(temperature=0.0, cached_content="cachedContents/abc")
+    second = types.GenerateContentConfig(temperature=0.0, cached_content="cachedContents/xyz")
+    uncached = types.GenerateContentConfig(temperature=0.0)
+
+    assert response_cache_key("gemini", "prompt", first) == response_cache_key("gemini", "prompt", second)
+    assert response_cache_key("gemini", "prompt", first) != response_cache_key("gemini", "prompt", uncached)
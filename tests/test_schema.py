@@ -0,0 +1,29 @@
+from src.agents.react import MAX_ACTIONS_PER_STEP
+from src.agents.schema import build_response_schema
+from src.benchmark.fake_genai import FakeGenAIClient
+from src.agents.react import AgentFactory
+
+
+def test_each_branch_requires_a_step():
+    schema = build_response_schema(["GOOGLE_SEARCH", "WIKI_SEARCH"], MAX_ACTIONS_PER_STEP)
+
+    assert schema.required is None
+    assert sorted(branch.required[1] for branch in schema.any_of) == ["action", "actions", "answer"]
+    assert all(branch.required[0] == "thought" for branch in schema.any_of)
+
+
+def test_no_op_action_is_not_allowed():
+    schema = build_response_schema(["GOOGLE_SEARCH", "WIKI_SEARCH"], MAX_ACTIONS_PER_STEP)
+    branches = {branch.required[1]: branch for branch in schema.any_of}
+
+    assert branches["action"].properties["action"].properties["name"].enum == ["GOOGLE_SEARCH", "WIKI_SEARCH"]
+    assert branches["actions"].properties["actions"].items.properties["name"].enum == ["GOOGLE_SEARCH", "WIKI_SEARCH"]
+
+
+def test_prompt_and_schema_share_the_action_limit():
+    agent = AgentFactory(client=FakeGenAIClient()).create_agent(max_iterations=1)
+    schema = agent.build_generation_config(None).response_schema
+    actions = next(branch for branch in schema.any_of if "actions" in branch.required).properties["actions"]
+
+    assert actions.max_items == str(MAX_ACTIONS_PER_STEP)
+    assert f"Request at most {MAX_ACTIONS_PER_STEP} tools per step." in agent.build_static_prompt()
@@ -0,0 +1,16 @@
+from src.config.tracing import SpanExporter
+from src.config.tracing import Span
+import os
+
+
+def test_export_file_is_rotated(tmp_path):
+    path = str(tmp_path / "traces.jsonl")
+    exporter = SpanExporter(path, max_bytes=2048, backups=2)
+
+    for _ in range(100):
+        exporter.export(Span("agent.run"))
+
+    assert os.path.getsize(path) < 2048
+    assert os.path.exists(path + ".1")
+    assert os.path.exists(path + ".2")
+    assert not os.path.exists(path + ".3")